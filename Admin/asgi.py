@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Admin.settings')
+# Doimiy ulanishlar ASGI bilan ishlamaydi (Django hujjatlari) - settings.py ga qarang
+os.environ.setdefault('DJANGO_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
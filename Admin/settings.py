@@ -2,6 +2,7 @@
 Django settings for Admin project.
 """
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -23,6 +24,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Statik fayllar (DEBUG=False) - sessiya va metrikalargacha qaytariladi
+    'main.assets.StaticFilesMiddleware',
+    # Boshqa middleware'lardagi so'rovlar ham hisoblanadi
+    'main.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -39,6 +44,9 @@ TEMPLATES = [
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
+        # 'loaders' ataylab ko'rsatilmagan: bunda Django (4.1+) cached.Loader
+        # ishlatadi - shablon jarayonda bir marta kompilyatsiya qilinadi,
+        # DEBUG=True da esa fayl o'zgarganda kesh o'zi tozalanadi
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -54,9 +62,61 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Ulanish so'rovlar orasida saqlanadi (soniya) - faqat WSGI uchun.
+        # ASGI'da har so'rov o'z sinxron oqimida ulanish ochadi, ular qayta
+        # ishlatilmaydi va vaqtida yopilmaydi - Admin/asgi.py 0 qiladi
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Yozuvchi tranzaksiya qulfni boshida oladi: o'qishdan yozishga
+            # o'tishda "database is locked" bo'lmaydi, busy_timeout ishlaydi
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# Faqat o'qish uchun ulanish - o'sha fayl, alohida ulanishlar (main/db.py).
+# O'chirish uchun READ_ONLY_DATABASE = None
+READ_ONLY_DATABASE = 'readonly'
+DATABASES[READ_ONLY_DATABASE] = {
+    **DATABASES['default'],
+    'OPTIONS': {},
+    'TEST': {'MIRROR': 'default'},
+}
+
+DATABASE_ROUTERS = ['main.db.ReadOnlyRouter']
+
+# Har bir yangi SQLite ulanishida bajariladigan PRAGMA'lar
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,               # ms - qulf bo'shashini kutish
+    'synchronous': 'NORMAL',            # WAL bilan xavfsiz, har commit'da fsync yo'q
+    'mmap_size': 256 * 1024 * 1024,     # bayt
+    'cache_size': -64 * 1024,           # manfiy - KiB (64 MB)
+    'temp_store': 'MEMORY',
+}
+
+# Kesh - dashboard statistikasi uchun. Bir nechta jarayonda ishlaganda
+# ham yozuvdan keyin eskirmasligi uchun fayl keshi ishlatiladi
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.django_cache',
     }
 }
 
+# Shundan ko'p SQL so'rov bajargan so'rovlar logga yoziladi (None - o'chirilgan)
+METRICS_QUERY_THRESHOLD = 50
+
+# So'rov kechikishi gistogrammasi chegaralari (soniya)
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Statistika kalitlari versiyalangan, shuning uchun muddat faqat xotira uchun
+STATS_CACHE_TIMEOUT = 60 * 60
+
+# Hisob-faktura HTML'i ijara versiyasi bilan saqlanadi - yakunlangan ijaralar o'zgarmaydi
+INVOICE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
 LANGUAGE_CODE = 'uz'
 TIME_ZONE = 'Asia/Tashkent'
 USE_I18N = True
@@ -68,4 +128,10 @@ LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/login/'
 
 STATIC_URL = '/static/'
+# collectstatic shu yerga yig'adi: xeshlangan nomlar, .gz/.br nusxalar (main/assets.py)
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'main.assets.CompressedManifestStaticFilesStorage'},
+}
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
@@ -1,6 +1,66 @@
-from django.contrib import admin
+import io
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from . import importer
+from .forms import CsvImportForm
+from .inventory import ConcurrentUpdate, complete_rentals
 from .models import ToolCategory, Tool, Customer, Rental, RentalItem
 
+
+class CsvImportMixin:
+    """Ro'yxat sahifasiga CSV yuklash tugmasi va sahifasini qo'shadi"""
+    import_kind = None
+    change_list_template = 'admin/main/import_change_list.html'
+    
+    # Sahifada ko'rsatiladigan xatolar soni
+    max_errors = 100
+    
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='%s_%s_import' % info),
+        ] + super().get_urls()
+    
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        
+        form = CsvImportForm(request.POST or None, request.FILES or None)
+        result = None
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            # Fayl butunlay xotiraga o'qilmaydi - satrma-satr
+            lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+            try:
+                result = importer.import_csv(
+                    self.import_kind, lines,
+                    create_categories=form.cleaned_data['create_categories'],
+                    dry_run=form.cleaned_data['dry_run'],
+                )
+            except UnicodeDecodeError:
+                form.add_error('file', "Fayl UTF-8 kodlashda bo'lishi kerak")
+            else:
+                action = "tekshirildi" if form.cleaned_data['dry_run'] else "yuklandi"
+                level = messages.WARNING if result.errors else messages.SUCCESS
+                self.message_user(
+                    request, f"{result.created} ta yozuv {action}, {len(result.errors)} ta xato.", level,
+                )
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.opts,
+            'title': f"{self.opts.verbose_name_plural} - CSV yuklash",
+            'form': form,
+            'columns': importer.COLUMNS[self.import_kind],
+            'errors': result.errors[:self.max_errors] if result else [],
+            'hidden_errors': max(len(result.errors) - self.max_errors, 0) if result else 0,
+        }
+        return TemplateResponse(request, 'admin/main/import_csv.html', context)
+
 @admin.register(ToolCategory)
 class ToolCategoryAdmin(admin.ModelAdmin):
     list_display = ['name']
@@ -8,27 +68,17 @@ class ToolCategoryAdmin(admin.ModelAdmin):
 
 # admin.py
 @admin.register(Tool)
-class ToolAdmin(admin.ModelAdmin):
+class ToolAdmin(CsvImportMixin, admin.ModelAdmin):
+    import_kind = 'tools'
     list_display = ['name', 'category', 'daily_price', 'quantity_total', 'quantity_available', 'is_active']
     list_filter = ['category', 'is_active']
     search_fields = ['name']
     list_editable = ['daily_price', 'quantity_total', 'is_active']
-    
-    def save_model(self, request, obj, form, change):
-        # Admin panelda saqlaganda available ni yangilash
-        if change:  # Mavjud obyekt
-            old_obj = Tool.objects.get(pk=obj.pk)
-            if old_obj.quantity_total != obj.quantity_total:
-                # Jami son o'zgarsa, mavjud sonni moslashtirish
-                difference = obj.quantity_total - old_obj.quantity_total
-                obj.quantity_available += difference
-        else:  # Yangi obyekt
-            obj.quantity_available = obj.quantity_total
-        
-        super().save_model(request, obj, form, change)
+    # Mavjud sonni moslashtirish Tool.save() ichida - o'zgargan maydonlar bo'yicha
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(CsvImportMixin, admin.ModelAdmin):
+    import_kind = 'customers'
     list_display = ['name', 'phone', 'created_at']
     search_fields = ['name', 'phone']
 
@@ -38,6 +88,17 @@ class RentalAdmin(admin.ModelAdmin):
     list_filter = ['status', 'start_date']
     search_fields = ['customer__name', 'customer__phone']
     readonly_fields = ['created_at']
+    actions = ['complete_selected']
+    
+    @admin.action(description="Tanlangan ijaralarni yakunlash")
+    def complete_selected(self, request, queryset):
+        # Asboblarni qaytarish va summani yakunlash bitta tranzaksiyada
+        try:
+            completed = complete_rentals(queryset.values_list('id', flat=True))
+        except ConcurrentUpdate:
+            self.message_user(request, "Ijaralar shu orada o'zgartirildi. Qaytadan urinib ko'ring.", messages.ERROR)
+            return
+        self.message_user(request, f"{len(completed)} ta ijara yakunlandi.", messages.SUCCESS)
 
 @admin.register(RentalItem)
 class RentalItemAdmin(admin.ModelAdmin):
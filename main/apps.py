@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .db import apply_pragmas
+        from .metrics import install as install_metrics
+
+        # Signal qabul qiluvchilarni ulash
+        from . import signals  # noqa: F401
+        connection_created.connect(apply_pragmas, dispatch_uid='main_sqlite_pragmas')
+        connection_created.connect(install_metrics, dispatch_uid='main_metrics')
@@ -0,0 +1,141 @@
+"""Statik fayllar: xeshlangan nomlar, oldindan siqilgan nusxalar va ularni berish
+
+CompressedManifestStaticFilesStorage - collectstatic fayllarni mazmun
+xeshi qo'shilgan nom bilan yozadi (base.3f2a9c.css) va matnli fayllarning
+.gz (hamda brotli o'rnatilgan bo'lsa .br) nusxalarini tayyorlaydi.
+
+StaticFilesMiddleware - DEBUG=False bo'lganda STATIC_ROOT dan beradi:
+xeshlangan fayllar o'zgarmaydi, shuning uchun bir yillik immutable kesh
+sarlavhasi bilan, brauzer qabul qilsa siqilgan nusxasi yuboriladi.
+Fayllar birinchi so'rovda o'qilib jarayon xotirasida saqlanadi.
+"""
+import gzip
+import mimetypes
+from pathlib import Path
+from urllib.parse import urlparse
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.http import Http404, HttpResponse
+from django.utils._os import safe_join
+
+try:
+    import brotli
+except ImportError:  # ixtiyoriy - o'rnatilmagan bo'lsa faqat gzip
+    brotli = None
+
+# Siqiladigan fayllar (rasmlar va shriftlar allaqachon siqilgan)
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.map', '.html', '.xml')
+
+# (Accept-Encoding nomi, fayl qo'shimchasi) - afzallik tartibida
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Xeshsiz nom (masalan admin shablonlari to'g'ridan-to'g'ri so'rasa)
+SHORT_CACHE = 'public, max-age=300'
+
+
+def compress(path):
+    """Faylning .gz va .br nusxalarini yozish - faqat asl fayldan kichik bo'lsa"""
+    data = path.read_bytes()
+    variants = [('.gz', gzip.compress(data, 9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            path.with_name(path.name + suffix).write_bytes(compressed)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        processed = []
+        for name, hashed_name, done in super().post_process(paths, dry_run, **options):
+            processed.append(hashed_name)
+            yield name, hashed_name, done
+        if dry_run:
+            return
+        # Asl nomli nusxa ham siqiladi - xeshsiz so'ralsa ham siqilgan beriladi
+        for name in {*processed, *paths}:
+            if isinstance(name, str) and name.endswith(COMPRESSIBLE):
+                compress(Path(self.path(name)))
+
+
+class StaticFilesMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        # DEBUG rejimida runserver o'zi beradi (finders orqali, collectstatic'siz)
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = urlparse(settings.STATIC_URL).path
+        self.root = str(settings.STATIC_ROOT)
+        self.hashed = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        self.files = {}  # (nom, qo'shimcha) -> mazmun
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        name = self.match(request)
+        if name is None:
+            return self.get_response(request)
+        return self.serve(request, name)
+
+    async def __acall__(self, request):
+        name = self.match(request)
+        if name is None:
+            return await self.get_response(request)
+        if (name, '') in self.files:
+            return self.serve(request, name)
+        # Birinchi so'rovda diskdan o'qish - event loop bloklanmasin
+        return await sync_to_async(self.serve, thread_sensitive=False)(request, name)
+
+    def match(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.prefix):
+            return None
+        return request.path[len(self.prefix):]
+
+    def load(self, name, suffix=''):
+        """Fayl mazmuni yoki None. Faqat topilgan fayllar saqlanadi"""
+        key = (name, suffix)
+        if key not in self.files:
+            try:
+                path = Path(safe_join(self.root, name + suffix))
+            except SuspiciousFileOperation:
+                # STATIC_ROOT dan tashqariga chiqish (../)
+                return None
+            if not path.is_file():
+                return None
+            self.files[key] = path.read_bytes()
+        return self.files[key]
+
+    def serve(self, request, name):
+        content = self.load(name)
+        if content is None:
+            raise Http404(name)
+
+        encoding = None
+        compressible = name.endswith(COMPRESSIBLE)
+        if compressible:
+            accepted = request.headers.get('Accept-Encoding', '')
+            for candidate, suffix in ENCODINGS:
+                if candidate in accepted:
+                    compressed = self.load(name, suffix)
+                    if compressed is not None:
+                        content, encoding = compressed, candidate
+                        break
+
+        content_type, _ = mimetypes.guess_type(name)
+        response = HttpResponse(content, content_type=content_type or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if compressible:
+            response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = IMMUTABLE if name in self.hashed else SHORT_CACHE
+        response['X-Content-Type-Options'] = 'nosniff'
+        return response
@@ -0,0 +1,129 @@
+"""Sana oralig'i bo'yicha asbob bandligi indeksi
+
+Har bir asbob uchun faol va bron qilingan ijaralardan (boshlanish/tugash
+sanasi va soni) interval tuzilmasi quriladi: chegaraviy sanalar siqiladi,
+har bir bo'lakdagi band son prefiks yig'indi bilan hisoblanadi va ustidan
+sparse table quriladi. "12-dan 15-gacha nechta bo'sh" so'rovi ikkita
+bisect (O(log n)) va bitta O(1) maksimum bilan javob topadi.
+
+Indeks versiyalangan keshda saqlanadi va har qanday yozuvdan keyin
+kerak bo'lganda qayta quriladi (main/cache.py).
+"""
+import datetime
+from bisect import bisect_right
+
+from django.db.models import Sum
+
+from .cache import get_or_build
+from .models import RentalItem, Tool
+
+# Asboblarni band qiladigan ijara holatlari
+BOOKING_STATUSES = ('active', 'reserved')
+
+
+class ToolAvailability:
+    def __init__(self, capacity, bookings):
+        """bookings - (boshlanish, tugash yoki None, soni); tugash kuni ham band"""
+        self.capacity = capacity
+
+        # Har bir interval [start, end + 1) - tugashsiz ijara cheksiz davom etadi
+        changes = {}
+        for start, end, quantity in bookings:
+            changes[start] = changes.get(start, 0) + quantity
+            if end is not None:
+                stop = end + datetime.timedelta(days=1)
+                changes[stop] = changes.get(stop, 0) - quantity
+
+        # points[i] dan points[i + 1] gacha band son - levels[i]
+        self.points = sorted(changes)
+        self.levels = []
+        level = 0
+        for point in self.points:
+            level += changes[point]
+            self.levels.append(level)
+
+        # Sparse table: table[k][i] = max(levels[i : i + 2**k])
+        self.table = [self.levels]
+        width = 1
+        while width * 2 <= len(self.levels):
+            previous = self.table[-1]
+            self.table.append([
+                max(previous[i], previous[i + width])
+                for i in range(len(previous) - width)
+            ])
+            width *= 2
+
+    def max_booked(self, start, end=None):
+        """[start, end] oralig'idagi eng ko'p band son (end=None - muddatsiz)"""
+        if not self.points or (end is not None and end < start):
+            return 0
+        # start sanasi tushgan bo'lak va end sanasi tushgan bo'lak
+        left = bisect_right(self.points, start) - 1
+        right = len(self.points) - 1 if end is None else bisect_right(self.points, end) - 1
+        if right < 0:
+            return 0
+        # Birinchi chegaradan oldingi kunlar band emas
+        left = max(left, 0)
+        k = (right - left + 1).bit_length() - 1
+        row = self.table[k]
+        return max(row[left], row[right - (1 << k) + 1])
+
+    def free(self, start, end=None):
+        """[start, end] oralig'ida har kuni bo'sh bo'lgan son"""
+        return max(self.capacity - self.max_booked(start, end), 0)
+
+
+def build_indexes(tool_ids, exclude_rental=None):
+    """Bir nechta asbob indeksi - asboblar sonidan qat'i nazar 2 ta so'rov"""
+    tool_ids = list(tool_ids)
+    capacities = dict(Tool.objects.filter(pk__in=tool_ids).values_list('id', 'quantity_total'))
+    items = RentalItem.objects.filter(tool_id__in=tool_ids, rental__status__in=BOOKING_STATUSES)
+    if exclude_rental is not None:
+        items = items.exclude(rental_id=exclude_rental)
+    bookings = {tool_id: [] for tool_id in tool_ids}
+    rows = (
+        items.values_list('tool_id', 'rental__start_date', 'rental__end_date')
+        .annotate(quantity=Sum('quantity'))
+        .order_by()
+    )
+    for tool_id, start, end, quantity in rows:
+        bookings[tool_id].append((start, end, quantity))
+    return {tool_id: ToolAvailability(capacities.get(tool_id, 0), bookings[tool_id]) for tool_id in tool_ids}
+
+
+def build_index(tool_id, exclude_rental=None):
+    """Asbob indeksini bazadan qurish - 2 ta so'rov"""
+    return build_indexes([tool_id], exclude_rental)[tool_id]
+
+
+def get_index(tool_id):
+    """Keshdagi indeks - ijara yoki asbob o'zgarganda eskiradi"""
+    return get_or_build(f'availability:{tool_id}', lambda: build_index(tool_id))
+
+
+def free_quantity(tool_id, start, end=None):
+    """Asbobning [start, end] oralig'idagi bo'sh soni (keshdan)"""
+    return get_index(tool_id).free(start, end)
+
+
+def shortages(start, end, quantities, exclude_rental=None):
+    """Sanalarda yetmaydigan asboblar - {tool_id: bo'sh soni}, hammasi yetsa bo'sh lug'at"""
+    quantities = {tool_id: quantity for tool_id, quantity in quantities.items() if quantity > 0}
+    indexes = build_indexes(quantities, exclude_rental)
+    missing = {}
+    for tool_id, quantity in quantities.items():
+        free = indexes[tool_id].free(start, end)
+        if free < quantity:
+            missing[tool_id] = free
+    return missing
+
+
+def fits(rental, quantities, exclude_self=False):
+    """Ijara sanalarida asboblar yetadimi - {tool_id: son} bo'yicha
+
+    Tekshiruv yozuvdan oldin, tranzaksiya ichida qilinadi, shuning uchun
+    indeks keshdan emas, bazadan yangidan quriladi. exclude_self=True -
+    ijaraning o'z qatorlari hisobga olinmaydi (sanalar o'zgarganda).
+    """
+    exclude = rental.pk if exclude_self else None
+    return not shortages(rental.start_date, rental.end_date, quantities, exclude)
@@ -0,0 +1,108 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .db import on_commit_once
+
+VERSION_KEY = 'main:stats:version'
+
+
+def get_version():
+    """Joriy statistika versiyasi"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Kesh tozalangan bo'lsa eski kalitlar bilan to'qnashmasligi uchun
+        # versiya vaqt asosida boshlanadi
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _incr_version(_=None):
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_version():
+    """Har qanday yozuvdan keyin barcha statistika kalitlarini eskirtirish
+
+    Tranzaksiya ichida versiya commit'dan keyin bir marta oshiriladi -
+    tables_changed bilan bir xil sabab: oldinroq oshirilsa, shu orada
+    o'qilgan eski ma'lumot yangi kalit bilan keshga yozilib qolardi.
+    """
+    on_commit_once(_incr_version)
+
+
+def make_key(name, version=None):
+    # Bugungi daromad sanaga bog'liq, shuning uchun sana ham kalitda
+    if version is None:
+        version = get_version()
+    return f'main:stats:{name}:{version}:{timezone.now().date().isoformat()}'
+
+
+def get_or_build(name, builder):
+    """Keshdan olish, bo'lmasa hisoblab saqlash"""
+    key = make_key(name)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout=settings.STATS_CACHE_TIMEOUT)
+    return value
+
+
+async def aget_version():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+async def aget_or_build(name, builder):
+    """get_or_build async ko'rinishlar uchun - builder korutina funksiyasi"""
+    key = make_key(name, await aget_version())
+    value = await cache.aget(key)
+    if value is None:
+        value = await builder()
+        await cache.aset(key, value, timeout=settings.STATS_CACHE_TIMEOUT)
+    return value
+
+
+# Jadval versiyalari - shartli GET (ETag/Last-Modified) uchun. Versiya -
+# jadvaldagi oxirgi o'zgarish vaqti (ns): o'zgarganini ham, qachon
+# o'zgarganini ham bitta qiymat bildiradi
+
+def table_key(model):
+    return f'main:table:{model._meta.label_lower}'
+
+
+def get_table_versions(models):
+    """Jadvallar versiyalari - bitta kesh so'rovi"""
+    keys = [table_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Kesh tozalangan - oxirgi o'zgarish noma'lum, hozirdan boshlanadi.
+            # Kesh saqlamasa (DummyCache) har so'rovda yangi versiya bo'ladi
+            now = time.time_ns()
+            cache.add(key, now, timeout=None)
+            versions[key] = cache.get(key, now)
+    return [versions[key] for key in keys]
+
+
+def bump_table_versions(models):
+    now = time.time_ns()
+    cache.set_many({table_key(model): now for model in models}, timeout=None)
+
+
+def tables_changed(*models):
+    """Jadvallar o'zgardi - versiya commit'dan keyin yangilanadi
+
+    Commit'dan oldin yangilansa, shu orada o'qilgan eski ma'lumot yangi
+    versiya bilan javob berilib, keyingi so'rovlarga 304 qaytarilardi.
+    """
+    on_commit_once(bump_table_versions, models)
@@ -0,0 +1,46 @@
+from django.db.models import Count, Q
+
+from .cache import get_or_build
+from .models import Tool, ToolCategory
+
+
+def tool_filters(category=None, active='', in_stock=False, prefix=''):
+    """Katalog filtrlari Q ko'rinishida (prefix - bog'langan model orqali)"""
+    q = Q()
+    if category:
+        q &= Q(**{f'{prefix}category_id': category})
+    if active in ('1', '0'):
+        q &= Q(**{f'{prefix}is_active': active == '1'})
+    if in_stock:
+        q &= Q(**{f'{prefix}quantity_available__gt': 0})
+    return q
+
+
+def filter_tools(queryset, category=None, active='', in_stock=False):
+    return queryset.filter(tool_filters(category, active, in_stock))
+
+
+def build_facets(category=None, active='', in_stock=False):
+    """Kategoriya va holat bo'yicha sonlar - 2 ta guruhlangan so'rov
+
+    Har bir facet boshqa tanlangan filtrlarni hisobga oladi, lekin o'zinikini
+    emas: kategoriyalar soni holat filtrlari bilan, holatlar soni esa
+    tanlangan kategoriya bilan hisoblanadi.
+    """
+    categories = list(
+        ToolCategory.objects.annotate(
+            tool_count=Count('tool', filter=tool_filters(active=active, in_stock=in_stock, prefix='tool__')),
+        ).order_by('name').values('id', 'name', 'tool_count')
+    )
+    flags = Tool.objects.filter(tool_filters(category=category)).aggregate(
+        active=Count('id', filter=Q(is_active=True)),
+        inactive=Count('id', filter=Q(is_active=False)),
+        in_stock=Count('id', filter=Q(quantity_available__gt=0)),
+    )
+    return {'categories': categories, 'flags': flags}
+
+
+def get_facets(category=None, active='', in_stock=False):
+    """Facet sonlari keshdan - asbob yoki kategoriya o'zgarganda eskiradi"""
+    name = f'tool_facets:{category or ""}:{active}:{int(bool(in_stock))}'
+    return get_or_build(name, lambda: build_facets(category, active, in_stock))
@@ -0,0 +1,94 @@
+"""Shartli GET: jadval versiyalaridan ETag va Last-Modified
+
+Sahifa o'zgarmaganini bilish uchun uning so'rovlari bajarilmaydi: ETag
+sahifa bog'liq jadvallar versiyalari (cache.get_table_versions - bitta
+kesh so'rovi), kerak bo'lsa bitta qatorning updated_at qiymati va
+foydalanuvchidan quriladi. Brauzer yuborgan If-None-Match (yoki
+If-Modified-Since) mos kelsa ko'rinish chaqirilmaydi - 304 qaytadi.
+"""
+import functools
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.messages import get_messages
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .cache import get_table_versions
+
+
+def validators(request, models, row, daily, args, kwargs):
+    """(ETag, Last-Modified) yoki (None, None) - shartli javob berilmaydi"""
+    if request.method not in ('GET', 'HEAD'):
+        return None, None
+    # Ko'rsatilmagan xabar bor - sahifa qayta chizilishi kerak
+    if len(get_messages(request)):
+        return None, None
+
+    versions = get_table_versions(models)
+    modified = [datetime.fromtimestamp(version / 1e9, dt_timezone.utc) for version in versions]
+    parts = [request.user.pk, *versions]
+    if row is not None:
+        updated_at = row(*args, **kwargs)
+        if updated_at is None:
+            # Qator yo'q - ko'rinish o'zi 404 qaytaradi
+            return None, None
+        modified.append(updated_at)
+        parts.append(updated_at.isoformat())
+    if daily:
+        # Sahifa bugungi sanaga bog'liq (faol ijara kunlari) - kun o'tsa eskiradi
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        modified.append(today)
+        parts.append(today.date().isoformat())
+
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"', int(max(modified).timestamp()) if modified else None
+
+
+def not_modified(request, etag, last_modified):
+    """Mos kelsa 304, aks holda None - ko'rinish chaqiriladi"""
+    if etag is None:
+        return None
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def add_headers(response, etag, last_modified):
+    if etag is None or response.status_code not in (200, 304):
+        return response
+    response.headers.setdefault('ETag', etag)
+    if last_modified and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(last_modified)
+    # Brauzer har safar tekshirsin (o'zgarmagan bo'lsa 304 - tanasiz)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional(*models, row=None, daily=False):
+    """Ko'rinishga shartli GET qo'shish
+
+    models - sahifa bog'liq jadvallar, row - ko'rinish argumentlari bilan
+    chaqiriladi va qatorning updated_at qiymatini (yo'q bo'lsa None)
+    qaytaradi, daily - sahifa bugungi sanaga bog'liq.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                # request.user va sessiya dangasa o'qiladi - sinxron oqimda
+                etag, last_modified = await sync_to_async(validators)(request, models, row, daily, args, kwargs)
+                response = not_modified(request, etag, last_modified)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return add_headers(response, etag, last_modified)
+        else:
+            @functools.wraps(view)
+            def wrapper(request, *args, **kwargs):
+                etag, last_modified = validators(request, models, row, daily, args, kwargs)
+                response = not_modified(request, etag, last_modified)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                return add_headers(response, etag, last_modified)
+        return wrapper
+    return decorator
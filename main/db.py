@@ -0,0 +1,113 @@
+"""SQLite ulanishlari: pragmalar, faqat o'qish uchun ulanish va router
+
+Har bir yangi SQLite ulanishida settings.SQLITE_PRAGMAS qo'llanadi (WAL,
+busy_timeout va h.k.). settings.READ_ONLY_DATABASE - o'sha faylga ochilgan
+alohida ulanish: ``read_only`` bilan belgilangan ko'rinishlardagi o'qishlar
+unga yo'naltiriladi, WAL rejimida ular yozuvlarni kutmaydi. Yozuvlar har
+doim 'default' orqali bajariladi.
+
+on_commit_once - tranzaksiyadagi ko'p o'zgarishlarni commit'dan keyin
+bitta chaqiriqqa yig'ish (kesh versiyalari, rollup'lar, jonli xabarlar).
+"""
+import functools
+import threading
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+_reading = ContextVar('main_read_only', default=False)
+
+_pending = threading.local()
+
+
+def read_only_alias():
+    """Faqat o'qish uchun ulanish nomi, sozlanmagan bo'lsa - None"""
+    alias = getattr(settings, 'READ_ONLY_DATABASE', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """connection_created signali - yangi SQLite ulanishini sozlash"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = dict(getattr(settings, 'SQLITE_PRAGMAS', {}))
+    if connection.alias == read_only_alias():
+        # Jurnal rejimini faqat yozuvchi ulanish o'zgartiradi
+        pragmas.pop('journal_mode', None)
+        pragmas['query_only'] = 'ON'
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def read_only(view):
+    """Ko'rinishdagi barcha o'qishlarni faqat o'qish uchun ulanishga yo'naltirish"""
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper(*args, **kwargs):
+            token = _reading.set(True)
+            try:
+                return await view(*args, **kwargs)
+            finally:
+                _reading.reset(token)
+    else:
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            token = _reading.set(True)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                _reading.reset(token)
+    return wrapper
+
+
+class ReadOnlyRouter:
+    """read_only ko'rinishlarda o'qishlarni alohida ulanishga yuboradi"""
+
+    def db_for_read(self, model, **hints):
+        alias = read_only_alias()
+        # Tranzaksiya ichida o'z yozuvlarini ko'rishi uchun 'default' qoladi
+        if alias and _reading.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Ikkala ulanish bitta faylga qaraydi
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != read_only_alias()
+
+
+
+def on_commit_once(func, values=()):
+    """func(values) ni commit'dan keyin bir marta chaqirish
+
+    Bitta tranzaksiyadagi barcha chaqiriqlarning values'i bitta to'plamga
+    yig'iladi. Tranzaksiyadan tashqarida func darhol chaqiriladi.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    if not connection.in_atomic_block:
+        func(set(values))
+        return
+    pending = _pending.__dict__.setdefault('batches', {})
+    batch = pending.get(func)
+    # Bekor qilingan savepoint o'z on_commit'larini ham olib tashlaydi, shuning
+    # uchun callback Django ro'yxatida (savepoint'lar, funksiya, robust)
+    # qidiriladi - topilmasa yangi to'plam bilan qayta qo'shiladi
+    if batch is None or not any(entry[1] is batch[0] for entry in connection.run_on_commit):
+        collected = set()
+
+        def flush():
+            if pending.get(func) is batch:
+                del pending[func]
+            func(collected)
+
+        batch = pending[func] = (flush, collected)
+        transaction.on_commit(flush)
+    batch[1].update(values)
@@ -0,0 +1,172 @@
+"""Ijaralar va mijozlarni CSV / JSON Lines ko'rinishida oqim bilan eksport qilish
+
+Qatorlar ``QuerySet.iterator(chunk_size)`` bilan bo'laklab o'qiladi, har bir
+bo'lak uchun mijozlar (JOIN) va ijara qatorlari (bitta IN so'rovi) birga
+olinadi. Natija generator - fayl xotirada yig'ilmaydi, shuning uchun
+xotira sarfi yozuvlar soniga bog'liq emas. ASGI ostida Django sinxron
+generatorni avval to'liq ro'yxatga yig'adi, shuning uchun u yerda astream()
+ishlatiladi - satrlar partiyalab sinxron oqimda olinadi.
+"""
+import csv
+import itertools
+import json
+
+from asgiref.sync import sync_to_async
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils.dateparse import parse_date
+
+from .models import Customer, Rental, RentalItem
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+KINDS = ('rentals', 'customers')
+
+CHUNK_SIZE = 2000
+
+RENTAL_COLUMNS = (
+    'rental_id', 'status', 'start_date', 'end_date', 'billed_days', 'daily_total', 'total_amount',
+    'created_at', 'customer_id', 'customer_name', 'customer_phone',
+    'item_id', 'tool_id', 'tool_name', 'quantity', 'daily_rate',
+)
+
+CUSTOMER_COLUMNS = ('id', 'name', 'phone', 'address', 'created_at')
+
+
+class Echo:
+    """csv.writer uchun: yozilgan qatorni saqlamasdan qaytaradi"""
+
+    def write(self, value):
+        return value
+
+
+def parse_filters(start=None, end=None, status=None):
+    """Filtr qiymatlarini tekshirish - noto'g'ri bo'lsa ValueError"""
+    filters = {}
+    for name, value in (('start', start), ('end', end)):
+        if value:
+            date = parse_date(value)
+            if date is None:
+                raise ValueError(f"Sana noto'g'ri: {value} (YYYY-MM-DD)")
+            filters[name] = date
+    if status:
+        if status not in dict(Rental.STATUS_CHOICES):
+            raise ValueError(f"Noma'lum holat: {status}")
+        filters['status'] = status
+    return filters
+
+
+def rental_queryset(start=None, end=None, status=None):
+    """Boshlanish sanasi va holat bo'yicha ijaralar - mijoz va qatorlari bilan"""
+    rentals = Rental.objects.select_related('customer').prefetch_related(
+        Prefetch('rentalitem_set', queryset=RentalItem.objects.select_related('tool').order_by('id')),
+    ).order_by('id')
+    if start:
+        rentals = rentals.filter(start_date__gte=start)
+    if end:
+        rentals = rentals.filter(start_date__lte=end)
+    if status:
+        rentals = rentals.filter(status=status)
+    return rentals
+
+
+def customer_queryset(start=None, end=None, **filters):
+    """Ro'yxatdan o'tgan sanasi bo'yicha mijozlar"""
+    customers = Customer.objects.order_by('id')
+    if start:
+        customers = customers.filter(created_at__date__gte=start)
+    if end:
+        customers = customers.filter(created_at__date__lte=end)
+    return customers
+
+
+def rental_record(rental):
+    customer = rental.customer
+    return {
+        'id': rental.id,
+        'status': rental.status,
+        'start_date': rental.start_date,
+        'end_date': rental.end_date,
+        'billed_days': rental.billed_days,
+        'daily_total': rental.daily_total,
+        'total_amount': rental.total_amount,
+        'created_at': rental.created_at,
+        'customer': {'id': customer.id, 'name': customer.name, 'phone': customer.phone},
+        'items': [
+            {
+                'id': item.id,
+                'tool_id': item.tool_id,
+                'tool_name': item.tool.name,
+                'quantity': item.quantity,
+                'daily_rate': item.daily_rate,
+            }
+            for item in rental.rentalitem_set.all()
+        ],
+    }
+
+
+def rental_rows(rental):
+    """CSV uchun: har bir ijara qatori alohida satr, qatorsiz ijara - bitta satr"""
+    head = [
+        rental.id, rental.status, rental.start_date, rental.end_date or '', rental.billed_days,
+        rental.daily_total, rental.total_amount, rental.created_at.isoformat(),
+        rental.customer_id, rental.customer.name, rental.customer.phone,
+    ]
+    items = rental.rentalitem_set.all()
+    if not items:
+        yield head + [''] * 5
+    for item in items:
+        yield head + [item.id, item.tool_id, item.tool.name, item.quantity, item.daily_rate]
+
+
+def customer_record(customer):
+    return {
+        'id': customer.id,
+        'name': customer.name,
+        'phone': customer.phone,
+        'address': customer.address,
+        'created_at': customer.created_at,
+    }
+
+
+def customer_rows(customer):
+    yield [customer.id, customer.name, customer.phone, customer.address, customer.created_at.isoformat()]
+
+
+def stream(kind, fmt, filters=None, chunk_size=CHUNK_SIZE):
+    """Eksport satrlari generatori - kind: rentals/customers, fmt: csv/jsonl"""
+    filters = filters or {}
+    if kind == 'rentals':
+        objects = rental_queryset(**filters).iterator(chunk_size=chunk_size)
+        columns, record, rows = RENTAL_COLUMNS, rental_record, rental_rows
+    else:
+        objects = customer_queryset(**filters).iterator(chunk_size=chunk_size)
+        columns, record, rows = CUSTOMER_COLUMNS, customer_record, customer_rows
+
+    if fmt == 'jsonl':
+        for obj in objects:
+            yield json.dumps(record(obj), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+        return
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for obj in objects:
+        for row in rows(obj):
+            yield writer.writerow(row)
+
+
+async def astream(kind, fmt, filters=None, chunk_size=CHUNK_SIZE):
+    """stream() ning async varianti - har safar chunk_size satr bitta bo'lak bo'lib keladi"""
+    lines = stream(kind, fmt, filters, chunk_size)
+    # Bitta oqimda (thread_sensitive) - kursor ochilgan ulanish o'zgarmaydi
+    next_chunk = sync_to_async(lambda: ''.join(itertools.islice(lines, chunk_size)))
+    try:
+        while chunk := await next_chunk():
+            yield chunk
+    finally:
+        # Mijoz ulanishni uzsa ham kursor yopiladi
+        await sync_to_async(lines.close)()
@@ -40,7 +40,7 @@ from django.utils import timezone
 class RentalForm(forms.ModelForm):
     class Meta:
         model = Rental
-        fields = ['customer', 'start_date']
+        fields = ['customer', 'start_date', 'end_date']
         widgets = {
             'customer': forms.Select(attrs={
                 'class': 'form-control',
@@ -51,17 +51,27 @@ class RentalForm(forms.ModelForm):
                 'type': 'date',
                 'required': True
             }),
+            'end_date': forms.DateInput(attrs={
+                'class': 'form-control',
+                'type': 'date',
+            }),
         }
         labels = {
             'customer': 'Mijoz',
             'start_date': 'Boshlanish sanasi',
+            'end_date': 'Tugash sanasi',
         }
     
-    def clean_start_date(self):
-        start_date = self.cleaned_data.get('start_date')
-        if start_date and start_date > timezone.now().date():
-            raise forms.ValidationError("Boshlanish sanasi kelajakda bo'lishi mumkin emas!")
-        return start_date
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get('start_date')
+        end_date = cleaned_data.get('end_date')
+        if start_date and end_date and end_date < start_date:
+            self.add_error('end_date', "Tugash sanasi boshlanish sanasidan oldin bo'lishi mumkin emas!")
+        # Kelajakdagi ijara - bron, uning muddati ma'lum bo'lishi kerak
+        if start_date and start_date > timezone.now().date() and not end_date:
+            self.add_error('end_date', "Oldindan bron qilish uchun tugash sanasini kiriting!")
+        return cleaned_data
 
 class RentalItemForm(forms.ModelForm):
     class Meta:
@@ -70,4 +80,38 @@ class RentalItemForm(forms.ModelForm):
         widgets = {
             'tool': forms.Select(attrs={'class': 'form-control'}),
             'quantity': forms.NumberInput(attrs={'class': 'form-control', 'min': 1}),
-        }
\ No newline at end of file
+        }
+
+class CsvImportForm(forms.Form):
+    file = forms.FileField(label='CSV fayl')
+    create_categories = forms.BooleanField(label="Topilmagan kategoriyalarni yaratish", required=False)
+    dry_run = forms.BooleanField(label="Faqat tekshirish (bazaga yozmaslik)", required=False)
+
+class RentalApiForm(RentalForm):
+    """JSON API: ijara va uning barcha qatorlari - items: [{"tool": id, "quantity": n}, ...]"""
+    items = forms.JSONField()
+    
+    def clean_items(self):
+        items = self.cleaned_data['items']
+        if not isinstance(items, list) or not items:
+            raise forms.ValidationError("Kamida bitta qator kerak")
+        
+        # Bir asbob bir necha marta kelsa soni qo'shiladi
+        quantities = {}
+        for line in items:
+            if isinstance(line, dict):
+                tool_id, quantity = line.get('tool'), line.get('quantity', 1)
+            elif isinstance(line, list) and len(line) == 2:
+                tool_id, quantity = line
+            else:
+                raise forms.ValidationError('Qator {"tool": id, "quantity": son} ko\'rinishida bo\'lishi kerak')
+            if not all(type(value) is int for value in (tool_id, quantity)) or quantity <= 0:
+                raise forms.ValidationError("tool va quantity musbat butun son bo'lishi kerak")
+            quantities[tool_id] = quantities.get(tool_id, 0) + quantity
+        
+        # Narxlar uchun barcha asboblar bitta so'rovda
+        self.tools = Tool.objects.in_bulk(list(quantities))
+        missing = [tool_id for tool_id in quantities if tool_id not in self.tools or not self.tools[tool_id].is_active]
+        if missing:
+            raise forms.ValidationError(f"Asbob topilmadi yoki faol emas: {', '.join(map(str, missing))}")
+        return quantities
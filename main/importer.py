@@ -0,0 +1,155 @@
+"""Asboblar va mijozlarni CSV fayldan ommaviy yuklash
+
+Fayl satrma-satr o'qiladi (csv.DictReader), to'g'ri satrlar partiyalab
+``bulk_create`` bilan yoziladi - har bir asbob uchun Tool.save() va
+signallar ishlamaydi. Kategoriyalar bitta so'rov bilan lug'atga olinadi.
+Noto'g'ri satr butun partiyani to'xtatmaydi: u xatolar ro'yxatiga satr
+raqami bilan yoziladi.
+"""
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import search
+from .models import Customer, Tool, ToolCategory
+from .signals import data_changed
+
+BATCH_SIZE = 500
+
+# Tur -> model va qidiruv indeksidagi nomi
+KINDS = {
+    'tools': (Tool, 'tool'),
+    'customers': (Customer, 'customer'),
+}
+
+# Majburiy ustunlar
+COLUMNS = {
+    'tools': ('name', 'category', 'daily_price', 'quantity_total'),
+    'customers': ('name', 'phone'),
+}
+
+TRUE_VALUES = {'1', 'true', 'yes', 'ha', ''}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []  # (satr raqami, xabar)
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+
+def describe(error):
+    """ValidationError matni - maydon nomlari bilan"""
+    if hasattr(error, 'error_dict'):
+        return '; '.join(f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items())
+    return '; '.join(error.messages)
+
+
+def category_map(create=False, dry_run=False):
+    """Kategoriya nomi (kichik harflarda) -> id. create=True - yo'qlari yaratiladi"""
+    categories = {name.strip().lower(): pk for pk, name in ToolCategory.objects.values_list('id', 'name')}
+
+    def lookup(name):
+        key = name.strip().lower()
+        if key not in categories and create and key:
+            # Sinov rejimida bazaga yozilmaydi - faqat mavjud deb hisoblanadi
+            categories[key] = 0 if dry_run else ToolCategory.objects.create(name=name.strip()).pk
+        return categories.get(key)
+
+    return lookup
+
+
+def parse_tool(row, category_id):
+    try:
+        daily_price = Decimal(row['daily_price'].replace(' ', '').replace(',', '.'))
+    except InvalidOperation:
+        raise ValidationError("daily_price son bo'lishi kerak")
+    # Decimal NaN/Infinity'ni ham qabul qiladi - NaN bilan taqqoslash xato beradi
+    if not daily_price.is_finite():
+        raise ValidationError("daily_price son bo'lishi kerak")
+    try:
+        quantity = int(row['quantity_total'])
+    except ValueError:
+        raise ValidationError("quantity_total butun son bo'lishi kerak")
+    if daily_price < 0 or quantity < 0:
+        raise ValidationError("Narx va son manfiy bo'lishi mumkin emas")
+
+    tool = Tool(
+        name=row['name'].strip(),
+        category_id=category_id,
+        daily_price=daily_price,
+        quantity_total=quantity,
+        # save() chaqirilmaydi - mavjud son to'g'ridan-to'g'ri
+        quantity_available=quantity,
+        is_active=(row.get('is_active') or '').strip().lower() in TRUE_VALUES,
+    )
+    tool.clean_fields(exclude=['category'])
+    return tool
+
+
+def parse_customer(row):
+    customer = Customer(
+        name=row['name'].strip(),
+        phone=row['phone'].strip(),
+        address=(row.get('address') or '').strip(),
+    )
+    # Manzil ixtiyoriy - bo'sh qolishi mumkin
+    customer.clean_fields(exclude=['address'])
+    return customer
+
+
+def flush(kind, objects):
+    """Partiyani yozish va indeks/keshni yangilash"""
+    if not objects:
+        return 0
+    model, index_kind = KINDS[kind]
+    with transaction.atomic():
+        created = model.objects.bulk_create(objects)
+        ids = [obj.pk for obj in created]
+        search.index(index_kind, ids)
+        data_changed.send(sender=model, ids=ids)
+    return len(created)
+
+
+def import_csv(kind, lines, batch_size=BATCH_SIZE, create_categories=False, dry_run=False):
+    """CSV satrlarini (fayl yoki iterator) yuklash - natija ImportResult"""
+    result = ImportResult()
+    reader = csv.DictReader(lines)
+    missing = [column for column in COLUMNS[kind] if column not in (reader.fieldnames or ())]
+    if missing:
+        result.error(1, f"Ustunlar topilmadi: {', '.join(missing)}")
+        return result
+
+    lookup = category_map(create_categories, dry_run) if kind == 'tools' else None
+    batch = []
+    for row in reader:
+        line = reader.line_num
+        try:
+            if any(not (row[column] or '').strip() for column in COLUMNS[kind]):
+                raise ValidationError("Majburiy ustun bo'sh")
+            if kind == 'tools':
+                category_id = lookup(row['category'])
+                if category_id is None:
+                    raise ValidationError(f"Kategoriya topilmadi: {row['category'].strip()}")
+                obj = parse_tool(row, category_id)
+            else:
+                obj = parse_customer(row)
+        except ValidationError as error:
+            result.error(line, describe(error))
+            continue
+
+        if dry_run:
+            result.created += 1
+            continue
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            result.created += flush(kind, batch)
+            batch = []
+
+    if not dry_run:
+        result.created += flush(kind, batch)
+    return result
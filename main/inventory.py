@@ -0,0 +1,250 @@
+"""Ombor: asboblarni band qilish va qaytarish
+
+Barcha o'zgarishlar shartli UPDATE (F-ifoda) bilan bajariladi: qator
+oldin o'qilib, Python'da o'zgartirilib, qayta yozilmaydi, shuning uchun
+bir vaqtda ishlayotgan xodimlar bir-birining o'zgarishini yo'qotmaydi.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+
+from . import availability, pricing, search
+from .models import Rental, RentalItem, Tool
+from .pricing import rental_days
+from .signals import data_changed
+
+
+class ConcurrentUpdate(Exception):
+    """Ma'lumot shu orada boshqa so'rov tomonidan o'zgartirilgan"""
+
+
+class OutOfStock(Exception):
+    """Omborda asbob yetarli emas. shortages - {tool_id: bo'sh soni}, ma'lum bo'lsa"""
+
+    def __init__(self, message="Omborda asbob yetarli emas", shortages=None):
+        super().__init__(message)
+        self.shortages = shortages or {}
+
+
+def reserve(tool_id, quantity):
+    """Asbobni band qilish. Yetarli bo'lmasa hech narsa o'zgarmaydi va False qaytadi"""
+    if quantity <= 0:
+        return False
+    updated = Tool.objects.filter(pk=tool_id, quantity_available__gte=quantity).update(
+        quantity_available=F('quantity_available') - quantity,
+        updated_at=timezone.now(),
+    )
+    if updated:
+        data_changed.send(sender=Tool, ids=[tool_id])
+    return bool(updated)
+
+
+def reserve_many(quantities):
+    """Bir nechta asbobni bitta shartli UPDATE bilan band qilish - {tool_id: son}
+
+    Hammasi yoki hech biri: birorta asbob yetmasa o'zgarishlar bekor
+    qilinadi va False qaytadi.
+    """
+    quantities = {tool_id: quantity for tool_id, quantity in quantities.items() if quantity > 0}
+    if not quantities:
+        return True
+    try:
+        with transaction.atomic():
+            updated = Tool.objects.filter(reduce(or_, [
+                Q(pk=tool_id, quantity_available__gte=quantity)
+                for tool_id, quantity in quantities.items()
+            ])).update(
+                quantity_available=F('quantity_available') - Case(
+                    *[When(pk=tool_id, then=Value(quantity)) for tool_id, quantity in quantities.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+                updated_at=timezone.now(),
+            )
+            if updated != len(quantities):
+                raise OutOfStock
+    except OutOfStock:
+        return False
+    data_changed.send(sender=Tool, ids=list(quantities))
+    return True
+
+
+def release(tool_id, quantity):
+    """Asbobni omborga qaytarish"""
+    if quantity <= 0:
+        return
+    Tool.objects.filter(pk=tool_id).update(
+        quantity_available=F('quantity_available') + quantity,
+        updated_at=timezone.now(),
+    )
+    data_changed.send(sender=Tool, ids=[tool_id])
+
+
+def release_rental(rental):
+    """Ijaradagi barcha asboblarni qaytarish - har bir asbob uchun bitta UPDATE"""
+    totals = rental.rentalitem_set.values('tool_id').annotate(quantity=Sum('quantity')).order_by()
+    tool_ids = []
+    for row in totals:
+        Tool.objects.filter(pk=row['tool_id']).update(
+            quantity_available=F('quantity_available') + row['quantity'],
+            updated_at=timezone.now(),
+        )
+        tool_ids.append(row['tool_id'])
+    if tool_ids:
+        data_changed.send(sender=Tool, ids=tool_ids)
+
+
+def claim(rental, status, from_status='active'):
+    """Ijara holatini shartli o'zgartirish (faqat from_status holatidan).
+
+    Ikki xodim bir vaqtda yakunlasa ham faqat bittasi True oladi,
+    shuning uchun asboblar ikki marta qaytarilmaydi.
+    """
+    now = timezone.now()
+    claimed = Rental.objects.filter(pk=rental.pk, status=from_status).update(status=status, updated_at=now)
+    if claimed:
+        rental.status, rental.updated_at = status, now
+        if rental.is_tracked:
+            rental._snapshot(['status', 'updated_at'])
+        data_changed.send(sender=Rental, ids=[rental.pk])
+    return bool(claimed)
+
+
+def rental_quantities(rental):
+    """Ijaradagi asboblar soni - {tool_id: jami son}"""
+    return dict(
+        rental.rentalitem_set.values_list('tool_id').annotate(quantity=Sum('quantity')).order_by()
+    )
+
+
+def start_rental(rental, start_date=None):
+    """Bron qilingan ijarani boshlash: asboblar ombordan band qilinadi.
+
+    Bron qilinmagan ijara uchun False, asbob yetmasa OutOfStock
+    (holat o'zgarishi ham bekor qilinadi).
+    """
+    start_date = start_date or timezone.now().date()
+    with transaction.atomic():
+        if not claim(rental, 'active', from_status='reserved'):
+            return False
+        if not reserve_many(rental_quantities(rental)):
+            raise OutOfStock("Omborda asbob yetarli emas")
+        if rental.start_date != start_date:
+            rental.start_date = start_date
+            rental.save()
+    return True
+
+
+def create_rental(customer, start_date, end_date, quantities, tools):
+    """Ijarani barcha qatorlari bilan bitta tranzaksiyada yaratish
+
+    quantities - {tool_id: son}, tools - {tool_id: Tool} (narxlar uchun).
+    Qatorlar soni qancha bo'lmasin so'rovlar soni o'zgarmas: sanalar
+    bo'yicha tekshiruv (2 ta), barcha asboblarni bitta shartli UPDATE bilan
+    band qilish, kunlik summasi bilan bitta INSERT va qatorlar uchun bitta
+    bulk_create. Asbob yetmasa OutOfStock, hech narsa yozilmaydi.
+    """
+    # Kelajakdagi ijara - bron, asboblar ombordan boshlanganda olinadi
+    status = 'reserved' if start_date > timezone.now().date() else 'active'
+    daily_total = sum(
+        (pricing.line_amount(quantity, tools[tool_id].daily_price) for tool_id, quantity in quantities.items()),
+        pricing.ZERO,
+    )
+    with transaction.atomic():
+        # Sanasi belgilangan ijara shu oraliqdagi bronlar bilan tekshiriladi
+        if status == 'reserved' or end_date is not None:
+            missing = availability.shortages(start_date, end_date, quantities)
+            if missing:
+                raise OutOfStock("Bu sanalarda asbob yetarli emas", missing)
+        if status == 'active' and not reserve_many(quantities):
+            available = dict(Tool.objects.filter(pk__in=quantities).values_list('id', 'quantity_available'))
+            raise OutOfStock(shortages={
+                tool_id: available[tool_id] for tool_id, quantity in quantities.items() if available[tool_id] < quantity
+            })
+
+        # Kunlar va jami summa Rental.save() da shu INSERT'ning o'zida hisoblanadi
+        rental = Rental.objects.create(
+            customer=customer,
+            start_date=start_date,
+            end_date=end_date,
+            status=status,
+            daily_total=daily_total,
+        )
+        RentalItem.objects.bulk_create([
+            RentalItem(rental=rental, tool_id=tool_id, quantity=quantity, daily_rate=tools[tool_id].daily_price)
+            for tool_id, quantity in quantities.items()
+        ])
+        # bulk_create signal yubormaydi - asbob nomlari indeksga, kesh va jamlanmalar
+        search.index('rental', [rental.pk])
+        data_changed.send(sender=Rental, ids=[rental.pk])
+    return rental
+
+
+def complete_rentals(rental_ids, end_date=None):
+    """Bir nechta ijarani bitta tranzaksiyada yakunlash
+
+    Ijaralar soni qancha bo'lmasin so'rovlar soni o'zgarmas: faol ijaralarni
+    o'qish, ularni yakunlash (kunlar va summa bilan birga), asboblar bo'yicha
+    yig'indi va barcha asboblarga bitta UPDATE. Yakunlangan id'lar qaytadi.
+    """
+    end_date = end_date or timezone.now().date()
+    with transaction.atomic():
+        rows = list(
+            Rental.objects.select_for_update()
+            .filter(pk__in=rental_ids, status='active')
+            .values_list('id', 'start_date')
+        )
+        if not rows:
+            return []
+        ids = [rental_id for rental_id, _ in rows]
+
+        # Kunlar faqat boshlanish sanasiga bog'liq - har bir sana uchun bitta WHEN
+        days = Case(
+            *[
+                When(start_date=start_date, then=Value(rental_days(start_date, end_date)))
+                for start_date in {start_date for _, start_date in rows}
+            ],
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+        completed = Rental.objects.filter(pk__in=ids, status='active').update(
+            status='completed',
+            end_date=end_date,
+            billed_days=days,
+            total_amount=F('daily_total') * days,
+            updated_at=timezone.now(),
+        )
+        if completed != len(ids):
+            # Boshqa xodim shu orada yakunlagan - asboblar ikki marta qaytmasin
+            raise ConcurrentUpdate("Ijaralar bir vaqtda o'zgartirildi")
+
+        # Asboblarni qaytarish - har bir asbob uchun jami son, bitta UPDATE
+        totals = dict(
+            RentalItem.objects.filter(rental_id__in=ids)
+            .values_list('tool_id')
+            .annotate(quantity=Sum('quantity'))
+            .order_by()
+        )
+        if totals:
+            Tool.objects.filter(pk__in=totals).update(
+                quantity_available=F('quantity_available') + Case(
+                    *[When(pk=tool_id, then=Value(quantity)) for tool_id, quantity in totals.items()],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+                updated_at=timezone.now(),
+            )
+            data_changed.send(sender=Tool, ids=list(totals))
+        data_changed.send(sender=Rental, ids=ids)
+    return ids
+
+
+def complete_rental(rental, end_date=None):
+    """Ijarani yakunlash va asboblarni qaytarish. Ijara faol bo'lmasa - False"""
+    if not complete_rentals([rental.pk], end_date):
+        return False
+    rental.refresh_from_db()
+    return True
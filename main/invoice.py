@@ -0,0 +1,57 @@
+"""Ijara hisob-fakturasi (chop etish uchun)
+
+Qatorlar asboblari bilan bitta so'rovda o'qiladi, ijara kunlari esa har
+bir qator uchun emas, bir marta hisoblanadi. Tayyor HTML keshda ijara
+versiyasi - updated_at bilan saqlanadi: ijara, uning qatorlari, mijozi
+yoki asbob nomi o'zgarsa updated_at yangilanadi va eski kalit boshqa
+ishlatilmaydi. Qayta chop etishda faqat versiya o'qiladi - qolgan
+so'rovlar va shablon o'tkazib yuboriladi.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Rental
+
+TEMPLATE = 'main/rental_invoice.html'
+
+
+def add_line_totals(rental, items):
+    """Qatorlarga total_days va total_amount qo'shish - jami summa qaytadi"""
+    days = rental.get_total_days()
+    total = 0
+    for item in items:
+        item.total_days = days
+        item.total_amount = item.quantity * item.daily_rate * days
+        total += item.total_amount
+    return total
+
+
+def make_key(rental_id, updated_at, end_date):
+    key = f'main:invoice:{rental_id}:{updated_at.timestamp()}'
+    if end_date is None:
+        # Yakunlanmagan ijara kunlari bugungacha hisoblanadi
+        key += f':{timezone.localdate().isoformat()}'
+    return key
+
+
+def render(rental, items):
+    total = add_line_totals(rental, items)
+    return render_to_string(TEMPLATE, {'rental': rental, 'items': items, 'total': total})
+
+
+async def aget_html(rental_id):
+    """Hisob-faktura HTML'i, ijara topilmasa - None"""
+    version = await Rental.objects.filter(pk=rental_id).values_list('updated_at', 'end_date').afirst()
+    if version is None:
+        return None
+    key = make_key(rental_id, *version)
+    html = await cache.aget(key)
+    if html is None:
+        rental = await Rental.objects.select_related('customer').aget(pk=rental_id)
+        items = [item async for item in rental.rentalitem_set.select_related('tool').order_by('id')]
+        # Shablon request'siz - faqat tayyor obyektlar, so'rov bajarilmaydi
+        html = render(rental, items)
+        await cache.aset(key, html, timeout=settings.INVOICE_CACHE_TIMEOUT)
+    return html
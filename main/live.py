@@ -0,0 +1,142 @@
+"""Jonli o'zgarishlar: Server-Sent Events uchun jarayon ichidagi tarqatuvchi
+
+Tool, Rental va RentalItem o'zgarganda (signals.py) o'zgargan asboblar
+tranzaksiya davomida yig'iladi va commit'dan keyin bir marta e'lon
+qilinadi: asboblarning yangi sonlari ('inventory') va dashboard
+raqamlarining faqat o'zgarganlari ('stats'). Ulangan mijoz bo'lmasa
+hech qanday so'rov bajarilmaydi.
+
+Hub bitta jarayon ichida ishlaydi: yozuv qaysi oqimda bo'lmasin, hodisa
+har bir obunachining event loop'iga call_soon_threadsafe bilan uzatiladi.
+Bir nechta worker jarayonida har biri faqat o'zida bo'lgan o'zgarishlarni
+tarqatadi.
+"""
+import asyncio
+import json
+import threading
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .db import on_commit_once
+from .models import Tool
+from .stats import aget_inventory_totals, get_inventory_totals
+
+# Sekin mijoz uchun navbat chegarasi - to'lsa mijozga 'reset' yuboriladi
+QUEUE_SIZE = 100
+
+# Proksi va brauzer ulanishni uzib qo'ymasligi uchun izoh satri (soniya)
+HEARTBEAT = 15
+
+
+class Subscriber:
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.overflowed = False
+
+    def push(self, event):
+        """Obunachining event loop'ida chaqiriladi"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class Hub:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        # Oxirgi e'lon qilingan dashboard raqamlari - deltalar shunga nisbatan
+        self.stats = None
+
+    def subscribe(self):
+        subscriber = Subscriber(asyncio.get_running_loop())
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+            if not self.subscribers:
+                # Obunachisiz vaqtda o'zgarishlar kuzatilmaydi
+                self.stats = None
+
+    def has_subscribers(self):
+        return bool(self.subscribers)
+
+    def update_stats(self, stats):
+        """Yangi raqamlarni saqlash - o'zgargan kalitlar qaytadi"""
+        with self.lock:
+            previous, self.stats = self.stats or {}, stats
+        return {key: value for key, value in stats.items() if previous.get(key) != value}
+
+    def publish(self, name, data):
+        event = (name, data)
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.push, event)
+            except RuntimeError:
+                # Event loop yopilgan - ulanish allaqachon tugagan
+                self.unsubscribe(subscriber)
+
+
+hub = Hub()
+
+
+def publish(tool_ids):
+    """O'zgarishlarni e'lon qilish - commit'dan keyin"""
+    if not hub.has_subscribers():
+        return
+    tool_ids = sorted(tool_ids)
+    if tool_ids:
+        tools = list(
+            Tool.objects.filter(pk__in=tool_ids)
+            .order_by('id').values('id', 'quantity_total', 'quantity_available', 'is_active')
+        )
+        found = {tool['id'] for tool in tools}
+        hub.publish('inventory', {
+            'tools': tools,
+            'deleted': [tool_id for tool_id in tool_ids if tool_id not in found],
+        })
+    delta = hub.update_stats(get_inventory_totals())
+    if delta:
+        hub.publish('stats', delta)
+
+
+def changed(tool_ids=()):
+    """O'zgarishni belgilash - tranzaksiya tugagach bir marta e'lon qilinadi"""
+    on_commit_once(publish, {tool_id for tool_id in tool_ids if tool_id is not None})
+
+
+def format_event(name, data):
+    return f'event: {name}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+
+async def stream():
+    """SSE oqimi: avval joriy raqamlar, keyin deltalar va heartbeat"""
+    # Avval obuna - joriy raqamlarni olish paytidagi o'zgarishlar ham yetib
+    # keladi. Obuna oqim ichida: raqamlarni olish xato bersa yoki mijoz
+    # uzilsa ham finally obunani o'chiradi
+    subscriber = hub.subscribe()
+    try:
+        snapshot = hub.stats
+        if snapshot is None:
+            snapshot = await aget_inventory_totals()
+            hub.update_stats(snapshot)
+        yield 'retry: 5000\n' + format_event('stats', snapshot)
+        while True:
+            try:
+                name, data = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                continue
+            yield format_event(name, data)
+            if subscriber.overflowed:
+                # Hodisalar tushib qolgan - mijoz sahifani qayta yuklaydi
+                yield format_event('reset', {})
+                return
+    finally:
+        hub.unsubscribe(subscriber)
@@ -0,0 +1,77 @@
+import datetime
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from main.models import Rental
+from main.pricing import rental_days
+from main.signals import data_changed
+
+
+class Command(BaseCommand):
+    help = "Faol ijaralarning kunlari va summasini bugungi sanaga qayta hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Bitta UPDATE so'rovidagi ijaralar soni",
+        )
+        parser.add_argument(
+            '--date',
+            help="Hisoblash sanasi (YYYY-MM-DD), standart - bugun",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size musbat bo'lishi kerak")
+
+        today = None
+        if options['date']:
+            try:
+                today = datetime.date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError("Sana YYYY-MM-DD formatida bo'lishi kerak")
+
+        started = time.monotonic()
+        scanned = updated = 0
+        # Yangi kunlar soni -> ijara id'lari. Bir xil kunli ijaralarning summasi
+        # bitta ifoda (daily_total * kunlar) bilan yoziladi
+        groups = defaultdict(list)
+
+        with transaction.atomic():
+            # Model obyektlari emas, faqat kerakli ustunlar o'qiladi. SQLite bitta
+            # ulanishda o'qilayotgan jadvalga yozishni ajratmaydi, shuning uchun
+            # avval ro'yxatga olinadi
+            rows = list(Rental.objects.filter(status='active').values_list(
+                'id', 'start_date', 'end_date', 'billed_days',
+            ))
+            for rental_id, start_date, end_date, billed_days in rows:
+                scanned += 1
+                days = rental_days(start_date, end_date, today=today)
+                # Kunlar o'zgarmagan bo'lsa yozish shart emas
+                if days != billed_days:
+                    groups[days].append(rental_id)
+
+            for days, ids in groups.items():
+                for offset in range(0, len(ids), batch_size):
+                    updated += Rental.objects.filter(id__in=ids[offset:offset + batch_size]).update(
+                        billed_days=days,
+                        total_amount=F('daily_total') * days,
+                        updated_at=timezone.now(),
+                    )
+
+            # update() signal yubormaydi - statistika keshi, jadval versiyasi,
+            # jamlanmalar va jonli obunachilar shu signal orqali yangilanadi
+            changed_ids = [rental_id for ids in groups.values() for rental_id in ids]
+            if changed_ids:
+                data_changed.send(sender=Rental, ids=changed_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{scanned} ta faol ijara tekshirildi, {updated} tasi yangilandi "
+            f"({time.monotonic() - started:.2f} s)"
+        ))
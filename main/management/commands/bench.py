@@ -0,0 +1,124 @@
+import json
+import math
+import random
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from main import synthetic
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'bench_baseline.json'
+
+
+class Command(BaseCommand):
+    help = (
+        "Sintetik ma'lumotlar bilan ko'rinishlarni o'lchash: p50/p95 kechikish va SQL so'rovlar soni. "
+        "Alohida test bazasida ishlaydi, asosiy bazaga tegmaydi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tools', type=int, default=10_000)
+        parser.add_argument('--customers', type=int, default=50_000)
+        parser.add_argument('--rentals', type=int, default=200_000)
+        parser.add_argument('--requests', type=int, default=20, help="Har bir ko'rinish uchun so'rovlar soni")
+        parser.add_argument('--batch-size', type=int, default=5000, help="bulk_create partiyasi")
+        parser.add_argument('--seed', type=int, default=1, help="Tasodifiy sonlar urug'i")
+        parser.add_argument(
+            '--cache', choices=tuple(synthetic.CACHE_BACKENDS), default='dummy',
+            help="dummy - har so'rov keshsiz (eng yomon holat), locmem - odatdagi kesh",
+        )
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="Bazaviy natijalar fayli (JSON)")
+        parser.add_argument('--save-baseline', action='store_true', help="Natijani bazaviy sifatida saqlash")
+        parser.add_argument(
+            '--tolerance', type=float, default=0.5,
+            help="p95 uchun ruxsat etilgan o'sish ulushi (0.5 = 50%%)",
+        )
+        parser.add_argument(
+            '--min-delta-ms', type=float, default=2.0,
+            help="Bundan kichik p95 farqi shovqin deb hisoblanadi",
+        )
+
+    def handle(self, *args, **options):
+        for name in ('tools', 'customers', 'rentals', 'requests', 'batch_size'):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} musbat bo'lishi kerak")
+
+        sizes = {name: options[name] for name in ('tools', 'customers', 'rentals')}
+        # Asosiy kesh ham ishlatilmaydi - o'lchov natijalari jonli keshga aralashmaydi
+        with synthetic.test_database(options['cache']):
+            started = time.monotonic()
+            synthetic.seed(random.Random(options['seed']), options['batch_size'], **sizes)
+            self.stdout.write(f"Ma'lumotlar tayyor: {sizes} ({time.monotonic() - started:.1f} s)")
+            results = self.run_scenarios(options['requests'])
+
+        self.report(results)
+
+        baseline_path = Path(options['baseline'])
+        current = {'sizes': sizes, 'cache': options['cache'], 'results': results}
+        if options['save_baseline']:
+            baseline_path.write_text(json.dumps(current, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f"Bazaviy natija saqlandi: {baseline_path}"))
+        elif baseline_path.exists():
+            self.compare(json.loads(baseline_path.read_text(encoding='utf-8')), current, options)
+
+    # O'lchov
+
+    def run_scenarios(self, requests):
+        client = Client()
+        results = {}
+        for name, method, url, data in synthetic.scenarios():
+            timings, queries = [], []
+            # Birinchi so'rov - ulanish va shablonlarni isitish uchun, hisoblanmaydi
+            for attempt in range(requests + 1):
+                with synthetic.capture_queries() as captured:
+                    started = time.perf_counter()
+                    response = getattr(client, method)(url, data)
+                    elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    raise CommandError(f"{name}: {url} -> {response.status_code}")
+                if attempt:
+                    timings.append(elapsed * 1000)
+                    queries.append(len(captured))
+            results[name] = {
+                'p50_ms': round(percentile(timings, 50), 2),
+                'p95_ms': round(percentile(timings, 95), 2),
+                'queries': max(queries),
+            }
+        return results
+
+    def report(self, results):
+        width = max(len(name) for name in results)
+        self.stdout.write(f"{'view':<{width}}  {'p50 ms':>9}  {'p95 ms':>9}  {'queries':>7}")
+        for name, row in results.items():
+            self.stdout.write(f"{name:<{width}}  {row['p50_ms']:>9.2f}  {row['p95_ms']:>9.2f}  {row['queries']:>7}")
+
+    def compare(self, baseline, current, options):
+        if baseline.get('sizes') != current['sizes'] or baseline.get('cache') != current['cache']:
+            raise CommandError(
+                f"Bazaviy natija boshqa sharoitda olingan ({baseline.get('sizes')}, kesh={baseline.get('cache')}). "
+                "Xuddi shu parametrlar bilan ishga tushiring yoki --save-baseline bilan yangilang"
+            )
+
+        failures = []
+        for name, row in current['results'].items():
+            base = baseline['results'].get(name)
+            if base is None:
+                continue
+            if row['queries'] > base['queries']:
+                failures.append(f"{name}: so'rovlar {base['queries']} -> {row['queries']}")
+            limit = base['p95_ms'] * (1 + options['tolerance'])
+            if row['p95_ms'] > limit and row['p95_ms'] - base['p95_ms'] > options['min_delta_ms']:
+                failures.append(f"{name}: p95 {base['p95_ms']:.2f} -> {row['p95_ms']:.2f} ms")
+
+        if failures:
+            raise CommandError("Regressiya:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("Bazaviy natijaga nisbatan regressiya yo'q"))
+
+
+def percentile(values, percent):
+    """Eng yaqin rank usuli"""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
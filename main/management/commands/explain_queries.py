@@ -0,0 +1,100 @@
+import random
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+
+from main import synthetic
+
+# To'liq o'qilishi sekinlashuvga olib keladigan jadvallar
+HOT_TABLES = ('main_rental', 'main_rentalitem', 'main_customer', 'main_tool')
+
+# Kutilgan to'liq o'qishlar: ssenariy -> jadvallar. Bu so'rovlar butun
+# jadvalni jamlaydi - indeks ularni tezlashtirmaydi:
+#   main_tool - ombor jami va fasetlar, ijara qo'shish sahifasidagi asboblar ro'yxati
+#   main_customer - mijozlar ro'yxati har bir mijoz bo'yicha jamlanadi (daromad bo'yicha tartib)
+EXPECTED_SCANS = {
+    'dashboard': {'main_tool'},
+    'api_stats': {'main_tool'},
+    'tool_list': {'main_tool'},
+    'tool_list_in_stock': {'main_tool'},
+    'add_rental_items': {'main_tool'},
+    'customer_list': {'main_customer'},
+    'customer_list_revenue': {'main_customer'},
+}
+
+# "SCAN main_rental" yoki "SCAN U0" - indekssiz to'liq o'qish. Indeks orqali
+# SCAN faqat natija baribir alohida saralansa to'liq o'qish hisoblanadi
+FULL_SCAN = re.compile(r'^SCAN (\S+)(?: USING INDEX \S+)?$')
+SORTED = 'USE TEMP B-TREE FOR ORDER BY'
+# FROM/JOIN "jadval" [taxallus]
+TABLE_ALIAS = re.compile(r'(?:FROM|JOIN)\s+"(\w+)"(?:\s+(?!ON\b|WHERE\b|INNER\b|LEFT\b|GROUP\b|ORDER\b|LIMIT\b)(\w+))?')
+
+
+class Command(BaseCommand):
+    help = (
+        "Asosiy ko'rinishlarning SQL so'rovlarini EXPLAIN QUERY PLAN bilan tekshirish: "
+        "katta jadvallarni indekssiz to'liq o'qish topilsa xato bilan tugaydi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tools', type=int, default=200)
+        parser.add_argument('--customers', type=int, default=500)
+        parser.add_argument('--rentals', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=1, help="Tasodifiy sonlar urug'i")
+        parser.add_argument('--show-plans', action='store_true', help="Barcha so'rovlar rejasini chiqarish")
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in ('tools', 'customers', 'rentals')}
+        with synthetic.test_database():
+            synthetic.seed(random.Random(options['seed']), 1000, **sizes)
+            problems = self.check_scenarios(options['show_plans'])
+
+        if problems:
+            raise CommandError("Indekssiz to'liq o'qishlar:\n  " + "\n  ".join(problems))
+        self.stdout.write(self.style.SUCCESS("Kutilmagan to'liq o'qishlar yo'q"))
+
+    def check_scenarios(self, show_plans):
+        client = Client()
+        problems = []
+        for name, method, url, data in synthetic.scenarios():
+            with synthetic.capture_queries() as captured:
+                response = getattr(client, method)(url, data)
+            if response.status_code >= 400:
+                raise CommandError(f"{name}: {url} -> {response.status_code}")
+
+            allowed = EXPECTED_SCANS.get(name, ())
+            for alias, sql in captured:
+                if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+                    continue
+                plan = explain(alias, sql)
+                if show_plans:
+                    self.stdout.write(f"[{name}] {sql}")
+                    for detail in plan:
+                        self.stdout.write(f"    {detail}")
+                for table in full_scans(sql, plan):
+                    if table in HOT_TABLES and table not in allowed:
+                        problems.append(f"{name}: {table} - {sql[:200]}")
+        return problems
+
+
+def explain(alias, sql):
+    """Rejaning 'detail' qatorlari"""
+    with connections[alias].cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[3] for row in cursor.fetchall()]
+
+
+def full_scans(sql, plan):
+    """Rejadagi to'liq o'qilgan jadvallar - taxalluslar haqiqiy nomga almashtiriladi"""
+    aliases = {}
+    for table, alias in TABLE_ALIAS.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    sorted_afterwards = SORTED in plan
+    for detail in plan:
+        match = FULL_SCAN.match(detail.strip())
+        if match and (sorted_afterwards or ' USING ' not in detail):
+            yield aliases.get(match.group(1), match.group(1))
@@ -0,0 +1,36 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main import export
+
+
+class Command(BaseCommand):
+    help = "Ijaralar (qatorlari bilan) yoki mijozlarni CSV / JSON Lines ko'rinishida eksport qilish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=export.KINDS, help="Nima eksport qilinadi")
+        parser.add_argument('--format', choices=tuple(export.FORMATS), default='csv', dest='fmt')
+        parser.add_argument('--start', help="Boshlanish sanasidan (YYYY-MM-DD)")
+        parser.add_argument('--end', help="Boshlanish sanasigacha (YYYY-MM-DD)")
+        parser.add_argument('--status', help="Faqat shu holatdagi ijaralar")
+        parser.add_argument('--output', '-o', help="Fayl nomi (standart - stdout)")
+        parser.add_argument(
+            '--chunk-size', type=int, default=export.CHUNK_SIZE,
+            help="Bazadan bir martada o'qiladigan yozuvlar soni",
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size musbat bo'lishi kerak")
+        try:
+            filters = export.parse_filters(options['start'], options['end'], options['status'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        lines = export.stream(options['kind'], options['fmt'], filters, options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+        else:
+            sys.stdout.writelines(lines)
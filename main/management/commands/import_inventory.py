@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main import importer
+
+
+class Command(BaseCommand):
+    help = "Asboblar yoki mijozlarni CSV fayldan ommaviy yuklash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV fayl (birinchi satr - ustun nomlari)")
+        parser.add_argument('--kind', choices=tuple(importer.KINDS), default='tools')
+        parser.add_argument(
+            '--batch-size', type=int, default=importer.BATCH_SIZE,
+            help="Bitta INSERT so'rovidagi yozuvlar soni",
+        )
+        parser.add_argument(
+            '--create-categories', action='store_true',
+            help="Topilmagan kategoriyalarni yaratish",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Faqat tekshirish, bazaga yozmaslik")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size musbat bo'lishi kerak")
+
+        started = time.monotonic()
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as lines:
+                result = importer.import_csv(
+                    options['kind'], lines,
+                    batch_size=options['batch_size'],
+                    create_categories=options['create_categories'],
+                    dry_run=options['dry_run'],
+                )
+        except OSError as error:
+            raise CommandError(f"Faylni o'qib bo'lmadi: {error}")
+        except UnicodeDecodeError:
+            raise CommandError("Fayl UTF-8 kodlashda bo'lishi kerak")
+
+        for line, message in result.errors:
+            self.stderr.write(f"{line}-satr: {message}")
+
+        action = "tekshirildi" if options['dry_run'] else "yuklandi"
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.created} ta yozuv {action}, {len(result.errors)} ta xato "
+            f"({time.monotonic() - started:.2f} s)"
+        ))
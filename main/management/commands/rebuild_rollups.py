@@ -0,0 +1,32 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main import rollups
+
+
+class Command(BaseCommand):
+    help = "Kunlik daromad jamlanmalarini (asbob, kategoriya, mijoz) qayta qurish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help="Boshlanish sanasi (YYYY-MM-DD), standart - eng birinchi kun")
+        parser.add_argument('--end', help="Tugash sanasi (YYYY-MM-DD), standart - oxirgi kun")
+
+    def handle(self, *args, **options):
+        try:
+            start, end = (
+                datetime.date.fromisoformat(options[name]) if options[name] else None
+                for name in ('start', 'end')
+            )
+        except ValueError:
+            raise CommandError("Sana YYYY-MM-DD formatida bo'lishi kerak")
+        if start and end and end < start:
+            raise CommandError("--end --start dan oldin bo'lishi mumkin emas")
+
+        started = time.monotonic()
+        days = rollups.rebuild(start, end)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{days} kunlik jamlanma qayta qurildi ({time.monotonic() - started:.2f} s)"
+        ))
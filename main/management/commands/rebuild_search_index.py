@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from main import search
+
+
+class Command(BaseCommand):
+    help = "FTS5 qidiruv indeksini (ijaralar, mijozlar, asboblar) qayta qurish"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'kinds', nargs='*',
+            help=f"Faqat shu turlarni qayta qurish: {', '.join(search.TABLES)} (standart - hammasi)",
+        )
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            raise CommandError("Qidiruv indeksi faqat SQLite bazasida ishlaydi")
+
+        kinds = options['kinds'] or tuple(search.TABLES)
+        unknown = set(kinds) - set(search.TABLES)
+        if unknown:
+            raise CommandError(f"Noma'lum tur: {', '.join(sorted(unknown))}")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Jadval o'chirilgan yoki buzilgan bo'lsa ham qayta yaratiladi
+            search.create_tables(cursor)
+            search.rebuild(cursor, kinds)
+
+        self.stdout.write(self.style.SUCCESS(f"Qidiruv indeksi qayta qurildi: {', '.join(kinds)}"))
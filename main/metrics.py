@@ -0,0 +1,192 @@
+"""So'rovlar metrikalari: URL nomi bo'yicha kechikish, SQL so'rovlar soni va vaqti
+
+Har bir ulanishga ochilganda ``execute_wrapper`` (record_query) qo'shiladi;
+MetricsMiddleware so'rov davomida ContextVar'ga hisoblagich qo'yadi. Shu
+tufayli async ko'rinishlarda sync_to_async oqimidagi ulanishlar ham
+hisobga olinadi.
+
+Natijalar jarayon xotirasida yig'iladi va ``/metrics`` manzilida Prometheus
+matn formatida beriladi - tashqi servis kerak emas. Bir nechta worker
+jarayonida har biri o'z qiymatlarini beradi.
+
+settings.METRICS_QUERY_THRESHOLD dan ko'p so'rov bajargan so'rovlar
+'main.metrics' logger'iga yoziladi.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Kechikish chegaralari (soniya) va so'rovlar soni chegaralari
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.latency = Histogram(getattr(settings, 'METRICS_LATENCY_BUCKETS', LATENCY_BUCKETS))
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.sql_time = 0.0
+        self.responses = {}  # status kodi -> soni
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view, status, duration, queries, sql_time):
+        with self.lock:
+            metrics = self.views.get(view)
+            if metrics is None:
+                metrics = self.views[view] = ViewMetrics()
+            metrics.latency.observe(duration)
+            metrics.queries.observe(queries)
+            metrics.sql_time += sql_time
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+
+    def render(self):
+        """Prometheus matn formati (version 0.0.4)"""
+        with self.lock:
+            views = sorted(self.views.items())
+            lines = []
+
+            def histogram(name, help_text, attr):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for view, metrics in views:
+                    hist = getattr(metrics, attr)
+                    label = f'view="{escape(view)}"'
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{label},le="+Inf"}} {hist.count}')
+                    lines.append(f'{name}_sum{{{label}}} {hist.total}')
+                    lines.append(f'{name}_count{{{label}}} {hist.count}')
+
+            histogram('main_request_duration_seconds', "So'rov bajarilish vaqti", 'latency')
+            histogram('main_request_queries', "Bitta so'rovdagi SQL so'rovlar soni", 'queries')
+
+            lines.append("# HELP main_sql_duration_seconds_total SQL so'rovlarga ketgan jami vaqt")
+            lines.append('# TYPE main_sql_duration_seconds_total counter')
+            for view, metrics in views:
+                lines.append(f'main_sql_duration_seconds_total{{view="{escape(view)}"}} {metrics.sql_time}')
+
+            lines.append("# HELP main_requests_total Javob kodlari bo'yicha so'rovlar soni")
+            lines.append('# TYPE main_requests_total counter')
+            for view, metrics in views:
+                for status, count in sorted(metrics.responses.items()):
+                    lines.append(f'main_requests_total{{view="{escape(view)}",status="{status}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class QueryCounter:
+    """Bitta so'rovdagi SQL so'rovlar soni va vaqti"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+_counter = ContextVar('main_metrics_counter', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper - joriy so'rov hisoblagichiga yozadi"""
+    counter = _counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        counter.duration += time.perf_counter() - started
+        counter.count += 1
+
+
+def install(sender, connection, **kwargs):
+    """connection_created signali - ulanishga record_query'ni bir marta qo'shish"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match._func_path
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'METRICS_QUERY_THRESHOLD', None)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        token = _counter.set(counter)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _counter.reset(token)
+        self.finish(request, response, counter, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        token = _counter.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _counter.reset(token)
+        self.finish(request, response, counter, time.perf_counter() - started)
+        return response
+
+    def finish(self, request, response, counter, duration):
+        view = view_name(request)
+        registry.record(view, response.status_code, duration, counter.count, counter.duration)
+        if self.threshold is not None and counter.count > self.threshold:
+            logger.warning(
+                "%s %s (%s): %d ta SQL so'rov, %.1f ms SQL, %.1f ms jami",
+                request.method, request.path, view, counter.count,
+                counter.duration * 1000, duration * 1000,
+            )
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:28
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def rental_days(start_date, end_date):
+    """Ijara kunlari (main.pricing.rental_days nusxasi - migratsiya o'zgarmasligi uchun)"""
+    try:
+        # Tugash sanasi bo'lmasa - faol ijara, bugungacha
+        last_day = end_date or timezone.now().date()
+        days = (last_day - start_date).days
+        return days + 1 if days >= 0 else 1
+    except (TypeError, ValueError):
+        return 1
+
+
+def fill_daily_total(apps, schema_editor):
+    Rental = apps.get_model('main', 'Rental')
+    RentalItem = apps.get_model('main', 'RentalItem')
+
+    # Kunlik summa - bitta UPDATE bilan qatorlardan
+    daily = (
+        RentalItem.objects.filter(rental=OuterRef('pk'))
+        .values('rental')
+        .annotate(total=Sum(F('quantity') * F('daily_rate'), output_field=DecimalField()))
+        .values('total')
+    )
+    Rental.objects.update(daily_total=Coalesce(Subquery(daily), Decimal('0'), output_field=DecimalField()))
+
+    # Jami summani Decimal'da aniq qayta hisoblash
+    rentals = []
+    for rental in Rental.objects.only('start_date', 'end_date', 'daily_total').iterator(chunk_size=2000):
+        rental.total_amount = rental.daily_total * rental_days(rental.start_date, rental.end_date)
+        rentals.append(rental)
+    Rental.objects.bulk_update(rentals, ['total_amount'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_alter_rentalitem_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rental',
+            name='daily_total',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Kunlik summa'),
+        ),
+        migrations.RunPython(fill_daily_total, migrations.RunPython.noop),
+    ]
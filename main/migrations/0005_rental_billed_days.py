@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:29
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def rental_days(start_date, end_date):
+    """Ijara kunlari (main.pricing.rental_days nusxasi - migratsiya o'zgarmasligi uchun)"""
+    try:
+        # Tugash sanasi bo'lmasa - faol ijara, bugungacha
+        last_day = end_date or timezone.now().date()
+        days = (last_day - start_date).days
+        return days + 1 if days >= 0 else 1
+    except (TypeError, ValueError):
+        return 1
+
+
+def fill_billed_days(apps, schema_editor):
+    Rental = apps.get_model('main', 'Rental')
+    rentals = []
+    for rental in Rental.objects.only('start_date', 'end_date').iterator(chunk_size=2000):
+        rental.billed_days = rental_days(rental.start_date, rental.end_date)
+        rentals.append(rental)
+    Rental.objects.bulk_update(rentals, ['billed_days'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_rental_daily_total'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rental',
+            name='billed_days',
+            field=models.PositiveIntegerField(default=1, verbose_name='Hisoblangan kunlar'),
+        ),
+        migrations.RunPython(fill_billed_days, migrations.RunPython.noop),
+    ]
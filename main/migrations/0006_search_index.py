@@ -0,0 +1,57 @@
+from django.db import migrations
+
+# main.search dan nusxa - keyingi o'zgarishlar bu migratsiyaga ta'sir qilmasligi uchun
+TOKENIZER = 'unicode61 remove_diacritics 2'
+
+TABLES = {
+    'rental': ('main_rental_fts', ('name', 'phone', 'tools')),
+    'customer': ('main_customer_fts', ('name', 'phone')),
+    'tool': ('main_tool_fts', ('name', 'category')),
+}
+
+SOURCES = {
+    'rental': (
+        "SELECT r.id, c.name, c.phone, "
+        "(SELECT group_concat(t.name, ' ') FROM main_rentalitem i "
+        "JOIN main_tool t ON t.id = i.tool_id WHERE i.rental_id = r.id) "
+        "FROM main_rental r JOIN main_customer c ON c.id = r.customer_id"
+    ),
+    'customer': "SELECT c.id, c.name, c.phone FROM main_customer c",
+    'tool': (
+        "SELECT t.id, t.name, k.name FROM main_tool t "
+        "JOIN main_toolcategory k ON k.id = t.category_id"
+    ),
+}
+
+
+def create_index(apps, schema_editor):
+    # FTS5 faqat SQLite'da, boshqa bazalarda icontains ishlatiladi
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for kind, (table, columns) in TABLES.items():
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} "
+                f"USING fts5({', '.join(columns)}, tokenize='{TOKENIZER}')"
+            )
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table}(rowid, {', '.join(columns)}) {SOURCES[kind]}")
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, _ in TABLES.values():
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_rental_billed_days'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='rental',
+            name='status',
+            field=models.CharField(choices=[('reserved', 'Bron qilingan'), ('active', 'Faol'), ('completed', 'Yakunlangan'), ('cancelled', 'Bekor qilingan')], default='active', max_length=20, verbose_name='Holati'),
+        ),
+    ]
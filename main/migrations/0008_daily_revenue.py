@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_rental_reserved_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryDailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Kun')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Ijaraga berilgan soni')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Daromad')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.toolcategory', verbose_name='Kategoriya')),
+            ],
+            options={
+                'verbose_name': 'Kategoriya kunlik daromadi',
+                'verbose_name_plural': 'Kategoriyalar kunlik daromadi',
+                'unique_together': {('day', 'category')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomerDailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Kun')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Ijaraga berilgan soni')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Daromad')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.customer', verbose_name='Mijoz')),
+            ],
+            options={
+                'verbose_name': 'Mijoz kunlik daromadi',
+                'verbose_name_plural': 'Mijozlar kunlik daromadi',
+                'unique_together': {('day', 'customer')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ToolDailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Kun')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Ijaraga berilgan soni')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Daromad')),
+                ('tool', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='main.tool', verbose_name='Asbob')),
+            ],
+            options={
+                'verbose_name': 'Asbob kunlik daromadi',
+                'verbose_name_plural': 'Asboblar kunlik daromadi',
+                'unique_together': {('day', 'tool')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_daily_revenue'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['created_at'], name='rental_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['status', 'created_at'], name='rental_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rental',
+            index=models.Index(fields=['start_date', 'status'], name='rental_start_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rentalitem',
+            index=models.Index(fields=['tool', 'rental'], name='rentalitem_tool_rental_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tool',
+            index=models.Index(fields=['name'], name='tool_name_idx'),
+        ),
+    ]
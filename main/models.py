@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.utils import timezone
 
+from . import pricing
+from .tracking import ChangeTrackingMixin
+
 class ToolCategory(models.Model):
     name = models.CharField(max_length=100, verbose_name="Kategoriya nomi")
     
@@ -11,7 +15,7 @@ class ToolCategory(models.Model):
         verbose_name = "Asbob kategoriyasi"
         verbose_name_plural = "Asbob kategoriyalari"
 
-class Tool(models.Model):
+class Tool(ChangeTrackingMixin, models.Model):
     name = models.CharField(max_length=200, verbose_name="Asbob nomi")
     category = models.ForeignKey(ToolCategory, on_delete=models.CASCADE, verbose_name="Kategoriya")
     daily_price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Kunlik narx")
@@ -19,18 +23,17 @@ class Tool(models.Model):
     quantity_available = models.IntegerField(verbose_name="Mavjud soni")
     is_active = models.BooleanField(default=True, verbose_name="Faol")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def save(self, *args, **kwargs):
         # Agar yangi asbob bo'lsa
-        if not self.pk:
+        if self._state.adding:
             self.quantity_available = self.quantity_total
-        else:
-            # Mavjud asbobni yangilash
-            old_obj = Tool.objects.get(pk=self.pk)
-            if old_obj.quantity_total != self.quantity_total:
-                # Jami son o'zgarsa, mavjud sonni moslashtirish
-                difference = self.quantity_total - old_obj.quantity_total
-                self.quantity_available += difference
+        elif self.is_tracked and self.has_changed('quantity_total'):
+            # Jami son o'zgarsa, mavjud sonni farq bilan moslashtirish. F() - shu
+            # orada band qilingan asboblar yo'qolmasligi uchun
+            difference = self.quantity_total - self.loaded_value('quantity_total')
+            self.quantity_available = models.F('quantity_available') + difference
         
         super().save(*args, **kwargs)
     
@@ -40,12 +43,17 @@ class Tool(models.Model):
     class Meta:
         verbose_name = "Asbob"
         verbose_name_plural = "Asboblar"
+        indexes = [
+            # Ro'yxat nom bo'yicha tartiblanadi - LIMIT bilan saralashsiz o'qiladi
+            models.Index(fields=['name'], name='tool_name_idx'),
+        ]
 
-class Customer(models.Model):
+class Customer(ChangeTrackingMixin, models.Model):
     name = models.CharField(max_length=200, verbose_name="Ism")
     phone = models.CharField(max_length=20, verbose_name="Telefon")
     address = models.TextField(verbose_name="Manzil")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
@@ -54,8 +62,9 @@ class Customer(models.Model):
         verbose_name = "Mijoz"
         verbose_name_plural = "Mijozlar"
 
-class Rental(models.Model):
+class Rental(ChangeTrackingMixin, models.Model):
     STATUS_CHOICES = [
+        ('reserved', 'Bron qilingan'),
         ('active', 'Faol'),
         ('completed', 'Yakunlangan'),
         ('cancelled', 'Bekor qilingan'),
@@ -66,36 +75,38 @@ class Rental(models.Model):
     end_date = models.DateField(null=True, blank=True, verbose_name="Tugash sanasi")
     total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Jami summa")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active', verbose_name="Holati")
+    daily_total = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Kunlik summa")
+    billed_days = models.PositiveIntegerField(default=1, verbose_name="Hisoblangan kunlar")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
     def save(self, *args, **kwargs):
-        """SAVE METHODINI QO'SHISH KERAK"""
+        # Summa faqat yangi ijarada yoki sana o'zgarganda qayta hisoblanadi,
+        # va alohida UPDATE emas, shu saqlashning o'zida yoziladi
+        if not (self._state.adding or self.has_changed('start_date', 'end_date')):
+            return super().save(*args, **kwargs)
+        self.billed_days = self.get_total_days()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'billed_days', 'total_amount'}
+        if self._state.adding:
+            self.total_amount = (self.daily_total or 0) * self.billed_days
+            return super().save(*args, **kwargs)
+        # Kunlik summani shu orada qator (apply_item_delta) o'zgartirgan bo'lishi
+        # mumkin - xotiradagi eski qiymat emas, bazadagisi ko'paytiriladi
+        # (accrue_rentals bilan bir xil). Yozilgan total_amount'ni mixin qayta
+        # o'qiydi, unga mos kunlik summa ham yangilanadi
+        self.total_amount = F('daily_total') * self.billed_days
         super().save(*args, **kwargs)
-        # Sana o'zgarganda narxni yangilash
-        self.calculate_total()
+        self.refresh_from_db(fields=['daily_total'])
+    
     def calculate_total(self):
-        """Ijara summasini aniq hisoblash"""
-        items = self.rentalitem_set.all()
-        total = 0
-        for item in items:
-            total += float(item.quantity) * float(item.daily_rate) * item.get_total_days()
-        self.total_amount = total
-        super().save(update_fields=['total_amount'])
-        return total
+        """Ijara summasini qatorlardan to'liq qayta hisoblash"""
+        return pricing.recalculate(self)
     
     def get_total_days(self):
         """Ijara kunlarini hisoblash - xatoliksiz versiya"""
-        try:
-            if self.end_date:
-                # Tugash sanasi bo'lsa
-                days = (self.end_date - self.start_date).days
-                return days + 1 if days >= 0 else 1
-            else:
-                # Faol ijara - bugungacha
-                today = timezone.now().date()
-                days = (today - self.start_date).days
-                return days + 1 if days >= 0 else 1
-        except (TypeError, ValueError):
-            return 1  # Xato yuz bersa, kamida 1 kun
+        return pricing.rental_days(self.start_date, self.end_date)
     
     def __str__(self):
         return f"{self.customer.name} - {self.start_date}"
@@ -103,9 +114,16 @@ class Rental(models.Model):
     class Meta:
         verbose_name = "Ijara"
         verbose_name_plural = "Ijaralar"
+        indexes = [
+            # Ro'yxat (yangilari birinchi) va holat bo'yicha filtr
+            models.Index(fields=['created_at'], name='rental_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='rental_status_created_idx'),
+            # Kunlik jamlanmalar sana bo'yicha qayta hisoblanadi
+            models.Index(fields=['start_date', 'status'], name='rental_start_status_idx'),
+        ]
 
 # models.py
-class RentalItem(models.Model):
+class RentalItem(ChangeTrackingMixin, models.Model):
     rental = models.ForeignKey(Rental, on_delete=models.CASCADE)
     tool = models.ForeignKey(Tool, on_delete=models.CASCADE, verbose_name="Asbob")
     quantity = models.IntegerField(verbose_name="Soni")
@@ -124,16 +142,93 @@ class RentalItem(models.Model):
         total = self.quantity * self.daily_rate * total_days
         return total
     
+    def line_amount(self):
+        """Qatorning kunlik summasi"""
+        return pricing.line_amount(self.quantity, self.daily_rate)
+    
+    def loaded_line_amount(self):
+        """Bazadagi (saqlashdan oldingi) kunlik summa"""
+        return pricing.line_amount(
+            self.loaded_value('quantity', self.quantity),
+            self.loaded_value('daily_rate', self.daily_rate),
+        )
+    
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        # Har safar saqlanganda rental summasini yangilash
-        self.rental.calculate_total()
+        # O'zgarishsiz saqlash bazaga yozilmaydi - ijaraga ham tegilmaydi
+        if self.is_tracked and not self.changed_fields and kwargs.get('update_fields') is None:
+            return super().save(*args, **kwargs)
+        if self._state.adding:
+            old_rental_id, old_amount = None, pricing.ZERO
+        else:
+            old_rental_id = self.loaded_value('rental', self.rental_id)
+            old_amount = self.loaded_line_amount()
+        # Qator va ijara summasi bitta tranzaksiyada yoziladi: signallardagi
+        # kesh versiyalari commit'dan keyin, ya'ni summa ham yozilgach oshadi
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            new_amount = self.line_amount()
+            
+            # Qator boshqa ijaraga o'tkazilgan bo'lsa, eskisidan ayirish
+            if old_rental_id is not None and old_rental_id != self.rental_id:
+                old_rental = Rental.objects.filter(pk=old_rental_id).first()
+                if old_rental is not None:
+                    pricing.apply_item_delta(old_rental, -old_amount)
+                old_amount = pricing.ZERO
+            
+            # Rental summasiga faqat farqni qo'shish
+            pricing.apply_item_delta(self.rental, new_amount - old_amount)
     
     def delete(self, *args, **kwargs):
         rental = self.rental
-        super().delete(*args, **kwargs)
-        # O'chirilganda rental summasini yangilash
-        rental.calculate_total()
+        amount = self.loaded_line_amount()
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            # O'chirilganda rental summasidan ayirish
+            pricing.apply_item_delta(rental, -amount)
+        return result
     
     def __str__(self):
         return f"{self.tool.name} x {self.quantity}"
+    
+    class Meta:
+        indexes = [
+            # Asbob bandligi (availability) va ijaradagi bir xil asbob qatori
+            models.Index(fields=['tool', 'rental'], name='rentalitem_tool_rental_idx'),
+        ]
+
+
+# Kunlik daromad jamlanmalari (main/rollups.py yangilaydi)
+class DailyRevenue(models.Model):
+    day = models.DateField(verbose_name="Kun")
+    units = models.PositiveIntegerField(default=0, verbose_name="Ijaraga berilgan soni")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Daromad")
+    
+    class Meta:
+        abstract = True
+
+
+class ToolDailyRevenue(DailyRevenue):
+    tool = models.ForeignKey(Tool, on_delete=models.CASCADE, verbose_name="Asbob")
+    
+    class Meta:
+        verbose_name = "Asbob kunlik daromadi"
+        verbose_name_plural = "Asboblar kunlik daromadi"
+        unique_together = ('day', 'tool')
+
+
+class CategoryDailyRevenue(DailyRevenue):
+    category = models.ForeignKey(ToolCategory, on_delete=models.CASCADE, verbose_name="Kategoriya")
+    
+    class Meta:
+        verbose_name = "Kategoriya kunlik daromadi"
+        verbose_name_plural = "Kategoriyalar kunlik daromadi"
+        unique_together = ('day', 'category')
+
+
+class CustomerDailyRevenue(DailyRevenue):
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, verbose_name="Mijoz")
+    
+    class Meta:
+        verbose_name = "Mijoz kunlik daromadi"
+        verbose_name_plural = "Mijozlar kunlik daromadi"
+        unique_together = ('day', 'customer')
@@ -0,0 +1,110 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(created_at, pk):
+    raw = f'{created_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Kursorni (created_at, id) ga aylantirish, buzilgan bo'lsa - None"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class KeysetPage:
+    """Kursorli sahifa - Paginator sahifasiga o'xshash interfeys"""
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self.object_list:
+            return ''
+        last = self.object_list[-1]
+        return encode_cursor(last.created_at, last.pk)
+
+    @property
+    def previous_cursor(self):
+        if not self.object_list:
+            return ''
+        first = self.object_list[0]
+        return encode_cursor(first.created_at, first.pk)
+
+
+class KeysetPaginator:
+    """(created_at, id) bo'yicha kamayish tartibida kursorli sahifalash
+
+    OFFSET va COUNT ishlatilmaydi: har bir sahifa indeks bo'yicha bitta
+    LIMIT so'rovi, tarix qancha o'smasin tezligi o'zgarmaydi.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def get_page(self, after=None, before=None):
+        queryset, backwards, has_after = self.page_query(after, before)
+        return self.make_page(list(queryset), backwards, has_after)
+
+    async def aget_page(self, after=None, before=None):
+        queryset, backwards, has_after = self.page_query(after, before)
+        return self.make_page([row async for row in queryset], backwards, has_after)
+
+    def page_query(self, after, before):
+        """Sahifa so'rovi, teskari tartibdami va 'after' kursori berilganmi"""
+        after = decode_cursor(after)
+        before = decode_cursor(before) if after is None else None
+
+        if before is not None:
+            # Oldingi sahifa - teskari tartibda olib, keyin aylantiriladi
+            created_at, pk = before
+            queryset = (
+                self.queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+                .order_by('created_at', 'pk')[:self.per_page + 1]
+            )
+            return queryset, True, False
+
+        queryset = self.queryset
+        if after is not None:
+            created_at, pk = after
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+        return queryset.order_by('-created_at', '-pk')[:self.per_page + 1], False, after is not None
+
+    def make_page(self, rows, backwards, has_after):
+        if backwards:
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            rows.reverse()
+            return KeysetPage(rows, has_next=True, has_previous=has_previous)
+
+        has_next = len(rows) > self.per_page
+        return KeysetPage(rows[:self.per_page], has_next=has_next, has_previous=has_after)
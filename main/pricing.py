@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+from django.db.models import DecimalField, F, Sum
+from django.utils import timezone
+
+from .cache import bump_version, tables_changed
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+
+def rental_days(start_date, end_date=None, today=None):
+    """Ijara kunlari - boshlanish va tugash kuni ham kiradi, kamida 1 kun"""
+    try:
+        # Tugash sanasi bo'lmasa - faol ijara, bugungacha
+        last_day = end_date or today or timezone.now().date()
+        days = (last_day - start_date).days
+        return days + 1 if days >= 0 else 1
+    except (TypeError, ValueError):
+        return 1  # Xato yuz bersa, kamida 1 kun
+
+
+def line_amount(quantity, daily_rate):
+    """Bitta qatorning kunlik summasi (Decimal)"""
+    if quantity is None or daily_rate is None:
+        return ZERO
+    return Decimal(quantity) * Decimal(daily_rate)
+
+
+def apply_item_delta(rental, delta):
+    """Qator o'zgarishini ijara summasiga qo'llash - bitta UPDATE
+
+    Qatorlar qayta o'qilmaydi: kunlik summa delta bilan o'zgaradi, jami summa
+    esa yangi kunlik summa * kunlar sifatida o'sha so'rovning o'zida yoziladi.
+    Summa o'zgarmasa ham (masalan asbob almashtirilganda) qatorlar o'zgargan,
+    shuning uchun ijaraning updated_at qiymati yangilanadi.
+    """
+    now = timezone.now()
+    rental.updated_at = now
+    if not delta:
+        type(rental).objects.filter(pk=rental.pk).update(updated_at=now)
+        return
+    days = rental.get_total_days()
+    type(rental).objects.filter(pk=rental.pk).update(
+        daily_total=F('daily_total') + delta,
+        billed_days=days,
+        total_amount=(F('daily_total') + delta) * days,
+        updated_at=now,
+    )
+    # Xotiradagi obyektni ham moslashtirish
+    rental.daily_total = (rental.daily_total or ZERO) + delta
+    rental.billed_days = days
+    rental.total_amount = rental.daily_total * days
+
+
+def recalculate(rental):
+    """Qatorlardan to'liq qayta hisoblash - faqat tekshiruv va tuzatish uchun"""
+    daily_total = rental.rentalitem_set.aggregate(
+        total=Sum(F('quantity') * F('daily_rate'), output_field=DecimalField())
+    )['total'] or ZERO
+    rental.daily_total = Decimal(daily_total).quantize(CENT)
+    rental.billed_days = rental.get_total_days()
+    rental.total_amount = rental.daily_total * rental.billed_days
+    type(rental).objects.filter(pk=rental.pk).update(
+        daily_total=rental.daily_total,
+        billed_days=rental.billed_days,
+        total_amount=rental.total_amount,
+        updated_at=timezone.now(),
+    )
+    # update() signal yubormaydi
+    bump_version()
+    tables_changed(type(rental))
+    return rental.total_amount
@@ -0,0 +1,134 @@
+"""Kunlik daromad jamlanmalari - asbob, kategoriya va mijoz bo'yicha
+
+Ijara daromadi boshlanish kuniga yoziladi: har bir qator uchun
+soni * kunlik narx * hisoblangan kunlar. Jamlanma kun bo'yicha
+yangilanadi: o'zgargan kunlarning qatorlari o'chirilib, faqat shu
+kunlardagi ijaralardan qayta yig'iladi. Shuning uchun yozuv qaysi yo'l
+bilan (save, update, bulk) kelgani muhim emas - kunni belgilash kifoya.
+
+Bir tranzaksiyadagi barcha belgilangan kunlar commit'dan keyin bir marta
+yangilanadi (main/signals.py). To'liq qayta qurish -
+``manage.py rebuild_rollups``.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, F, Sum
+from django.db.models.functions import TruncMonth
+
+from .db import on_commit_once
+from .models import (
+    CategoryDailyRevenue, CustomerDailyRevenue, Rental, RentalItem, ToolDailyRevenue,
+)
+from .pricing import CENT
+
+# Daromad hisoblanadigan ijara holatlari
+REVENUE_STATUSES = ('active', 'completed')
+
+# Jamlanma modeli va uning kaliti (RentalItem orqali)
+ROLLUPS = (
+    (ToolDailyRevenue, 'tool_id', 'tool_id'),
+    (CategoryDailyRevenue, 'category_id', 'tool__category_id'),
+    (CustomerDailyRevenue, 'customer_id', 'rental__customer_id'),
+)
+
+# Hisobot guruhlari: jamlanma modeli va ko'rsatiladigan nom
+REPORTS = {
+    'tool': (ToolDailyRevenue, 'tool_id', 'tool__name'),
+    'category': (CategoryDailyRevenue, 'category_id', 'category__name'),
+    'customer': (CustomerDailyRevenue, 'customer_id', 'customer__name'),
+}
+
+# Bitta so'rovdagi kunlar soni (SQLite parametrlar chegarasi)
+CHUNK_SIZE = 500
+
+
+def refresh(days):
+    """Berilgan kunlarning jamlanmalarini manba jadvallardan qayta yig'ish"""
+    days = sorted({day for day in days if day is not None})
+    revenue = F('quantity') * F('daily_rate') * F('rental__billed_days')
+    with transaction.atomic():
+        for start in range(0, len(days), CHUNK_SIZE):
+            chunk = days[start:start + CHUNK_SIZE]
+            items = RentalItem.objects.filter(
+                rental__start_date__in=chunk,
+                rental__status__in=REVENUE_STATUSES,
+            )
+            for model, field, key in ROLLUPS:
+                model.objects.filter(day__in=chunk).delete()
+                rows = (
+                    items.values_list('rental__start_date', key)
+                    .annotate(
+                        units=Sum('quantity'),
+                        revenue=Sum(revenue, output_field=DecimalField(max_digits=14, decimal_places=2)),
+                    )
+                    .order_by()
+                )
+                model.objects.bulk_create([
+                    model(**{
+                        'day': day,
+                        field: pk,
+                        'units': units,
+                        'revenue': Decimal(revenue or 0).quantize(CENT),
+                    })
+                    for day, pk, units, revenue in rows
+                ])
+
+
+def rebuild(start=None, end=None):
+    """Jamlanmalarni (yoki [start, end] oralig'ini) to'liq qayta qurish. Kunlar soni qaytadi"""
+    dates = {}
+    if start:
+        dates['__gte'] = start
+    if end:
+        dates['__lte'] = end
+    days = set(
+        Rental.objects.filter(**{f'start_date{lookup}': value for lookup, value in dates.items()})
+        .values_list('start_date', flat=True)
+        .distinct()
+    )
+    with transaction.atomic():
+        # Ijarasi qolmagan kunlarning eski qatorlari ham o'chadi
+        for model, _, _ in ROLLUPS:
+            model.objects.filter(**{f'day{lookup}': value for lookup, value in dates.items()}).delete()
+        refresh(days)
+    return len(days)
+
+
+def mark_dirty(days):
+    """Kunlarni yangilashga belgilash - tranzaksiya tugagach bir marta yangilanadi"""
+    days = {day for day in days if day is not None}
+    if days:
+        on_commit_once(refresh, days)
+
+
+def rental_days(rental_ids):
+    """Ijaralarning boshlanish kunlari"""
+    rental_ids = list(rental_ids)
+    days = set()
+    for start in range(0, len(rental_ids), CHUNK_SIZE):
+        days.update(
+            Rental.objects.filter(pk__in=rental_ids[start:start + CHUNK_SIZE])
+            .values_list('start_date', flat=True)
+            .distinct()
+        )
+    return days
+
+
+def revenue_report(by, start, end, limit=50):
+    """[start, end] oralig'idagi daromad - faqat jamlanma qatorlaridan, 3 ta so'rov"""
+    model, key, label = REPORTS[by]
+    rows = model.objects.filter(day__range=(start, end))
+    return {
+        'totals': rows.aggregate(units=Sum('units'), revenue=Sum('revenue')),
+        'months': list(
+            rows.annotate(month=TruncMonth('day')).values('month')
+            .annotate(units=Sum('units'), revenue=Sum('revenue'))
+            .order_by('month')
+        ),
+        'top': list(
+            rows.values(key, name=F(label))
+            .annotate(units=Sum('units'), revenue=Sum('revenue'))
+            .order_by('-revenue')[:limit]
+        ),
+    }
@@ -0,0 +1,166 @@
+"""SQLite FTS5 qidiruv indeksi - ijaralar, mijozlar va asboblar uchun
+
+Har bir tur uchun alohida virtual jadval, rowid = obyekt id. Indeks
+signallar orqali yangilanadi (main/signals.py), to'liq qayta qurish -
+``manage.py rebuild_search_index``. SQLite bo'lmagan bazada oddiy
+icontains qidiruvi ishlatiladi.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+TOKENIZER = 'unicode61 remove_diacritics 2'
+
+# Bitta so'rovdagi id'lar soni (SQLite parametrlar chegarasi)
+CHUNK_SIZE = 500
+
+TABLES = {
+    'rental': 'main_rental_fts',
+    'customer': 'main_customer_fts',
+    'tool': 'main_tool_fts',
+}
+
+COLUMNS = {
+    'rental': ('name', 'phone', 'tools'),
+    'customer': ('name', 'phone'),
+    'tool': ('name', 'category'),
+}
+
+# Indeksga yoziladigan qiymatlar to'g'ridan-to'g'ri SQL bilan olinadi,
+# shuning uchun bir nechta obyekt ham, butun jadval ham bitta INSERT ... SELECT
+SOURCES = {
+    'rental': (
+        "SELECT r.id, c.name, c.phone, "
+        "(SELECT group_concat(t.name, ' ') FROM main_rentalitem i "
+        "JOIN main_tool t ON t.id = i.tool_id WHERE i.rental_id = r.id) "
+        "FROM main_rental r JOIN main_customer c ON c.id = r.customer_id",
+        'r.id',
+    ),
+    'customer': (
+        "SELECT c.id, c.name, c.phone FROM main_customer c",
+        'c.id',
+    ),
+    'tool': (
+        "SELECT t.id, t.name, k.name FROM main_tool t "
+        "JOIN main_toolcategory k ON k.id = t.category_id",
+        't.id',
+    ),
+}
+
+# FTS5 bo'lmaganda ishlatiladigan maydonlar
+FALLBACK_FIELDS = {
+    'rental': ('customer__name', 'customer__phone', 'rentalitem__tool__name'),
+    'customer': ('name', 'phone'),
+    'tool': ('name', 'category__name'),
+}
+
+# Telefon raqami bitta token ("998901234567") - prefiks qidiruv uning
+# o'rtasini ("90123") topmaydi, shuning uchun faqat raqamli so'rovda
+# telefon maydoni qo'shimcha ravishda contains bilan tekshiriladi
+PHONE_FIELDS = {
+    'rental': 'customer__phone',
+    'customer': 'phone',
+}
+
+PHONE_QUERY = re.compile(r'^[\d\s()+-]+$')
+
+
+def is_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def create_tables(cursor):
+    for kind, table in TABLES.items():
+        columns = ', '.join(COLUMNS[kind])
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({columns}, tokenize='{TOKENIZER}')"
+        )
+
+
+def drop_tables(cursor):
+    for table in TABLES.values():
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def rebuild(cursor, kinds=tuple(TABLES)):
+    """Indeksni to'liq qayta qurish"""
+    for kind in kinds:
+        table = TABLES[kind]
+        source, _ = SOURCES[kind]
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"INSERT INTO {table}(rowid, {', '.join(COLUMNS[kind])}) {source}")
+
+
+def index(kind, ids):
+    """Berilgan obyektlarni indeksda yangilash (o'chirilganlari olib tashlanadi)"""
+    if not is_enabled():
+        return
+    ids = list(ids)
+    table = TABLES[kind]
+    source, id_column = SOURCES[kind]
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start:start + CHUNK_SIZE]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"DELETE FROM {table} WHERE rowid IN ({placeholders})", chunk)
+            cursor.execute(
+                f"INSERT INTO {table}(rowid, {', '.join(COLUMNS[kind])}) "
+                f"{source} WHERE {id_column} IN ({placeholders})",
+                chunk,
+            )
+
+
+def indexed_name(kind, pk):
+    """Indeksdagi joriy nom - o'zgarganini bilish uchun"""
+    if not is_enabled():
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT name FROM {TABLES[kind]} WHERE rowid = %s", [pk])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def build_match(query):
+    """Foydalanuvchi matnidan FTS5 so'rovi: har bir so'z prefiks bo'yicha, hammasi AND"""
+    tokens = re.findall(r'\w+', query or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def phone_lookup(kind, query):
+    """Raqamli so'rov uchun telefon bo'yicha Q, aks holda None"""
+    field = PHONE_FIELDS.get(kind)
+    if field is None or not PHONE_QUERY.match(query):
+        return None
+    return Q(**{f'{field}__contains': re.sub(r'\D', '', query)})
+
+
+def search(queryset, kind, query, ranked=False):
+    """Querysetni qidiruv bo'yicha filtrlash, ranked=True bo'lsa mosligi bo'yicha tartiblash"""
+    match = build_match(query)
+    if match is None:
+        return queryset
+
+    if not is_enabled():
+        lookups = [Q(**{f'{field}__icontains': query}) for field in FALLBACK_FIELDS[kind]]
+        return queryset.filter(reduce(or_, lookups)).distinct()
+
+    table = TABLES[kind]
+    lookup = Q(pk__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [match]))
+    phone = phone_lookup(kind, query)
+    if phone is not None:
+        lookup |= phone
+    queryset = queryset.filter(lookup)
+    if ranked:
+        db_table = queryset.model._meta.db_table
+        # Faqat telefon o'rtasi bo'yicha topilganlarda rank yo'q - ular oxirida
+        queryset = queryset.annotate(search_rank=RawSQL(
+            f'SELECT rank FROM {table} WHERE {table} MATCH %s AND rowid = "{db_table}"."id"',
+            [match],
+        )).order_by(F('search_rank').asc(nulls_last=True))
+    return queryset
@@ -0,0 +1,193 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+from django.utils import timezone
+
+from . import live, rollups, search
+from .cache import bump_version, tables_changed
+from .models import Customer, Rental, RentalItem, Tool, ToolCategory
+
+STATS_MODELS = (Tool, ToolCategory, Rental, RentalItem, Customer)
+
+# QuerySet.update()/bulk_* bilan yozilganda post_save yuborilmaydi, shuning
+# uchun bunday joylar shu signalni yuboradi: sender - model, ids - id'lar
+data_changed = Signal()
+
+
+def invalidate_stats(sender, **kwargs):
+    """Statistika keshini eskirtirish"""
+    bump_version()
+
+
+for model in STATS_MODELS:
+    post_save.connect(invalidate_stats, sender=model, dispatch_uid=f'stats_save_{model.__name__}')
+    post_delete.connect(invalidate_stats, sender=model, dispatch_uid=f'stats_delete_{model.__name__}')
+data_changed.connect(invalidate_stats, dispatch_uid='stats_data_changed')
+
+
+# Jadval versiyalari (shartli GET). Qatorlar ijara summasini ham o'zgartiradi
+VERSIONED_TABLES = {
+    Tool: (Tool,),
+    ToolCategory: (ToolCategory,),
+    Customer: (Customer,),
+    Rental: (Rental,),
+    RentalItem: (RentalItem, Rental),
+}
+
+
+def bump_tables(sender, **kwargs):
+    tables_changed(*VERSIONED_TABLES[sender])
+
+
+for model in VERSIONED_TABLES:
+    post_save.connect(bump_tables, sender=model, dispatch_uid=f'tables_save_{model.__name__}')
+    post_delete.connect(bump_tables, sender=model, dispatch_uid=f'tables_delete_{model.__name__}')
+
+
+def bump_tables_data_changed(sender, **kwargs):
+    if sender in VERSIONED_TABLES:
+        bump_tables(sender)
+
+
+data_changed.connect(bump_tables_data_changed, dispatch_uid='tables_data_changed')
+
+
+# Qidiruv indeksini sinxron saqlash
+
+def touches(update_fields, *names):
+    """Saqlashda indeksdagi maydonlardan biri yozildimi"""
+    return update_fields is None or any(name in update_fields for name in names)
+
+
+def index_customer(sender, instance, update_fields=None, **kwargs):
+    if not touches(update_fields, 'name', 'phone'):
+        return
+    search.index('customer', [instance.pk])
+    # Ism yoki telefon ijaralar indeksida ham bor
+    search.index('rental', Rental.objects.filter(customer_id=instance.pk).values_list('id', flat=True))
+
+
+def index_rental(sender, instance, update_fields=None, **kwargs):
+    if touches(update_fields, 'customer', 'customer_id'):
+        search.index('rental', [instance.pk])
+
+
+def index_rental_item(sender, instance, update_fields=None, **kwargs):
+    if touches(update_fields, 'tool', 'tool_id', 'rental', 'rental_id'):
+        search.index('rental', [instance.rental_id])
+
+
+def index_tool(sender, instance, **kwargs):
+    old_name = search.indexed_name('tool', instance.pk)
+    search.index('tool', [instance.pk])
+    # Ijaralarni faqat nom o'zgarganda qayta indekslash - zaxira o'zgarishida emas
+    if old_name is not None and old_name != instance.name:
+        rental_ids = RentalItem.objects.filter(tool_id=instance.pk).values_list('rental_id', flat=True).distinct()
+        search.index('rental', rental_ids)
+
+
+def index_category(sender, instance, **kwargs):
+    search.index('tool', Tool.objects.filter(category_id=instance.pk).values_list('id', flat=True))
+
+
+def unindex(kind):
+    def handler(sender, instance, **kwargs):
+        search.index(kind, [instance.pk])
+    return handler
+
+
+post_save.connect(index_customer, sender=Customer, dispatch_uid='search_save_customer')
+post_save.connect(index_rental, sender=Rental, dispatch_uid='search_save_rental')
+post_save.connect(index_rental_item, sender=RentalItem, dispatch_uid='search_save_rentalitem')
+post_delete.connect(index_rental_item, sender=RentalItem, dispatch_uid='search_delete_rentalitem')
+post_save.connect(index_tool, sender=Tool, dispatch_uid='search_save_tool')
+post_save.connect(index_category, sender=ToolCategory, dispatch_uid='search_save_category')
+post_delete.connect(unindex('customer'), sender=Customer, weak=False, dispatch_uid='search_delete_customer')
+post_delete.connect(unindex('rental'), sender=Rental, weak=False, dispatch_uid='search_delete_rental')
+post_delete.connect(unindex('tool'), sender=Tool, weak=False, dispatch_uid='search_delete_tool')
+
+
+# Ijara sahifasida mijoz va asbob nomi ham bor - ular o'zgarsa ijaralarning
+# updated_at qiymati (ijara versiyasi) yangilanadi
+
+def touch_customer_rentals(sender, instance, update_fields=None, created=False, **kwargs):
+    if not created and touches(update_fields, 'name', 'phone', 'address'):
+        Rental.objects.filter(customer_id=instance.pk).update(updated_at=timezone.now())
+
+
+def touch_tool_rentals(sender, instance, created=False, **kwargs):
+    if not created and instance.has_changed('name'):
+        rental_ids = RentalItem.objects.filter(tool_id=instance.pk).values('rental_id')
+        Rental.objects.filter(pk__in=rental_ids).update(updated_at=timezone.now())
+
+
+post_save.connect(touch_customer_rentals, sender=Customer, dispatch_uid='touch_save_customer')
+post_save.connect(touch_tool_rentals, sender=Tool, dispatch_uid='touch_save_tool')
+
+
+# Kunlik daromad jamlanmalari - o'zgargan kunlar commit'dan keyin qayta yig'iladi
+
+def as_day(value):
+    return Rental._meta.get_field('start_date').to_python(value)
+
+
+def rollup_rental(sender, instance, update_fields=None, created=False, **kwargs):
+    # Yangi ijarada hali qatorlar yo'q
+    if not created and touches(update_fields, 'start_date', 'billed_days', 'status', 'customer', 'customer_id'):
+        rollups.mark_dirty({as_day(instance.start_date), as_day(instance.loaded_value('start_date'))})
+
+
+def rollup_rental_item(sender, instance, update_fields=None, **kwargs):
+    if touches(update_fields, 'quantity', 'daily_rate', 'tool', 'tool_id', 'rental', 'rental_id'):
+        rental_ids = {instance.rental_id, instance.loaded_value('rental', instance.rental_id)}
+        rollups.mark_dirty(rollups.rental_days(rental_ids))
+
+
+def rollup_tool(sender, instance, update_fields=None, created=False, **kwargs):
+    # Kategoriya o'zgarsa asbob ijaraga berilgan barcha kunlar qayta yig'iladi
+    if not created and touches(update_fields, 'category', 'category_id'):
+        rollups.mark_dirty(
+            RentalItem.objects.filter(tool_id=instance.pk).values_list('rental__start_date', flat=True).distinct()
+        )
+
+
+def rollup_data_changed(sender, ids=(), **kwargs):
+    if sender is Rental:
+        rollups.mark_dirty(rollups.rental_days(ids))
+
+
+post_save.connect(rollup_rental, sender=Rental, dispatch_uid='rollup_save_rental')
+post_delete.connect(rollup_rental, sender=Rental, dispatch_uid='rollup_delete_rental')
+post_save.connect(rollup_rental_item, sender=RentalItem, dispatch_uid='rollup_save_rentalitem')
+post_delete.connect(rollup_rental_item, sender=RentalItem, dispatch_uid='rollup_delete_rentalitem')
+post_save.connect(rollup_tool, sender=Tool, dispatch_uid='rollup_save_tool')
+data_changed.connect(rollup_data_changed, dispatch_uid='rollup_data_changed')
+
+
+# Jonli o'zgarishlar (SSE) - commit'dan keyin ulangan mijozlarga yuboriladi
+
+def live_tool(sender, instance, **kwargs):
+    live.changed([instance.pk])
+
+
+def live_rental_item(sender, instance, **kwargs):
+    live.changed({instance.tool_id, instance.loaded_value('tool', instance.tool_id)})
+
+
+def live_rental(sender, **kwargs):
+    live.changed()
+
+
+def live_data_changed(sender, ids=(), **kwargs):
+    if sender is Tool:
+        live.changed(ids)
+    elif sender in (Rental, RentalItem):
+        live.changed()
+
+
+post_save.connect(live_tool, sender=Tool, dispatch_uid='live_save_tool')
+post_delete.connect(live_tool, sender=Tool, dispatch_uid='live_delete_tool')
+post_save.connect(live_rental_item, sender=RentalItem, dispatch_uid='live_save_rentalitem')
+post_delete.connect(live_rental_item, sender=RentalItem, dispatch_uid='live_delete_rentalitem')
+post_save.connect(live_rental, sender=Rental, dispatch_uid='live_save_rental')
+post_delete.connect(live_rental, sender=Rental, dispatch_uid='live_delete_rental')
+data_changed.connect(live_data_changed, dispatch_uid='live_data_changed')
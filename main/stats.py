@@ -0,0 +1,128 @@
+"""Dashboard va ombor statistikasi
+
+Har bir ko'rsatkichning so'rovi bitta joyda quriladi, sinxron (get_*) va
+async (aget_*) variantlar faqat uni qanday bajarishi bilan farq qiladi.
+Async variantlar bir-biriga bog'liq bo'lmagan so'rovlarni asyncio.gather
+bilan birga yuboradi.
+"""
+import asyncio
+import heapq
+from datetime import timedelta
+
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Rental, RentalItem, Tool
+
+TOOL_TOTALS = {
+    'total_tools': Count('id'),
+    'available_tools': Coalesce(Sum('quantity_available'), 0),
+    'total_quantity': Coalesce(Sum('quantity_total'), 0),
+}
+
+
+def rental_totals():
+    """Faol ijaralar so'rovi va uning jamlanmalari"""
+    # Faqat faol ijaralar o'qiladi (status, created_at indeksi). Bugungi kun -
+    # created_at__date emas, oraliq: funksiyasiz taqqoslash indeksdan foydalanadi
+    today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    return Rental.objects.filter(status='active'), {
+        'active_rentals': Count('id'),
+        'today_income': Sum('total_amount', filter=Q(created_at__gte=today, created_at__lt=today + timedelta(days=1))),
+    }
+
+
+def inventory_totals(tools, rentals):
+    return {
+        'total_tools': tools['total_tools'],
+        'available_tools': tools['available_tools'],
+        'total_quantity': tools['total_quantity'],
+        'rented_tools': tools['total_quantity'] - tools['available_tools'],
+        'active_rentals': rentals['active_rentals'],
+        'today_income': rentals['today_income'] or 0,
+    }
+
+
+def get_inventory_totals():
+    """Asosiy raqamlar - asboblar soni yoki hajmidan qat'i nazar 2 ta so'rov"""
+    rentals, aggregates = rental_totals()
+    return inventory_totals(Tool.objects.aggregate(**TOOL_TOTALS), rentals.aggregate(**aggregates))
+
+
+async def aget_inventory_totals():
+    rentals, aggregates = rental_totals()
+    tools, rentals = await asyncio.gather(
+        Tool.objects.aaggregate(**TOOL_TOTALS),
+        rentals.aaggregate(**aggregates),
+    )
+    return inventory_totals(tools, rentals)
+
+
+def tools_stats_queryset():
+    """Har bir asbob bo'yicha balans - bitta guruhlangan so'rov"""
+    return Tool.objects.annotate(
+        rented_count=Coalesce(
+            Sum('rentalitem__quantity', filter=Q(rentalitem__rental__status='active')),
+            0,
+        ),
+        rental_count=Count('rentalitem'),
+    ).order_by('id').values(
+        'id', 'name', 'quantity_total', 'quantity_available', 'rented_count', 'rental_count',
+    )
+
+
+def get_tools_stats():
+    return list(tools_stats_queryset())
+
+
+async def aget_tools_stats():
+    return [row async for row in tools_stats_queryset()]
+
+
+def recent_rentals_queryset(limit=5):
+    """Oxirgi ijaralar mijozi va asboblar soni bilan birga"""
+    # Qatorlar soni bog'liq so'rov bilan: GROUP BY bo'lsa butun jadval
+    # guruhlanib saralanardi, bunda created_at indeksidan oxirgi 5 tasi olinadi
+    items = (
+        RentalItem.objects.filter(rental=OuterRef('pk'))
+        .order_by().values('rental').annotate(count=Count('id')).values('count')
+    )
+    return (
+        Rental.objects.select_related('customer')
+        .annotate(item_count=Coalesce(Subquery(items), 0))
+        .order_by('-created_at')[:limit]
+    )
+
+
+def get_recent_rentals(limit=5):
+    return list(recent_rentals_queryset(limit))
+
+
+async def aget_recent_rentals(limit=5):
+    return [rental async for rental in recent_rentals_queryset(limit)]
+
+
+def dashboard_stats(stats, tools_stats, recent_rentals):
+    stats.update({
+        'tools_stats': tools_stats,
+        # Mashhur asboblar - alohida so'rovsiz, tayyor ro'yxatdan
+        'popular_tools': heapq.nlargest(4, tools_stats, key=lambda tool: tool['rental_count']),
+        'recent_rentals': recent_rentals,
+        'total_tools_stats': {
+            'total_total': stats['total_quantity'],
+        },
+    })
+    return stats
+
+
+def build_dashboard_stats():
+    """Dashboard uchun barcha ma'lumot - so'rovlar soni o'zgarmas (4 ta)"""
+    return dashboard_stats(get_inventory_totals(), get_tools_stats(), get_recent_rentals())
+
+
+async def abuild_dashboard_stats():
+    """build_dashboard_stats - to'rttala so'rov birga yuboriladi"""
+    return dashboard_stats(*await asyncio.gather(
+        aget_inventory_totals(), aget_tools_stats(), aget_recent_rentals(),
+    ))
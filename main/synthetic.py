@@ -0,0 +1,174 @@
+"""Sintetik ma'lumotlar va o'lchov ssenariylari - bench va explain_queries uchun
+
+Hammasi alohida test bazasida bajariladi (``test_database``): asosiy
+baza va jonli keshga tegilmaydi. Ma'lumotlar bulk_create bilan
+partiyalab yoziladi, keyin qidiruv indeksi va jamlanmalar qayta quriladi.
+"""
+import datetime
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_databases, setup_test_environment,
+    teardown_databases, teardown_test_environment,
+)
+from django.utils import timezone
+
+from . import rollups, search
+from .models import Customer, Rental, RentalItem, Tool, ToolCategory
+from .pricing import CENT, rental_days
+
+TOOL_NAMES = ('Drel', 'Perforator', 'Bolgarka', 'Shurupovert', 'Generator', 'Kompressor', 'Narvon', 'Betonqorgich')
+FIRST_NAMES = ('Ali', 'Vali', 'Aziz', 'Dilshod', 'Jasur', 'Malika', 'Nodira', 'Sardor', 'Bekzod', 'Laylo')
+LAST_NAMES = ('Karimov', 'Valiyev', 'Rahimov', 'Yusupov', 'Toshmatov', 'Qodirov', 'Saidov', 'Ergashev')
+
+# Holatlar va ularning ulushi
+STATUSES = (('completed', 80), ('active', 15), ('cancelled', 5))
+
+CACHE_BACKENDS = {
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+@contextmanager
+def test_database(cache='dummy'):
+    """Vaqtinchalik test bazasi va alohida kesh"""
+    setup_test_environment()
+    try:
+        with override_settings(CACHES={'default': {'BACKEND': CACHE_BACKENDS[cache], 'LOCATION': 'synthetic'}}):
+            old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+            try:
+                yield
+            finally:
+                teardown_databases(old_config, verbosity=0)
+    finally:
+        teardown_test_environment()
+
+
+@contextmanager
+def capture_queries():
+    """Asosiy va faqat o'qish uchun ulanishdagi so'rovlar - (alias, sql) ro'yxati"""
+    aliases = ['default']
+    read_only = getattr(settings, 'READ_ONLY_DATABASE', None)
+    if read_only in connections and connections[read_only] is not connections['default']:
+        aliases.append(read_only)
+    queries = []
+    contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in aliases}
+    for context in contexts.values():
+        context.__enter__()
+    try:
+        yield queries
+    finally:
+        for alias, context in contexts.items():
+            context.__exit__(None, None, None)
+            queries.extend((alias, query['sql']) for query in context.captured_queries)
+
+
+def seed(rng, batch_size, tools, customers, rentals):
+    """Asboblar, mijozlar va qatorlari bilan ijaralar - bulk_create partiyalari"""
+    categories = ToolCategory.objects.bulk_create(
+        [ToolCategory(name=f"Kategoriya {i}") for i in range(20)]
+    )
+    tool_rows = Tool.objects.bulk_create(
+        [
+            Tool(
+                name=f"{rng.choice(TOOL_NAMES)} {i}",
+                category=rng.choice(categories),
+                daily_price=Decimal(rng.randrange(5, 200) * 1000),
+                quantity_total=(quantity := rng.randrange(5, 60)),
+                quantity_available=quantity,
+            )
+            for i in range(tools)
+        ],
+        batch_size=batch_size,
+    )
+    prices = {tool.pk: tool.daily_price for tool in tool_rows}
+    tool_ids = list(prices)
+
+    customer_ids = [
+        customer.pk for customer in Customer.objects.bulk_create(
+            [
+                Customer(
+                    name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    phone=f"+99890{i:07d}",
+                    address="Toshkent",
+                )
+                for i in range(customers)
+            ],
+            batch_size=batch_size,
+        )
+    ]
+
+    today = timezone.now().date()
+    statuses, weights = zip(*STATUSES)
+    for offset in range(0, rentals, batch_size):
+        plans = []
+        for _ in range(min(batch_size, rentals - offset)):
+            start = today - datetime.timedelta(days=rng.randrange(365))
+            status = rng.choices(statuses, weights)[0]
+            end = None
+            if status != 'active':
+                end = min(start + datetime.timedelta(days=rng.randrange(14)), today)
+            lines = [(rng.choice(tool_ids), rng.randrange(1, 4)) for _ in range(rng.randrange(1, 4))]
+            daily_total = sum((prices[tool_id] * quantity for tool_id, quantity in lines), Decimal(0)).quantize(CENT)
+            days = rental_days(start, end, today=today)
+            plans.append((
+                Rental(
+                    customer_id=rng.choice(customer_ids),
+                    start_date=start,
+                    end_date=end,
+                    status=status,
+                    daily_total=daily_total,
+                    billed_days=days,
+                    total_amount=daily_total * days,
+                ),
+                lines,
+            ))
+        created = Rental.objects.bulk_create([rental for rental, _ in plans])
+        RentalItem.objects.bulk_create([
+            RentalItem(rental_id=rental.pk, tool_id=tool_id, quantity=quantity, daily_rate=prices[tool_id])
+            for rental, (_, lines) in zip(created, plans)
+            for tool_id, quantity in lines
+        ])
+
+    # Faol ijaradagi asboblar ombordan ayriladi
+    rented = (
+        RentalItem.objects.filter(tool=OuterRef('pk'), rental__status='active')
+        .values('tool').annotate(total=Sum('quantity')).values('total')
+    )
+    Tool.objects.update(
+        quantity_available=F('quantity_total') - Coalesce(Subquery(rented, output_field=IntegerField()), 0),
+    )
+
+    if search.is_enabled():
+        with connection.cursor() as cursor:
+            search.rebuild(cursor)
+    rollups.rebuild()
+
+
+def scenarios():
+    """(nom, metod, url, POST ma'lumoti) - seed'dan keyin chaqiriladi"""
+    rental = Rental.objects.filter(status='active').order_by('-pk').first()
+    tool = Tool.objects.filter(quantity_available__gt=100).first() or Tool.objects.order_by('-quantity_available').first()
+    return [
+        ('dashboard', 'get', '/', None),
+        ('api_stats', 'get', '/api/stats/', None),
+        ('rental_list', 'get', '/rentals/', None),
+        ('rental_list_search', 'get', '/rentals/?q=Ali', None),
+        ('rental_list_active', 'get', '/rentals/?status=active', None),
+        ('rental_detail', 'get', f'/rentals/{rental.pk}/', None),
+        ('rental_invoice', 'get', f'/rentals/{rental.pk}/invoice/', None),
+        ('customer_list', 'get', '/customers/', None),
+        ('customer_list_revenue', 'get', '/customers/?sort=-revenue', None),
+        ('tool_list', 'get', '/tools/', None),
+        ('tool_list_in_stock', 'get', '/tools/?in_stock=1', None),
+        ('add_rental_items', 'get', f'/rentals/{rental.pk}/items/', None),
+        ('add_rental_items_post', 'post', f'/rentals/{rental.pk}/items/',
+         {'add_item': '1', 'tool': str(tool.pk), 'quantity': '1'}),
+        ('revenue_report', 'get', '/reports/revenue/', None),
+    ]
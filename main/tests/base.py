@@ -0,0 +1,41 @@
+import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import Customer, Rental, Tool, ToolCategory
+
+# Testlar jonli fayl keshiga tegmasin; manifest esa collectstatic'siz yo'q
+TEST_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    'STORAGES': {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+}
+
+
+@override_settings(**TEST_SETTINGS)
+class BaseTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        # TestCase commit qilmaydi - on_commit'lar qo'lda bajariladi
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category = ToolCategory.objects.create(name="Qurilish")
+            self.customer = Customer.objects.create(name="Ali Valiyev", phone="+998901234567", address="Toshkent")
+
+    def make_tool(self, quantity=10, price='100.00', name="Perforator", category=None):
+        return Tool.objects.create(
+            name=name, category=category or self.category, daily_price=Decimal(price), quantity_total=quantity,
+        )
+
+    def make_rental(self, days=3, status='active', start_date=None, customer=None):
+        start_date = start_date or timezone.now().date()
+        return Rental.objects.create(
+            customer=customer or self.customer,
+            start_date=start_date,
+            end_date=start_date + datetime.timedelta(days=days - 1),
+            status=status,
+        )
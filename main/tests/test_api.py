@@ -0,0 +1,77 @@
+import datetime
+import json
+
+from django.test import Client
+from django.utils import timezone
+
+from ..models import Rental, Tool
+from .base import BaseTestCase
+
+
+class CreateRentalApiTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.drill = self.make_tool(quantity=3)
+        self.saw = self.make_tool(quantity=1, price='40.00', name="Arra")
+
+    def post(self, payload, client=None, **headers):
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        return (client or self.client).post('/api/rentals/', body, content_type='application/json', headers=headers)
+
+    def payload(self, **extra):
+        return {
+            'customer': self.customer.pk,
+            'items': [{'tool': self.drill.pk, 'quantity': 2}, {'tool': self.saw.pk, 'quantity': 1}],
+            **extra,
+        }
+
+    def test_created_rental_body(self):
+        response = self.post(self.payload())
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual(body['status'], 'active')
+        self.assertEqual(body['customer']['id'], self.customer.pk)
+        self.assertEqual(body['daily_total'], '240.00')
+        self.assertEqual([(item['tool_id'], item['quantity']) for item in body['items']], [
+            (self.drill.pk, 2), (self.saw.pk, 1),
+        ])
+        self.assertEqual(Tool.objects.get(pk=self.drill.pk).quantity_available, 1)
+
+    def test_future_rental_is_reserved(self):
+        start = timezone.now().date() + datetime.timedelta(days=3)
+        response = self.post(self.payload(start_date=start.isoformat(), end_date=(start + datetime.timedelta(days=1)).isoformat()))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['status'], response.json()['total_amount']), ('reserved', '480.00'))
+        self.assertEqual(Tool.objects.get(pk=self.drill.pk).quantity_available, 3)
+
+    def test_validation_errors(self):
+        response = self.post('[1, 2]')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+        response = self.post({'customer': 999, 'items': [{'tool': self.drill.pk, 'quantity': 0}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()['errors']), {'customer', 'items'})
+
+        response = self.post(self.payload(items=[{'tool': 999}]))
+        self.assertIn("Asbob topilmadi yoki faol emas: 999", response.json()['errors']['items'][0]['message'])
+        self.assertFalse(Rental.objects.exists())
+
+    def test_out_of_stock_conflict(self):
+        response = self.post(self.payload(items=[{'tool': self.saw.pk, 'quantity': 2}, {'tool': self.drill.pk, 'quantity': 1}]))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['shortages'], [{'tool': self.saw.pk, 'available': 1}])
+        # Hech narsa band qilinmadi
+        self.assertEqual(Tool.objects.get(pk=self.drill.pk).quantity_available, 3)
+        self.assertFalse(Rental.objects.exists())
+
+    def test_get_not_allowed(self):
+        self.assertEqual(self.client.get('/api/rentals/').status_code, 405)
+
+    def test_session_csrf_token_required(self):
+        client = Client(enforce_csrf_checks=True)
+        self.assertEqual(self.post(self.payload(), client).status_code, 403)
+
+        client.get('/rentals/create/')
+        token = client.cookies['csrftoken'].value
+        self.assertEqual(self.post(self.payload(), client, X_CSRFToken=token).status_code, 201)
@@ -0,0 +1,92 @@
+import gzip
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from ..assets import IMMUTABLE, SHORT_CACHE, StaticFilesMiddleware
+
+SOURCE = Path(__file__).resolve().parent.parent / 'static'
+
+
+class StaticFilesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.root)
+        # Faqat shu ilova fayllari - admin statikasi kerak emas
+        cls.enterClassContext(override_settings(
+            DEBUG=False,
+            STATIC_ROOT=cls.root,
+            STATICFILES_DIRS=[SOURCE],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'main.assets.CompressedManifestStaticFilesStorage'},
+            },
+        ))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse('ilova'))
+
+    def get(self, path, **headers):
+        return self.middleware(self.factory.get(path, headers=headers))
+
+    def test_collectstatic_writes_compressed_copies(self):
+        hashed = staticfiles_storage.stored_name('main/css/base.css')
+        self.assertNotEqual(hashed, 'main/css/base.css')
+        for name in (hashed, 'main/css/base.css'):
+            compressed = Path(self.root, name + '.gz').read_bytes()
+            self.assertEqual(gzip.decompress(compressed), Path(self.root, name).read_bytes())
+
+    def test_hashed_file_is_immutable_and_compressed(self):
+        name = staticfiles_storage.stored_name('main/js/base.js')
+        response = self.get(f'/static/{name}', accept_encoding='gzip, deflate')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(response.content), Path(self.root, name).read_bytes())
+
+        plain = self.get(f'/static/{name}')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(plain.content, Path(self.root, name).read_bytes())
+        self.assertTrue(plain['Content-Type'].endswith('javascript'))
+
+    def test_unhashed_name_gets_short_cache(self):
+        response = self.get('/static/main/css/base.css')
+        self.assertEqual(response['Cache-Control'], SHORT_CACHE)
+
+    def test_missing_and_outside_files_are_404(self):
+        for path in ('/static/main/css/yoq.css', '/static/../settings.py', '/static/main/../../manage.py'):
+            with self.subTest(path=path), self.assertRaises(Http404):
+                self.get(path)
+        # Topilmagan fayllar xotirada saqlanmaydi
+        self.assertNotIn(('main/css/yoq.css', ''), self.middleware.files)
+
+    def test_other_requests_pass_through(self):
+        self.assertEqual(self.get('/tools/').content, b'ilova')
+        self.assertEqual(self.middleware(self.factory.post('/static/main/css/base.css')).content, b'ilova')
+
+    async def test_async_requests(self):
+        async def get_response(request):
+            return HttpResponse('ilova')
+
+        middleware = StaticFilesMiddleware(get_response)
+        request = self.factory.get('/static/main/css/base.css')
+        first = await middleware(request)
+        # Ikkinchi marta xotiradan - oqimga o'tmasdan
+        second = await middleware(request)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual((await middleware(self.factory.get('/'))).content, b'ilova')
+
+    def test_disabled_in_debug(self):
+        with override_settings(DEBUG=True), self.assertRaises(MiddlewareNotUsed):
+            StaticFilesMiddleware(lambda request: None)
@@ -0,0 +1,110 @@
+import datetime
+import random
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from .. import availability, inventory
+from ..availability import ToolAvailability
+from ..models import Rental
+from .base import BaseTestCase
+
+
+class ToolAvailabilityTests(SimpleTestCase):
+    """Sparse table natijasi kunma-kun sanash bilan bir xil"""
+
+    def brute_force(self, capacity, bookings, start, end, horizon):
+        last = end or horizon
+        busiest = 0
+        day = start
+        while day <= last:
+            booked = sum(
+                quantity for first, stop, quantity in bookings
+                if first <= day and (stop is None or day <= stop)
+            )
+            busiest = max(busiest, booked)
+            day += datetime.timedelta(days=1)
+        return max(capacity - busiest, 0)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        base = datetime.date(2026, 1, 1)
+        horizon = base + datetime.timedelta(days=70)
+        for _ in range(50):
+            bookings = []
+            for _ in range(rng.randint(0, 8)):
+                first = base + datetime.timedelta(days=rng.randint(0, 40))
+                stop = None if rng.random() < 0.2 else first + datetime.timedelta(days=rng.randint(0, 10))
+                bookings.append((first, stop, rng.randint(1, 4)))
+            index = ToolAvailability(20, bookings)
+            for _ in range(20):
+                start = base + datetime.timedelta(days=rng.randint(-5, 55))
+                end = None if rng.random() < 0.1 else start + datetime.timedelta(days=rng.randint(0, 10))
+                self.assertEqual(
+                    index.free(start, end),
+                    self.brute_force(20, bookings, start, end, horizon),
+                    (bookings, start, end),
+                )
+
+    def test_empty_and_inverted_ranges(self):
+        day = datetime.date(2026, 3, 1)
+        self.assertEqual(ToolAvailability(4, []).free(day, day), 4)
+        index = ToolAvailability(4, [(day, day, 3)])
+        self.assertEqual(index.free(day, day - datetime.timedelta(days=1)), 4)
+        self.assertEqual(index.free(day - datetime.timedelta(days=3), day), 1)
+
+
+class BookingTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tool = self.make_tool(quantity=2)
+        self.today = timezone.now().date()
+
+    def day(self, offset):
+        return self.today + datetime.timedelta(days=offset)
+
+    def book(self, start, end, quantity=2):
+        return inventory.create_rental(
+            self.customer, self.day(start), self.day(end), {self.tool.pk: quantity}, {self.tool.pk: self.tool},
+        )
+
+    def test_overlapping_reservation_is_rejected(self):
+        reserved = self.book(5, 8)
+        self.assertEqual(reserved.status, 'reserved')
+        with self.assertRaises(inventory.OutOfStock) as raised:
+            self.book(8, 10, quantity=1)
+        self.assertEqual(raised.exception.shortages, {self.tool.pk: 0})
+        # Bo'sh kunlar band qilinadi
+        self.assertEqual(self.book(9, 10).status, 'reserved')
+        self.assertEqual(Rental.objects.count(), 2)
+
+    def test_active_rental_blocks_future_booking(self):
+        self.assertEqual(self.book(0, 6, quantity=1).status, 'active')
+        self.assertFalse(availability.shortages(self.day(3), self.day(4), {self.tool.pk: 1}))
+        self.assertEqual(
+            availability.shortages(self.day(3), self.day(4), {self.tool.pk: 2}), {self.tool.pk: 1},
+        )
+
+    def edit(self, rental, start, end):
+        return self.client.post(f'/rentals/{rental.pk}/edit/', {
+            'customer': self.customer.pk, 'start_date': self.day(start), 'end_date': self.day(end),
+        })
+
+    def test_edit_reservation_checks_new_dates(self):
+        first, second = self.book(5, 8), self.book(10, 12)
+        response = self.edit(second, 7, 12)
+        self.assertContains(response, "Bu sanalarda asboblar yetarli emas.")
+        self.assertEqual(self.edit(second, 9, 12).status_code, 302)
+        second.refresh_from_db()
+        self.assertEqual(second.start_date, self.day(9))
+        first.refresh_from_db()
+        self.assertEqual(first.start_date, self.day(5))
+
+    def test_active_rental_cannot_move_to_future(self):
+        rental = self.book(-2, 3, quantity=1)
+        response = self.edit(rental, 2, 5)
+        self.assertContains(response, "Boshlangan ijarani kelajakdagi sanaga ko&#x27;chirib bo&#x27;lmaydi.")
+        rental.refresh_from_db()
+        self.assertEqual((rental.status, rental.start_date), ('active', self.day(-2)))
+        # O'tgan sanaga ko'chirish mumkin
+        self.assertEqual(self.edit(rental, -3, 3).status_code, 302)
@@ -0,0 +1,37 @@
+from django.db import transaction
+
+from ..cache import bump_version, get_or_build, get_version
+from ..stats import get_inventory_totals
+from .base import BaseTestCase
+
+
+class StatsVersionTests(BaseTestCase):
+    def test_version_bumped_once_after_commit(self):
+        version = get_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            bump_version()
+            bump_version()
+            # Commit'gacha eski versiya - eski ma'lumot yangi kalit bilan keshlanmaydi
+            self.assertEqual(get_version(), version)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(get_version(), version + 1)
+
+    def test_rolled_back_savepoint_reschedules(self):
+        version = get_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    bump_version()
+                    raise ValueError
+            except ValueError:
+                pass
+            # Savepoint bilan birga callback ham o'chdi - qayta qo'shilishi kerak
+            bump_version()
+        self.assertEqual(get_version(), version + 1)
+
+    def test_write_invalidates_cached_totals(self):
+        self.assertEqual(get_or_build('totals', get_inventory_totals)['total_tools'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_tool(quantity=3)
+        totals = get_or_build('totals', get_inventory_totals)
+        self.assertEqual((totals['total_tools'], totals['total_quantity']), (1, 3))
@@ -0,0 +1,66 @@
+import itertools
+
+from .. import catalog, inventory
+from ..models import Tool, ToolCategory
+from .base import BaseTestCase
+
+
+class FacetTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            garden = ToolCategory.objects.create(name="Bog'")
+            self.categories = [self.category, garden]
+            for index in range(9):
+                tool = self.make_tool(quantity=1 + index % 2, name=f"Asbob {index}", category=self.categories[index % 2])
+                if index % 3 == 0:
+                    Tool.objects.filter(pk=tool.pk).update(is_active=False)
+                if index % 4 == 0:
+                    inventory.reserve(tool.pk, tool.quantity_total)
+
+    def expected(self, category, active, in_stock):
+        tools = list(Tool.objects.all())
+
+        def matches(tool, category=None, active='', in_stock=False):
+            return (
+                (not category or tool.category_id == category)
+                and (active not in ('1', '0') or tool.is_active == (active == '1'))
+                and (not in_stock or tool.quantity_available > 0)
+            )
+
+        categories = {
+            item.pk: sum(matches(tool, item.pk, active, in_stock) for tool in tools) for item in self.categories
+        }
+        # Har bir facet boshqa filtrlarni hisobga oladi, o'zinikini emas
+        scoped = [tool for tool in tools if matches(tool, category)]
+        flags = {
+            'active': sum(tool.is_active for tool in scoped),
+            'inactive': sum(not tool.is_active for tool in scoped),
+            'in_stock': sum(tool.quantity_available > 0 for tool in scoped),
+        }
+        return categories, flags
+
+    def test_facets_match_brute_force(self):
+        combos = itertools.product([None, *[item.pk for item in self.categories]], ['', '1', '0'], [False, True])
+        for category, active, in_stock in combos:
+            with self.subTest(category=category, active=active, in_stock=in_stock):
+                facets = catalog.build_facets(category, active, in_stock)
+                categories = {row['id']: row['tool_count'] for row in facets['categories']}
+                self.assertEqual((categories, facets['flags']), self.expected(category, active, in_stock))
+
+    def test_filtered_list_matches_facet_count(self):
+        facets = catalog.build_facets(active='1', in_stock=True)
+        for row in facets['categories']:
+            tools = catalog.filter_tools(Tool.objects.all(), row['id'], '1', True)
+            self.assertEqual(tools.count(), row['tool_count'])
+
+    def test_cached_facets_follow_writes(self):
+        before = catalog.get_facets()['flags']['active']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_tool(name="Yangi")
+        self.assertEqual(catalog.get_facets()['flags']['active'], before + 1)
+
+    def test_tool_list_shows_counts(self):
+        response = self.client.get('/tools/', {'category': self.category.pk, 'in_stock': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['facets'], catalog.build_facets(self.category.pk, '', True))
@@ -0,0 +1,122 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from .. import inventory
+from ..cache import get_table_versions, tables_changed
+from ..models import Customer, Rental, RentalItem, Tool
+from .base import BaseTestCase
+
+
+class TableVersionTests(BaseTestCase):
+    def test_versions_move_after_commit(self):
+        before = get_table_versions([Tool, Rental, Customer])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            tables_changed(Tool)
+            tables_changed(Tool, Rental)
+            self.assertEqual(get_table_versions([Tool, Rental, Customer]), before)
+        self.assertEqual(len(callbacks), 1)
+        tool, rental, customer = get_table_versions([Tool, Rental, Customer])
+        self.assertGreater(tool, before[0])
+        self.assertEqual(tool, rental)
+        self.assertEqual(customer, before[2])
+
+
+class ConditionalGetTests(BaseTestCase):
+    def etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertTrue(response.has_header('Last-Modified'))
+        return response['ETag']
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+
+    def test_unchanged_pages_answer_304(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tool = self.make_tool()
+            rental = self.make_rental()
+            RentalItem.objects.create(rental=rental, tool=tool, quantity=1, daily_rate=tool.daily_price)
+        for url in ('/tools/', '/customers/', f'/rentals/{rental.pk}/', '/api/stats/'):
+            with self.subTest(url=url):
+                etag = self.etag(url)
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+
+    async def test_async_view_answers_304(self):
+        response = await self.async_client.get('/api/stats/')
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get('/api/stats/', headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_unrelated_table_keeps_etag(self):
+        etag = self.etag('/tools/')
+        # Boshqa jadval o'zgarishi asboblar sahifasiga ta'sir qilmaydi
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.create(name="Vali", phone="+998711111111", address="")
+        self.assertEqual(self.revalidate('/tools/', etag), 304)
+
+    def test_missing_rental_is_404(self):
+        self.assertEqual(self.client.get('/rentals/999999/').status_code, 404)
+
+    def test_write_changes_etag_only_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tool = self.make_tool()
+        etag = self.etag('/tools/')
+        with self.captureOnCommitCallbacks() as callbacks:
+            inventory.reserve(tool.pk, 1)
+            self.assertEqual(self.revalidate('/tools/', etag), 304)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.revalidate('/tools/', etag), 200)
+
+    def test_item_change_changes_rental_etag(self):
+        tool = self.make_tool()
+        rental = self.make_rental()
+        item = RentalItem.objects.create(rental=rental, tool=tool, quantity=1, daily_rate=tool.daily_price)
+        etag = self.etag(f'/rentals/{rental.pk}/')
+
+        item.quantity = 2
+        item.save()
+        self.assertEqual(self.revalidate(f'/rentals/{rental.pk}/', etag), 200)
+
+    def test_tool_rename_changes_rental_etag(self):
+        tool = self.make_tool()
+        rental = self.make_rental()
+        RentalItem.objects.create(rental=rental, tool=tool, quantity=1, daily_rate=tool.daily_price)
+        etag = self.etag(f'/rentals/{rental.pk}/')
+
+        tool = Tool.objects.get(pk=tool.pk)
+        tool.name = "Boshqa nom"
+        tool.save()
+        self.assertEqual(self.revalidate(f'/rentals/{rental.pk}/', etag), 200)
+
+    def test_accrue_rentals_invalidates_pages(self):
+        start = timezone.now().date() - datetime.timedelta(days=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            tool = self.make_tool()
+            rental = Rental.objects.create(customer=self.customer, start_date=start, status='active')
+            RentalItem.objects.create(rental=rental, tool=tool, quantity=1, daily_rate=tool.daily_price)
+        # Kecha hisoblangan holat
+        Rental.objects.filter(pk=rental.pk).update(billed_days=5)
+        customers, detail = self.etag('/customers/'), self.etag(f'/rentals/{rental.pk}/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('accrue_rentals', stdout=StringIO())
+
+        rental.refresh_from_db()
+        self.assertEqual(rental.billed_days, 6)
+        self.assertEqual(self.revalidate('/customers/', customers), 200)
+        self.assertEqual(self.revalidate(f'/rentals/{rental.pk}/', detail), 200)
+
+    def test_pending_message_disables_304(self):
+        etag = self.etag('/tools/')
+        # Tanlanmagan ijaralar - xato xabari qo'shiladi, ma'lumot o'zgarmaydi
+        self.client.post('/rentals/complete/')
+        response = self.client.get('/tools/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "faol ijara tanlanmadi")
@@ -0,0 +1,84 @@
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+
+from asgiref.sync import sync_to_async
+from django.core.management import CommandError, call_command
+
+from .. import export
+from ..models import RentalItem
+from .base import BaseTestCase
+
+
+class ExportTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        drill, saw = self.make_tool(), self.make_tool(name="Arra", price='40.00')
+        self.rental = self.make_rental(days=2)
+        RentalItem.objects.create(rental=self.rental, tool=drill, quantity=2, daily_rate=drill.daily_price)
+        RentalItem.objects.create(rental=self.rental, tool=saw, quantity=1, daily_rate=saw.daily_price)
+        self.empty = self.make_rental(status='completed', start_date=datetime.date(2026, 1, 5))
+
+    def rows(self, lines):
+        return list(csv.DictReader(io.StringIO(''.join(lines))))
+
+    def test_csv_has_a_line_per_item(self):
+        rows = self.rows(export.stream('rentals', 'csv', chunk_size=1))
+        self.assertEqual(
+            [(row['rental_id'], row['tool_name'], row['quantity']) for row in rows],
+            [(str(self.rental.pk), "Perforator", '2'), (str(self.rental.pk), "Arra", '1'), (str(self.empty.pk), '', '')],
+        )
+        self.assertEqual(rows[0]['total_amount'], '480.00')
+        self.assertEqual(rows[0]['customer_phone'], "+998901234567")
+
+    def test_jsonl_records_and_filters(self):
+        records = [json.loads(line) for line in export.stream('rentals', 'jsonl', {'status': 'active'})]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['customer']['name'], "Ali Valiyev")
+        self.assertEqual([item['tool_name'] for item in records[0]['items']], ["Perforator", "Arra"])
+
+        filters = export.parse_filters(end='2026-01-31')
+        self.assertEqual([json.loads(line)['id'] for line in export.stream('rentals', 'jsonl', filters)], [self.empty.pk])
+
+        customers = [json.loads(line) for line in export.stream('customers', 'jsonl')]
+        self.assertEqual([customer['id'] for customer in customers], [self.customer.pk])
+
+    def test_bad_filters(self):
+        with self.assertRaises(ValueError):
+            export.parse_filters(start='31.01.2026')
+        with self.assertRaises(ValueError):
+            export.parse_filters(status='lost')
+
+    async def test_async_stream_matches_sync(self):
+        chunks = [chunk async for chunk in export.astream('rentals', 'csv', chunk_size=2)]
+        self.assertGreater(len(chunks), 1)
+        lines = await sync_to_async(lambda: ''.join(export.stream('rentals', 'csv')))()
+        self.assertEqual(''.join(chunks), lines)
+
+    def test_view_streams_attachment(self):
+        response = self.client.get('/export/rentals/', {'format': 'jsonl', 'status': 'completed'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="rentals-', response['Content-Disposition'])
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(json.loads(body)['id'], self.empty.pk)
+
+    def test_view_rejects_bad_request(self):
+        for params in ({'format': 'xml'}, {'start': 'kecha'}):
+            response = self.client.get('/export/rentals/', params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('error', response.json())
+        self.assertEqual(self.client.get('/export/tools/').status_code, 400)
+
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'customers.csv')
+            call_command('export_data', 'customers', output=path)
+            with open(path, encoding='utf-8') as output:
+                rows = list(csv.DictReader(output))
+        self.assertEqual([row['name'] for row in rows], ["Ali Valiyev"])
+        with self.assertRaises(CommandError):
+            call_command('export_data', 'rentals', chunk_size=0)
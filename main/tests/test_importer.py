@@ -0,0 +1,67 @@
+import io
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+
+from .. import importer, search
+from ..models import Customer, Tool, ToolCategory
+from .base import BaseTestCase
+
+TOOLS_CSV = """name,category,daily_price,quantity_total,is_active
+Perforator,Qurilish,"100,50",4,ha
+Arra,Qurilish,abc,2,
+Bolg'a,Qurilish,NaN,2,
+Drel,Yo'q,50,1,
+,Qurilish,50,1,
+Shlifovka,qurilish,70,-3,
+Kran,Qurilish,Infinity,1,
+Narvon,Qurilish,30,5,0
+"""
+
+
+class ImporterTests(BaseTestCase):
+    def test_error_rows_do_not_abort_batch(self):
+        result = importer.import_csv('tools', io.StringIO(TOOLS_CSV), batch_size=1)
+        self.assertEqual(result.created, 2)
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5, 6, 7, 8])
+        self.assertIn("Kategoriya topilmadi: Yo'q", dict(result.errors)[5])
+
+        tools = {tool.name: tool for tool in Tool.objects.all()}
+        self.assertEqual(sorted(tools), ["Narvon", "Perforator"])
+        self.assertEqual(str(tools["Perforator"].daily_price), '100.50')
+        self.assertEqual(tools["Perforator"].quantity_available, 4)
+        self.assertFalse(tools["Narvon"].is_active)
+        # bulk_create signalsiz - indeks qo'lda yangilanadi
+        found = search.search(Tool.objects.all(), 'tool', 'narvon').values_list('pk', flat=True)
+        self.assertEqual(list(found), [tools["Narvon"].pk])
+
+    def test_dry_run_writes_nothing(self):
+        result = importer.import_csv('tools', io.StringIO(TOOLS_CSV), create_categories=True, dry_run=True)
+        self.assertEqual(result.created, 3)
+        self.assertFalse(Tool.objects.exists())
+        self.assertEqual(ToolCategory.objects.count(), 1)
+
+    def test_create_categories(self):
+        result = importer.import_csv('tools', io.StringIO(TOOLS_CSV), create_categories=True)
+        self.assertEqual(result.created, 3)
+        self.assertTrue(ToolCategory.objects.filter(name="Yo'q").exists())
+
+    def test_missing_columns(self):
+        result = importer.import_csv('customers', io.StringIO("name,address\nAli,Toshkent\n"))
+        self.assertEqual(result.errors, [(1, "Ustunlar topilmadi: phone")])
+
+    def test_customers_and_command(self):
+        data = "name,phone,address\nVali,+998711111111,\nSardor,,Samarqand\n"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'customers.csv')
+            with open(path, 'w', encoding='utf-8') as output:
+                output.write(data)
+            out, err = io.StringIO(), io.StringIO()
+            call_command('import_inventory', path, kind='customers', stdout=out, stderr=err)
+        self.assertIn("1 ta yozuv yuklandi, 1 ta xato", out.getvalue())
+        self.assertIn("3-satr: Majburiy ustun bo'sh", err.getvalue())
+        self.assertTrue(Customer.objects.filter(name="Vali").exists())
+
+        with self.assertRaises(CommandError):
+            call_command('import_inventory', os.path.join(directory, 'yoq.csv'))
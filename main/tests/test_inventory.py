@@ -0,0 +1,126 @@
+import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .. import inventory
+from ..models import Rental, RentalItem, Tool
+from .base import BaseTestCase
+
+
+class InventoryTests(BaseTestCase):
+    def available(self, tool):
+        return Tool.objects.values_list('quantity_available', flat=True).get(pk=tool.pk)
+
+    def test_reserve_does_not_go_negative(self):
+        tool = self.make_tool(quantity=3)
+        self.assertTrue(inventory.reserve(tool.pk, 2))
+        self.assertFalse(inventory.reserve(tool.pk, 2))
+        self.assertEqual(self.available(tool), 1)
+
+    def test_release_returns_stock(self):
+        tool = self.make_tool(quantity=3)
+        inventory.reserve(tool.pk, 3)
+        inventory.release(tool.pk, 2)
+        self.assertEqual(self.available(tool), 2)
+
+    def test_reserve_many_is_all_or_nothing(self):
+        drill, saw = self.make_tool(quantity=5), self.make_tool(quantity=1, name="Arra")
+        self.assertFalse(inventory.reserve_many({drill.pk: 2, saw.pk: 3}))
+        self.assertEqual((self.available(drill), self.available(saw)), (5, 1))
+
+        self.assertTrue(inventory.reserve_many({drill.pk: 2, saw.pk: 1}))
+        self.assertEqual((self.available(drill), self.available(saw)), (3, 0))
+
+    def test_claim_succeeds_once(self):
+        rental = self.make_rental()
+        first, second = Rental.objects.get(pk=rental.pk), Rental.objects.get(pk=rental.pk)
+        self.assertTrue(inventory.claim(first, 'cancelled'))
+        self.assertFalse(inventory.claim(second, 'cancelled'))
+        self.assertEqual(first.status, 'cancelled')
+
+    def test_start_reserved_rental_out_of_stock_rolls_back(self):
+        tool = self.make_tool(quantity=1)
+        future = timezone.now().date() + datetime.timedelta(days=5)
+        rental = self.make_rental(status='reserved', start_date=future)
+        RentalItem.objects.create(rental=rental, tool=tool, quantity=1, daily_rate=tool.daily_price)
+        inventory.reserve(tool.pk, 1)
+
+        with self.assertRaises(inventory.OutOfStock):
+            inventory.start_rental(Rental.objects.get(pk=rental.pk))
+        rental.refresh_from_db()
+        self.assertEqual(rental.status, 'reserved')
+        self.assertEqual(self.available(tool), 0)
+
+    def test_start_reserved_rental_takes_stock(self):
+        tool = self.make_tool(quantity=2)
+        future = timezone.now().date() + datetime.timedelta(days=5)
+        rental = self.make_rental(status='reserved', start_date=future)
+        RentalItem.objects.create(rental=rental, tool=tool, quantity=2, daily_rate=tool.daily_price)
+
+        self.assertTrue(inventory.start_rental(Rental.objects.get(pk=rental.pk)))
+        rental.refresh_from_db()
+        self.assertEqual((rental.status, rental.start_date), ('active', timezone.now().date()))
+        self.assertEqual(self.available(tool), 0)
+        # Ikkinchi marta boshlanmaydi
+        self.assertFalse(inventory.start_rental(rental))
+
+
+class CompleteRentalsTests(BaseTestCase):
+    def rent(self, tool, quantity, days=3, status='active'):
+        start_date = timezone.now().date() - datetime.timedelta(days=days - 1)
+        rental = Rental.objects.create(customer=self.customer, start_date=start_date, status=status)
+        RentalItem.objects.create(rental=rental, tool=tool, quantity=quantity, daily_rate=tool.daily_price)
+        if status == 'active':
+            inventory.reserve(tool.pk, quantity)
+        return rental
+
+    def test_complete_many_returns_stock_and_bills_days(self):
+        drill, saw = self.make_tool(quantity=5), self.make_tool(quantity=5, price='50.00', name="Arra")
+        rentals = [self.rent(drill, 2, days=3), self.rent(saw, 1, days=1), self.rent(drill, 1, days=2)]
+        cancelled = self.rent(saw, 1, status='cancelled')
+
+        ids = [rental.pk for rental in rentals] + [cancelled.pk]
+        self.assertEqual(sorted(inventory.complete_rentals(ids)), sorted(rental.pk for rental in rentals))
+
+        stock = dict(Tool.objects.values_list('pk', 'quantity_available'))
+        self.assertEqual((stock[drill.pk], stock[saw.pk]), (5, 5))
+        totals = {
+            rental.pk: (rental.status, rental.billed_days, rental.total_amount)
+            for rental in Rental.objects.filter(pk__in=ids)
+        }
+        self.assertEqual(totals[rentals[0].pk], ('completed', 3, 600))
+        self.assertEqual(totals[rentals[1].pk], ('completed', 1, 50))
+        self.assertEqual(totals[rentals[2].pk], ('completed', 2, 200))
+        self.assertEqual(totals[cancelled.pk][0], 'cancelled')
+
+    def test_query_count_does_not_grow(self):
+        tool = self.make_tool(quantity=50)
+        few = [self.rent(tool, 1).pk for _ in range(2)]
+        many = [self.rent(tool, 1).pk for _ in range(10)]
+        with CaptureQueriesContext(connection) as small:
+            inventory.complete_rentals(few)
+        with CaptureQueriesContext(connection) as large:
+            inventory.complete_rentals(many)
+        self.assertEqual(len(large), len(small))
+
+    def test_stale_instances_complete_once(self):
+        tool = self.make_tool(quantity=5)
+        rental = self.rent(tool, 2)
+
+        # Ikki xodim bir xil (faol) ijarani ochgan
+        first, second = Rental.objects.get(pk=rental.pk), Rental.objects.get(pk=rental.pk)
+        self.assertTrue(inventory.complete_rental(first))
+        self.assertFalse(inventory.complete_rental(second))
+        self.assertEqual(Tool.objects.get(pk=tool.pk).quantity_available, 5)
+        self.assertEqual(first.status, 'completed')
+
+    def test_bulk_complete_view(self):
+        tool = self.make_tool(quantity=5)
+        rentals = [self.rent(tool, 1), self.rent(tool, 1)]
+        response = self.client.post(
+            '/rentals/complete/', {'rental_ids': [str(rental.pk) for rental in rentals]}, follow=True,
+        )
+        self.assertContains(response, "2 ta ijara yakunlandi")
+        self.assertFalse(Rental.objects.filter(status='active').exists())
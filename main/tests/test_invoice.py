@@ -0,0 +1,80 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+
+from .. import invoice
+from ..models import Customer, Rental, RentalItem, Tool
+from .base import BaseTestCase
+
+
+class InvoiceKeyTests(BaseTestCase):
+    def test_key_follows_version_and_open_end(self):
+        updated_at = timezone.now()
+        end = datetime.date(2026, 5, 1)
+        self.assertEqual(invoice.make_key(7, updated_at, end), invoice.make_key(7, updated_at, end))
+        self.assertNotEqual(
+            invoice.make_key(7, updated_at, end),
+            invoice.make_key(7, updated_at + datetime.timedelta(microseconds=1), end),
+        )
+        self.assertNotEqual(invoice.make_key(7, updated_at, end), invoice.make_key(8, updated_at, end))
+        # Yakunlanmagan ijara summasi har kuni o'sadi - kalitda bugungi sana
+        open_key = invoice.make_key(7, updated_at, None)
+        self.assertTrue(open_key.endswith(timezone.localdate().isoformat()))
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        with mock.patch.object(invoice.timezone, 'localdate', return_value=tomorrow):
+            self.assertNotEqual(invoice.make_key(7, updated_at, None), open_key)
+
+
+class InvoiceTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tool = self.make_tool(price='100.00')
+        self.rental = self.make_rental(days=3)
+        self.item = RentalItem.objects.create(rental=self.rental, tool=self.tool, quantity=2, daily_rate=Decimal('100'))
+
+    def html(self):
+        return self.client.get(f'/rentals/{self.rental.pk}/invoice/')
+
+    def test_line_totals(self):
+        rental = Rental.objects.get(pk=self.rental.pk)
+        items = list(rental.rentalitem_set.all())
+        self.assertEqual(invoice.add_line_totals(rental, items), Decimal('600'))
+        self.assertEqual((items[0].total_days, items[0].total_amount), (3, Decimal('600')))
+
+    def test_page_renders_and_missing_is_404(self):
+        response = self.html()
+        self.assertContains(response, f"Hisob-faktura №{self.rental.pk}")
+        self.assertContains(response, "Perforator")
+        self.assertContains(response, "600 so'm")
+        self.assertEqual(self.client.get('/rentals/999999/invoice/').status_code, 404)
+
+    def test_cached_html_needs_one_query(self):
+        aget_html = async_to_sync(invoice.aget_html)
+        first = aget_html(self.rental.pk)
+        # Qayta chop etishda faqat versiya o'qiladi
+        with self.assertNumQueries(1):
+            second = aget_html(self.rental.pk)
+        self.assertEqual(first, second)
+
+    def test_changes_produce_new_html(self):
+        self.assertContains(self.html(), "Perforator")
+
+        self.item.quantity = 3
+        self.item.save()
+        self.assertContains(self.html(), "900 so'm")
+
+        customer = Customer.objects.get(pk=self.customer.pk)
+        customer.name = "Sardor Karimov"
+        customer.save()
+        self.assertContains(self.html(), "Sardor Karimov")
+
+        tool = Tool.objects.get(pk=self.tool.pk)
+        tool.name = "Makita"
+        tool.save()
+        self.assertContains(self.html(), "Makita")
+
+        RentalItem.objects.get(pk=self.item.pk).delete()
+        self.assertContains(self.html(), "Asboblar mavjud emas")
@@ -0,0 +1,108 @@
+import asyncio
+from unittest import mock
+
+from .. import inventory, live
+from ..models import RentalItem
+from .base import BaseTestCase
+
+
+class ImmediateLoop:
+    """Hodisani darhol navbatga qo'yadi - testda event loop'siz"""
+
+    def call_soon_threadsafe(self, callback, *args):
+        callback(*args)
+
+
+class LiveHubTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        live.hub.stats = None
+        self.subscriber = live.Subscriber(ImmediateLoop())
+        live.hub.subscribers.add(self.subscriber)
+        self.addCleanup(live.hub.unsubscribe, self.subscriber)
+
+    def events(self):
+        events = []
+        while not self.subscriber.queue.empty():
+            events.append(self.subscriber.queue.get_nowait())
+        return events
+
+    def test_one_publish_per_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            drill = self.make_tool(quantity=4)
+            saw = self.make_tool(quantity=2, name="Arra")
+            inventory.reserve(drill.pk, 1)
+            # Commit'gacha hech narsa yuborilmaydi
+            self.assertEqual(self.events(), [])
+
+        [inventory_event, stats_event] = self.events()
+        self.assertEqual(inventory_event[0], 'inventory')
+        self.assertEqual(
+            [(tool['id'], tool['quantity_available']) for tool in inventory_event[1]['tools']],
+            [(drill.pk, 3), (saw.pk, 2)],
+        )
+        self.assertEqual(stats_event[0], 'stats')
+        self.assertEqual(stats_event[1]['rented_tools'], 1)
+
+    def test_only_changed_stats_are_sent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tool = self.make_tool(quantity=4)
+        self.events()
+        with self.captureOnCommitCallbacks(execute=True):
+            rental = self.make_rental()
+            RentalItem.objects.create(rental=rental, tool=tool, quantity=1, daily_rate=tool.daily_price)
+        events = dict(self.events())
+        self.assertEqual(set(events['stats']), {'active_rentals', 'today_income'})
+        self.assertEqual(events['inventory']['tools'][0]['id'], tool.pk)
+
+    def test_deleted_tools_are_reported(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tool = self.make_tool()
+        tool_id = tool.pk
+        self.events()
+        with self.captureOnCommitCallbacks(execute=True):
+            tool.delete()
+        events = dict(self.events())
+        self.assertEqual(events['inventory'], {'tools': [], 'deleted': [tool_id]})
+
+    def test_no_queries_without_subscribers(self):
+        live.hub.unsubscribe(self.subscriber)
+        with self.assertNumQueries(0):
+            live.publish({1, 2})
+
+
+class LiveStreamTests(BaseTestCase):
+    def tearDown(self):
+        self.assertFalse(live.hub.has_subscribers())
+        super().tearDown()
+
+    async def test_stream_sends_snapshot_then_events(self):
+        live.hub.stats = None
+        events = live.stream()
+        first = await anext(events)
+        self.assertTrue(first.startswith('retry: 5000\nevent: stats\n'))
+        self.assertIn('"total_tools": 0', first)
+
+        live.hub.publish('inventory', {'tools': [], 'deleted': [5]})
+        self.assertEqual(await anext(events), 'event: inventory\ndata: {"tools": [], "deleted": [5]}\n\n')
+        await events.aclose()
+
+    async def test_overflow_sends_reset(self):
+        events = live.stream()
+        await anext(events)
+        [subscriber] = live.hub.subscribers
+        for index in range(live.QUEUE_SIZE + 1):
+            subscriber.loop.call_soon_threadsafe(subscriber.push, ('stats', {'n': index}))
+        await asyncio.sleep(0)
+        # Tushib qolgan hodisalar yuborilmaydi - mijoz sahifani qayta yuklaydi
+        remaining = [chunk async for chunk in events]
+        self.assertEqual(remaining, ['event: stats\ndata: {"n": 0}\n\n', 'event: reset\ndata: {}\n\n'])
+
+    async def test_failed_snapshot_unsubscribes(self):
+        live.hub.stats = None
+        with mock.patch.object(live, 'aget_inventory_totals', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                await anext(live.stream())
+
+    def test_wsgi_request_gets_204(self):
+        self.assertEqual(self.client.get('/api/events/').status_code, 204)
@@ -0,0 +1,59 @@
+import re
+
+from django.test import SimpleTestCase, override_settings
+
+from ..metrics import Registry, registry
+from .base import BaseTestCase
+
+
+def sample(text, name, **labels):
+    """Metrika qiymati - yo'q bo'lsa None"""
+    label = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf'^{re.escape(name)}{{{re.escape(label)}}} (\S+)$', text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+class RegistryTests(SimpleTestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        metrics = Registry()
+        metrics.record('main:x', 200, 0.02, 3, 0.01)
+        metrics.record('main:x', 404, 2.0, 30, 0.5)
+        text = metrics.render()
+        self.assertEqual(sample(text, 'main_request_duration_seconds_bucket', view='main:x', le='0.025'), 1)
+        self.assertEqual(sample(text, 'main_request_duration_seconds_bucket', view='main:x', le='+Inf'), 2)
+        self.assertEqual(sample(text, 'main_request_queries_bucket', view='main:x', le='50'), 2)
+        self.assertEqual(sample(text, 'main_request_queries_sum', view='main:x'), 33)
+        self.assertEqual(sample(text, 'main_requests_total', view='main:x', status='404'), 1)
+        self.assertEqual(sample(text, 'main_sql_duration_seconds_total', view='main:x'), 0.51)
+
+    def test_labels_are_escaped(self):
+        metrics = Registry()
+        metrics.record('a"b\\c', 200, 0.1, 1, 0)
+        self.assertIn('view="a\\"b\\\\c"', metrics.render())
+
+
+class MetricsMiddlewareTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+
+    def test_views_are_recorded(self):
+        self.make_tool()
+        self.assertEqual(self.client.get('/tools/').status_code, 200)
+        # Async ko'rinish - so'rovlar sync_to_async oqimida bajariladi
+        self.assertEqual(self.client.get('/').status_code, 200)
+        self.client.get('/yoq-sahifa/')
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        text = response.content.decode()
+        self.assertEqual(sample(text, 'main_requests_total', view='main:tool_list', status='200'), 1)
+        self.assertGreater(sample(text, 'main_request_queries_sum', view='main:tool_list'), 0)
+        self.assertGreater(sample(text, 'main_request_queries_sum', view='main:dashboard'), 0)
+        self.assertEqual(sample(text, 'main_requests_total', view='unmatched', status='404'), 1)
+
+    @override_settings(METRICS_QUERY_THRESHOLD=0)
+    def test_slow_requests_are_logged(self):
+        with self.assertLogs('main.metrics', 'WARNING') as logs:
+            self.client.get('/tools/')
+        self.assertIn("GET /tools/ (main:tool_list)", logs.output[0])
@@ -0,0 +1,57 @@
+import datetime
+
+from django.utils import timezone
+
+from ..models import Rental
+from ..pagination import KeysetPaginator, decode_cursor, encode_cursor
+from .base import BaseTestCase
+
+
+class KeysetPaginatorTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        for _ in range(23):
+            self.make_rental()
+        # Bir xil created_at - tartibni id hal qiladi
+        moment = timezone.now() - datetime.timedelta(days=1)
+        rentals = list(Rental.objects.order_by('pk'))
+        for index, rental in enumerate(rentals):
+            created_at = moment + datetime.timedelta(minutes=index // 3)
+            Rental.objects.filter(pk=rental.pk).update(created_at=created_at)
+        self.expected = list(Rental.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+        self.paginator = KeysetPaginator(Rental.objects.all(), 5)
+
+    def ids(self, page):
+        return [rental.pk for rental in page]
+
+    def test_forward_and_backward_walk(self):
+        pages = [self.paginator.get_page()]
+        self.assertFalse(pages[0].has_previous())
+        while pages[-1].has_next():
+            pages.append(self.paginator.get_page(after=pages[-1].next_cursor))
+            self.assertTrue(pages[-1].has_previous())
+
+        walked = [pk for page in pages for pk in self.ids(page)]
+        # Takrorsiz va bo'shliqsiz
+        self.assertEqual(walked, self.expected)
+        self.assertEqual(len(pages), 5)
+
+        page = pages[-1]
+        for previous in reversed(pages[:-1]):
+            page = self.paginator.get_page(before=page.previous_cursor)
+            self.assertEqual(self.ids(page), self.ids(previous))
+            self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+
+    async def test_async_page_matches_sync(self):
+        first = await self.paginator.aget_page()
+        second = await self.paginator.aget_page(after=first.next_cursor)
+        self.assertEqual(self.ids(first) + self.ids(second), self.expected[:10])
+
+    def test_bad_cursor_starts_from_first_page(self):
+        self.assertIsNone(decode_cursor('buzilgan!'))
+        self.assertEqual(self.ids(self.paginator.get_page(after='buzilgan!')), self.expected[:5])
+
+    def test_cursor_round_trip(self):
+        created_at = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42)), (created_at, 42))
@@ -0,0 +1,80 @@
+import datetime
+from decimal import Decimal
+
+from ..cache import get_or_build
+from ..models import Rental, RentalItem
+from ..stats import get_inventory_totals
+from .base import BaseTestCase
+
+
+class PricingDeltaTests(BaseTestCase):
+    """Qator o'zgarishi ijara summasiga faqat farq sifatida qo'shiladi"""
+
+    def assertTotals(self, rental, daily_total, total_amount):
+        rental.refresh_from_db()
+        self.assertEqual(rental.daily_total, Decimal(daily_total))
+        self.assertEqual(rental.total_amount, Decimal(total_amount))
+        # Delta bilan yig'ilgan summa to'liq qayta hisoblash bilan bir xil
+        self.assertEqual(rental.calculate_total(), Decimal(total_amount))
+
+    def test_create_update_delete_items(self):
+        tool = self.make_tool()
+        rental = self.make_rental(days=3)
+
+        item = RentalItem.objects.create(rental=rental, tool=tool, quantity=2, daily_rate=Decimal('100'))
+        self.assertTotals(rental, '200', '600')
+
+        item.quantity = 3
+        item.save()
+        self.assertTotals(rental, '300', '900')
+
+        RentalItem.objects.create(rental=rental, tool=tool, quantity=1, daily_rate=Decimal('50'))
+        self.assertTotals(rental, '350', '1050')
+
+        item.delete()
+        self.assertTotals(rental, '50', '150')
+
+    def test_move_item_to_another_rental(self):
+        tool = self.make_tool()
+        first, second = self.make_rental(days=2), self.make_rental(days=1)
+        item = RentalItem.objects.create(rental=first, tool=tool, quantity=1, daily_rate=Decimal('40'))
+
+        item.rental = second
+        item.save()
+        self.assertTotals(first, '0', '0')
+        self.assertTotals(second, '40', '40')
+
+    def test_date_change_recalculates_total(self):
+        tool = self.make_tool()
+        rental = self.make_rental(days=2)
+        RentalItem.objects.create(rental=rental, tool=tool, quantity=1, daily_rate=Decimal('100'))
+
+        rental.refresh_from_db()
+        rental.end_date = rental.start_date + datetime.timedelta(days=4)
+        rental.save()
+        self.assertTotals(rental, '100', '500')
+
+    def test_date_change_on_stale_instance_keeps_new_items(self):
+        tool = self.make_tool()
+        rental = self.make_rental(days=2)
+        # Ijara formasi ochilgandan keyin boshqa xodim qator qo'shgan
+        stale = Rental.objects.get(pk=rental.pk)
+        RentalItem.objects.create(rental=rental, tool=tool, quantity=2, daily_rate=Decimal('100'))
+
+        stale.end_date = stale.start_date + datetime.timedelta(days=2)
+        stale.save()
+        self.assertEqual((stale.daily_total, stale.total_amount), (Decimal('200'), Decimal('600')))
+        self.assertTotals(rental, '200', '600')
+
+    def test_cached_totals_see_item_amount(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tool = self.make_tool()
+            self.make_rental(days=3)
+        self.assertEqual(get_or_build('totals', get_inventory_totals)['today_income'], 0)
+
+        # Kesh versiyasi qator va ijara summasi birga commit qilingach oshadi
+        with self.captureOnCommitCallbacks(execute=True):
+            RentalItem.objects.create(
+                rental=Rental.objects.get(), tool=tool, quantity=1, daily_rate=Decimal('100'),
+            )
+        self.assertEqual(get_or_build('totals', get_inventory_totals)['today_income'], Decimal('300'))
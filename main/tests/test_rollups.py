@@ -0,0 +1,125 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from .. import inventory, rollups
+from ..models import (
+    CategoryDailyRevenue, CustomerDailyRevenue, Customer, Rental, RentalItem, Tool, ToolCategory,
+    ToolDailyRevenue,
+)
+from .base import BaseTestCase
+
+
+class RollupTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.now().date()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.drill = self.make_tool(quantity=10, price='100.00')
+            self.saw = self.make_tool(quantity=10, price='40.00', name="Arra")
+            self.other = Customer.objects.create(name="Vali", phone="+998711234567", address="")
+
+    def day(self, offset):
+        return self.today + datetime.timedelta(days=offset)
+
+    def snapshot(self):
+        return {
+            model.__name__: sorted(model.objects.values_list('day', field, 'units', 'revenue'))
+            for model, field, _ in rollups.ROLLUPS
+        }
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        rollups.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+        return incremental
+
+    def rent(self, start, days, items, customer=None):
+        rental = Rental.objects.create(
+            customer=customer or self.customer, start_date=self.day(start), end_date=self.day(start + days - 1),
+        )
+        for tool, quantity in items:
+            RentalItem.objects.create(rental=rental, tool=tool, quantity=quantity, daily_rate=tool.daily_price)
+        return rental
+
+    def test_item_changes_match_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.rent(-3, 2, [(self.drill, 2), (self.saw, 1)])
+            second = self.rent(-3, 1, [(self.saw, 3)], customer=self.other)
+        snapshot = self.assertMatchesRebuild()
+        self.assertIn((self.day(-3), self.drill.pk, 2, Decimal('400.00')), snapshot['ToolDailyRevenue'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            item = first.rentalitem_set.get(tool=self.drill)
+            item.quantity = 5
+            item.save()
+            second.rentalitem_set.get().delete()
+            RentalItem.objects.create(rental=second, tool=self.drill, quantity=1, daily_rate=Decimal('90'))
+        self.assertMatchesRebuild()
+
+    def test_date_status_and_category_changes_match_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rental = self.rent(-5, 3, [(self.drill, 1)])
+            self.rent(-2, 2, [(self.saw, 2)])
+        self.assertMatchesRebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rental = Rental.objects.get(pk=rental.pk)
+            rental.start_date = self.day(-4)
+            rental.save()
+        snapshot = self.assertMatchesRebuild()
+        # Eski kun bo'shadi
+        self.assertNotIn(self.day(-5), {row[0] for row in snapshot['ToolDailyRevenue']})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.complete_rentals([rental.pk], end_date=self.day(-1))
+            garden = ToolCategory.objects.create(name="Bog'")
+            saw = Tool.objects.get(pk=self.saw.pk)
+            saw.category = garden
+            saw.save()
+        self.assertMatchesRebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.claim(Rental.objects.get(pk=rental.pk), 'cancelled', from_status='completed')
+        snapshot = self.assertMatchesRebuild()
+        self.assertEqual(len(snapshot['ToolDailyRevenue']), 1)
+
+    def test_one_refresh_per_transaction(self):
+        with mock.patch.object(rollups, 'refresh', wraps=rollups.refresh) as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.rent(-1, 1, [(self.drill, 1)])
+                self.rent(-2, 1, [(self.saw, 1)])
+                refresh.assert_not_called()
+        refresh.assert_called_once_with({self.day(-1), self.day(-2)})
+
+    def test_rebuild_range_and_command(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rent(-10, 1, [(self.drill, 1)])
+            self.rent(-1, 1, [(self.saw, 1)])
+        ToolDailyRevenue.objects.all().delete()
+        CategoryDailyRevenue.objects.all().delete()
+        CustomerDailyRevenue.objects.all().delete()
+
+        self.assertEqual(rollups.rebuild(self.day(-5), self.day(0)), 1)
+        self.assertEqual(list(ToolDailyRevenue.objects.values_list('tool_id', flat=True)), [self.saw.pk])
+
+        out = StringIO()
+        call_command('rebuild_rollups', stdout=out)
+        self.assertIn("2 kunlik jamlanma", out.getvalue())
+        self.assertEqual(ToolDailyRevenue.objects.count(), 2)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_rollups', start='2026-02-10', end='2026-02-01', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('rebuild_rollups', start='10.02.2026', stdout=StringIO())
+
+    def test_revenue_report(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rent(-3, 2, [(self.drill, 1), (self.saw, 2)])
+        report = rollups.revenue_report('tool', self.day(-30), self.day(0))
+        self.assertEqual(report['totals'], {'units': 3, 'revenue': Decimal('360.00')})
+        self.assertEqual([row['name'] for row in report['top']], ["Perforator", "Arra"])
@@ -0,0 +1,67 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+
+from .. import search
+from ..models import Customer, Rental, RentalItem, Tool
+from .base import BaseTestCase
+
+
+class SearchIndexTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tool = self.make_tool(name="Perforator Bosch")
+        self.rental = self.make_rental()
+        RentalItem.objects.create(rental=self.rental, tool=self.tool, quantity=1, daily_rate=self.tool.daily_price)
+
+    def find(self, model, kind, query):
+        return set(search.search(model.objects.all(), kind, query).values_list('pk', flat=True))
+
+    def test_prefix_search(self):
+        self.assertEqual(self.find(Rental, 'rental', 'ali val'), {self.rental.pk})
+        self.assertEqual(self.find(Rental, 'rental', 'bosch'), {self.rental.pk})
+        self.assertEqual(self.find(Tool, 'tool', 'qurilish'), {self.tool.pk})
+        self.assertEqual(self.find(Rental, 'rental', 'vali ali'), {self.rental.pk})
+        self.assertEqual(self.find(Rental, 'rental', 'makita'), set())
+
+    def test_customer_rename_reindexes_rentals(self):
+        customer = Customer.objects.get(pk=self.customer.pk)
+        customer.name = "Sardor Karimov"
+        customer.save()
+        self.assertEqual(self.find(Rental, 'rental', 'sardor'), {self.rental.pk})
+        self.assertEqual(self.find(Rental, 'rental', 'valiyev'), set())
+        self.assertEqual(self.find(Customer, 'customer', 'karimov'), {customer.pk})
+
+    def test_tool_rename_reindexes_rentals(self):
+        tool = Tool.objects.get(pk=self.tool.pk)
+        tool.name = "Makita"
+        tool.save()
+        self.assertEqual(self.find(Rental, 'rental', 'makita'), {self.rental.pk})
+        self.assertEqual(self.find(Rental, 'rental', 'bosch'), set())
+
+    def test_delete_removes_from_index(self):
+        RentalItem.objects.get().delete()
+        self.assertEqual(self.find(Rental, 'rental', 'perforator'), set())
+        Tool.objects.get(pk=self.tool.pk).delete()
+        self.assertEqual(self.find(Tool, 'tool', 'perforator'), set())
+        self.rental.delete()
+        self.assertEqual(self.find(Rental, 'rental', 'ali'), set())
+
+    def test_phone_digits_match_inside_number(self):
+        self.assertEqual(self.find(Rental, 'rental', '90123'), {self.rental.pk})
+        self.assertEqual(self.find(Customer, 'customer', '+998 90 123'), {self.customer.pk})
+        self.assertEqual(self.find(Customer, 'customer', '77777'), set())
+
+    def test_ranked_search_keeps_phone_matches(self):
+        other = Customer.objects.create(name="Jasur 90123", phone="+998711111111", address="")
+        ranked = search.search(Customer.objects.all(), 'customer', '90123', ranked=True)
+        # Token bo'yicha topilgan birinchi, faqat telefon o'rtasi bo'yicha - keyin
+        self.assertEqual([customer.pk for customer in ranked], [other.pk, self.customer.pk])
+
+    def test_rebuild_command_restores_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {search.TABLES['rental']}")
+        self.assertEqual(self.find(Rental, 'rental', 'ali'), set())
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.find(Rental, 'rental', 'ali'), {self.rental.pk})
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .. import inventory
+from ..models import Tool
+from .base import BaseTestCase
+
+
+class ChangeTrackingTests(BaseTestCase):
+    def updates(self, queries):
+        return [query['sql'] for query in queries if query['sql'].startswith('UPDATE "main_tool"')]
+
+    def test_save_writes_only_changed_columns(self):
+        tool = Tool.objects.get(pk=self.make_tool().pk)
+        tool.name = "Bolg'a"
+        with CaptureQueriesContext(connection) as queries:
+            tool.save()
+        [sql] = self.updates(queries)
+        self.assertIn('"name"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"daily_price"', sql)
+        self.assertNotIn('"quantity_available"', sql)
+
+    def test_unchanged_save_is_skipped(self):
+        tool = Tool.objects.get(pk=self.make_tool().pk)
+        with self.assertNumQueries(0):
+            tool.save()
+
+    def test_partial_save_moves_updated_at(self):
+        tool = Tool.objects.get(pk=self.make_tool().pk)
+        before = tool.updated_at
+        tool.is_active = False
+        tool.save()
+        tool.refresh_from_db()
+        self.assertGreater(tool.updated_at, before)
+        self.assertFalse(tool.has_changed('updated_at'))
+
+    def test_refresh_from_db_resets_snapshot(self):
+        created = self.make_tool(quantity=10)
+        stale = Tool.objects.get(pk=created.pk)
+        other = Tool.objects.get(pk=created.pk)
+        other.quantity_total = 12
+        other.save()
+
+        stale.refresh_from_db()
+        self.assertFalse(stale.has_changed('quantity_total'))
+        stale.is_active = False
+        stale.save()
+
+        created.refresh_from_db()
+        self.assertEqual(created.quantity_total, 12)
+        self.assertEqual(created.quantity_available, 12)
+        self.assertFalse(created.is_active)
+
+    def test_refresh_selected_fields(self):
+        tool = Tool.objects.get(pk=self.make_tool().pk)
+        Tool.objects.filter(pk=tool.pk).update(name="Yangi nom")
+        tool.refresh_from_db(fields=['name'])
+        self.assertEqual(tool.changed_fields, set())
+
+    def test_quantity_total_change_adjusts_available(self):
+        tool = self.make_tool(quantity=10)
+        inventory.reserve(tool.pk, 4)
+        tool = Tool.objects.get(pk=tool.pk)
+        tool.quantity_total = 15
+        tool.save()
+        self.assertEqual(tool.quantity_available, 11)
@@ -0,0 +1,87 @@
+class ChangeTrackingMixin:
+    """Bazadan o'qilgan qiymatlarni eslab qoladi va o'zgargan maydonlarni ko'rsatadi
+
+    Mavjud obyekt saqlanganda faqat o'zgargan ustunlar yoziladi
+    (update_fields), eski qiymatni bilish uchun qator qayta o'qilmaydi.
+    Model sinfida ``models.Model`` dan oldin turishi kerak.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # Qayta o'qilgan qiymatlar endi bazadagi qiymat - aks holda boshqa
+        # yozuvchining o'zgarishi keyingi saqlashda yana "o'zgargan" ko'rinadi
+        self._snapshot(None if fields is None else [self._attname(name) for name in fields])
+
+    def _tracked_values(self):
+        # Kechiktirilgan (defer) maydonlar kuzatilmaydi
+        return {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if not field.primary_key and field.attname in self.__dict__
+        }
+
+    def _snapshot(self, names=None):
+        values = self._tracked_values()
+        if names is None or not hasattr(self, '_loaded_values'):
+            self._loaded_values = values
+        else:
+            self._loaded_values.update({name: values[name] for name in names if name in values})
+
+    def _auto_now_fields(self):
+        return [field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)]
+
+    def _attname(self, name):
+        return self._meta.get_field(name).attname
+
+    @property
+    def is_tracked(self):
+        """Obyekt bazadan o'qilgan va asl qiymatlari ma'lum"""
+        return hasattr(self, '_loaded_values') and not self._state.adding
+
+    @property
+    def changed_fields(self):
+        """O'zgargan maydonlar (attname), asl qiymatlar noma'lum bo'lsa - None"""
+        if not self.is_tracked:
+            return None
+        loaded = self._loaded_values
+        return {
+            name for name, value in self._tracked_values().items()
+            if name not in loaded or loaded[name] != value
+        }
+
+    def has_changed(self, *names):
+        changed = self.changed_fields
+        if changed is None:
+            return True
+        return any(self._attname(name) in changed for name in names)
+
+    def loaded_value(self, name, default=None):
+        """Maydonning bazadan o'qilgan qiymati"""
+        return getattr(self, '_loaded_values', {}).get(self._attname(name), default)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not kwargs.get('force_insert') and self.is_tracked:
+            # Hech narsa o'zgarmagan bo'lsa Django saqlashni o'tkazib yuboradi
+            update_fields = kwargs['update_fields'] = self.changed_fields
+        if update_fields:
+            # auto_now (updated_at) faqat update_fields ichida bo'lsa yoziladi.
+            # Bo'sh to'plamga qo'shilmaydi - o'zgarishsiz saqlash o'tkazib yuboriladi
+            update_fields = kwargs['update_fields'] = {*update_fields, *self._auto_now_fields()}
+        super().save(*args, **kwargs)
+
+        saved = None if update_fields is None else [self._attname(name) for name in update_fields]
+        # F() kabi ifodalar bilan yozilgan maydonlarning haqiqiy qiymatini olish
+        expressions = [
+            name for name, value in self._tracked_values().items()
+            if hasattr(value, 'resolve_expression') and (saved is None or name in saved)
+        ]
+        if expressions:
+            self.refresh_from_db(fields=expressions)
+        self._snapshot(saved)
@@ -7,11 +7,17 @@ urlpatterns = [
     # Dashboard
     path('', views.dashboard, name='dashboard'),
     path('api/stats/', views.get_dashboard_stats, name='dashboard_stats'),
+    path('api/events/', views.live_events, name='live_events'),
+    path('metrics', views.metrics, name='metrics'),
+    path('api/tools/<int:tool_id>/availability/', views.tool_availability, name='tool_availability'),
+    path('api/rentals/', views.api_create_rental, name='api_create_rental'),
     
     # Ijaralar
     path('rentals/', views.rental_list, name='rental_list'),
     path('rentals/create/', views.create_rental, name='create_rental'),
+    path('rentals/complete/', views.bulk_complete_rentals, name='bulk_complete_rentals'),
     path('rentals/<int:rental_id>/', views.rental_detail, name='rental_detail'),
+    path('rentals/<int:rental_id>/invoice/', views.rental_invoice, name='rental_invoice'),
     path('rentals/<int:rental_id>/items/', views.add_rental_items, name='add_rental_items'),
     path('rentals/<int:rental_id>/complete/', views.complete_rental, name='complete_rental'),
     
@@ -22,6 +28,10 @@ urlpatterns = [
     # Mijozlar
     path('customers/', views.customer_list, name='customer_list'),
     path('customers/create/', views.create_customer, name='create_customer'),
+    
+    # Hisobotlar
+    path('reports/revenue/', views.revenue_report, name='revenue_report'),
+    path('export/<str:kind>/', views.export_data, name='export_data'),
      path('tools/<int:tool_id>/edit/', views.edit_tool, name='edit_tool'),
     path('tools/<int:tool_id>/delete/', views.delete_tool, name='delete_tool'),
     
@@ -1,71 +1,41 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Q, Sum, Count
+import json
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
+from django.db import transaction
+from django.db.models import Q, Sum, Count, DecimalField, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_POST
 from .models import *
 from .forms import *
+from . import availability, catalog, export, inventory, invoice, live, rollups, search
+from .cache import aget_or_build, get_or_build
+from .conditional import conditional
+from .db import read_only
+from .metrics import registry as metrics_registry
+from .pagination import KeysetPaginator
+from .stats import abuild_dashboard_stats, aget_inventory_totals, get_inventory_totals
 # views.py
 from django.db.models import Count, Sum
 
 
 
-def dashboard(request):
-    # Asosiy statistika
-    total_tools = Tool.objects.count()
-    available_tools = Tool.objects.aggregate(Sum('quantity_available'))['quantity_available__sum'] or 0
-    total_quantity = Tool.objects.aggregate(Sum('quantity_total'))['quantity_total__sum'] or 0
-    rented_tools = total_quantity - available_tools
-    
-    active_rentals = Rental.objects.filter(status='active').count()
-    
-    # Asboblar statistikasi - TO'G'RI HISOBLASH
-    tools_stats = []
-    total_total = 0
-    
-    for tool in Tool.objects.all():
-        # Faol ijaralardagi asbob sonini hisoblash
-        rented_count = RentalItem.objects.filter(
-            tool=tool, 
-            rental__status='active'
-        ).aggregate(total=Sum('quantity'))['total'] or 0
-        
-        tools_stats.append({
-            'name': tool.name,
-            'quantity_total': tool.quantity_total,
-            'quantity_available': tool.quantity_available,
-            'rented_count': rented_count
-        })
-        total_total += tool.quantity_total
-    
-    # Oxirgi 5 ta ijara
-    recent_rentals = Rental.objects.all().order_by('-created_at')[:5]
-    
-    # Bugungi daromad
-    today_income = Rental.objects.filter(
-        created_at__date=timezone.now().date(),
-        status='active'
-    ).aggregate(Sum('total_amount'))['total_amount__sum'] or 0
-    
-    # Mashhur asboblar
-    popular_tools = Tool.objects.annotate(
-        rental_count=Count('rentalitem')
-    ).order_by('-rental_count')[:4]
-    
-    context = {
-        'total_tools': total_tools,
-        'available_tools': available_tools,
-        'rented_tools': rented_tools,
-        'active_rentals': active_rentals,
-        'recent_rentals': recent_rentals,
-        'today_income': today_income,
-        'popular_tools': popular_tools,
-        'tools_stats': tools_stats,
-        'total_tools_stats': {
-            'total_total': total_total
-        }
-    }
-    return render(request, 'main/dashboard.html', context)
+# Shablonlar request.user va sessiyaga (xabarlar) murojaat qiladi - ular
+# bazadan dangasa o'qiladi, shuning uchun async ko'rinishlarda render
+# sinxron oqimda bajariladi. Sahifa ma'lumotlari esa oldindan async olinadi
+arender = sync_to_async(render)
+
+
+@read_only
+async def dashboard(request):
+    # Barcha statistika o'zgarmas sondagi guruhlangan so'rovlardan olinadi
+    context = await aget_or_build('dashboard', abuild_dashboard_stats)
+    return await arender(request, 'main/dashboard.html', context)
 
 
 # views.py ga yangi view qo'shamiz
@@ -76,52 +46,73 @@ def custom_logout(request):
     logout(request)
     return redirect('/login/')
 
-def rental_list(request):
-    rentals = Rental.objects.all().order_by('-created_at')
+@read_only
+async def rental_list(request):
+    # Mijoz ma'lumoti shu so'rovning o'zida olinadi
+    rentals = Rental.objects.select_related('customer')
     
     # Qidiruv
     query = request.GET.get('q', '')
     status_filter = request.GET.get('status', '')
     
     if query:
-        rentals = rentals.filter(
-            Q(customer__name__icontains=query) |
-            Q(customer__phone__icontains=query) |
-            Q(rentalitem__tool__name__icontains=query)
-        ).distinct()
+        # FTS5 indeksi bo'yicha prefiks qidiruv - jadvallarni to'liq ko'rib chiqmasdan.
+        # Mosligi bo'yicha tartiblanmaydi: kursorli sahifalash uchun natijalar
+        # ham yangilari birinchi (created_at, id) tartibida qoladi
+        rentals = search.search(rentals, 'rental', query)
     
     if status_filter:
         rentals = rentals.filter(status=status_filter)
     
-    # Kunlar sonini hisoblash
-    for rental in rentals:
-        rental.current_days = rental.get_total_days()
+    # Kursorli sahifalash - faqat shu sahifadagi qatorlar o'qiladi
+    paginator = KeysetPaginator(rentals, 10)
+    page_obj = await paginator.aget_page(
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
     
-    paginator = Paginator(rentals, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Kunlar sonini faqat sahifadagi ijaralar uchun hisoblash
+    for rental in page_obj:
+        rental.current_days = rental.get_total_days()
     
     context = {
         'page_obj': page_obj,
         'query': query,
         'status_filter': status_filter,
     }
-    return render(request, 'main/rental_list.html', context)
+    return await arender(request, 'main/rental_list.html', context)
 
-def rental_detail(request, rental_id):
-    rental = get_object_or_404(Rental, id=rental_id)
-    rental_items = rental.rentalitem_set.all()
+def rental_updated_at(rental_id):
+    return Rental.objects.filter(pk=rental_id).values_list('updated_at', flat=True).first()
+
+@read_only
+@conditional(row=rental_updated_at, daily=True)
+async def rental_detail(request, rental_id):
+    rental = await aget_object_or_404(Rental.objects.select_related('customer'), id=rental_id)
+    # Asbob nomlari shu so'rovda - shablonda qo'shimcha so'rov bo'lmaydi
+    rental_items = [item async for item in rental.rentalitem_set.select_related('tool')]
+    # Kunlar ijara uchun bir marta hisoblanadi
+    invoice.add_line_totals(rental, rental_items)
     
     context = {
         'rental': rental,
         'rental_items': rental_items,
     }
-    return render(request, 'main/rental_detail.html', context)
+    return await arender(request, 'main/rental_detail.html', context)
+
+
+@read_only
+async def rental_invoice(request, rental_id):
+    """Chop etish uchun hisob-faktura - tayyor HTML ijara versiyasi bo'yicha keshdan"""
+    html = await invoice.aget_html(rental_id)
+    if html is None:
+        raise Http404("Ijara topilmadi")
+    return HttpResponse(html)
 
 
 # views.py
 from django.utils import timezone
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 def create_rental(request):
     if request.method == 'POST':
@@ -131,6 +122,9 @@ def create_rental(request):
             # Sanani tekshirish
             if not rental.start_date:
                 rental.start_date = timezone.now().date()
+            # Kelajakdagi ijara - bron, asboblar ombordan hozir olinmaydi
+            if rental.start_date > timezone.now().date():
+                rental.status = 'reserved'
             rental.save()
             return redirect('main:add_rental_items', rental_id=rental.id)
     else:
@@ -146,7 +140,11 @@ def create_rental(request):
 
 def add_rental_items(request, rental_id):
     rental = get_object_or_404(Rental, id=rental_id)
-    tools = Tool.objects.filter(quantity_available__gt=0, is_active=True)
+    is_dated = rental.status == 'reserved' or rental.end_date is not None
+    if rental.status == 'reserved':
+        tools = Tool.objects.filter(quantity_total__gt=0, is_active=True)
+    else:
+        tools = Tool.objects.filter(quantity_available__gt=0, is_active=True)
     
     if request.method == 'POST':
         if 'add_item' in request.POST:
@@ -155,28 +153,34 @@ def add_rental_items(request, rental_id):
             
             tool = get_object_or_404(Tool, id=tool_id)
             
-            if quantity > 0 and quantity <= tool.quantity_available:
-                # Asbobni qo'shish
-                rental_item, created = RentalItem.objects.get_or_create(
-                    rental=rental,
-                    tool=tool,
-                    defaults={
-                        'quantity': quantity,
-                        'daily_rate': tool.daily_price
-                    }
-                )
-                
-                if not created:
-                    rental_item.quantity += quantity
-                    rental_item.save()
-                
-                tool.quantity_available -= quantity
-                tool.save()
-                
-                # Summani yangilash
-                rental.calculate_total()
-                
+            with transaction.atomic():
+                # Sanasi belgilangan ijara shu oraliqdagi bronlar bilan tekshiriladi
+                reserved = not is_dated or availability.fits(rental, {tool.id: quantity})
+                # Shartli UPDATE - mavjud son yetmasa hech narsa o'zgarmaydi.
+                # Bron ombordagi sonni faqat boshlanganda kamaytiradi
+                if reserved and rental.status != 'reserved':
+                    reserved = inventory.reserve(tool.id, quantity)
+                if reserved:
+                    # Asbobni qo'shish
+                    rental_item, created = RentalItem.objects.get_or_create(
+                        rental=rental,
+                        tool=tool,
+                        defaults={
+                            'quantity': quantity,
+                            'daily_rate': tool.daily_price
+                        }
+                    )
+                    
+                    if not created:
+                        rental_item.quantity += quantity
+                        rental_item.save()
+                    
+                    # Summa RentalItem.save() ichida farq bilan yangilanadi
+            
+            if reserved:
                 messages.success(request, f"'{tool.name}' asbobi qo'shildi.")
+            elif is_dated:
+                messages.error(request, f"Bu sanalarda '{tool.name}' yetarli emas. Bo'sh: {availability.free_quantity(tool.id, rental.start_date, rental.end_date)}")
             else:
                 messages.error(request, f"Noto'g'ri son. Mavjud: {tool.quantity_available}")
             
@@ -184,29 +188,34 @@ def add_rental_items(request, rental_id):
         
         elif 'remove_item' in request.POST:
             item_id = request.POST.get('item_id')
-            rental_item = get_object_or_404(RentalItem, id=item_id, rental=rental)
+            rental_item = get_object_or_404(RentalItem.objects.select_related('tool'), id=item_id, rental=rental)
             tool_name = rental_item.tool.name
             
-            # Asbobni qaytarish
-            tool = rental_item.tool
-            tool.quantity_available += rental_item.quantity
-            tool.save()
-            
-            rental_item.delete()
-            # Summa avtomatik yangilanadi (modeldagi delete)
+            with transaction.atomic():
+                # Asbobni qaytarish - yakunlangan ijarada allaqachon qaytarilgan
+                if rental.status == 'active':
+                    inventory.release(rental_item.tool_id, rental_item.quantity)
+                
+                rental_item.delete()
+                # Summa avtomatik yangilanadi (modeldagi delete)
             
             messages.success(request, f"'{tool_name}' asbobi olib tashlandi.")
             return redirect('main:add_rental_items', rental_id=rental.id)
         
         elif 'complete_rental' in request.POST:
-            # Ijarani yakunlash
-            rental.end_date = timezone.now().date()
-            rental.status = 'completed'
-            rental.save()
-            rental.calculate_total()
-            
-            messages.success(request, "Ijara yakunlandi!")
+            # Ijarani yakunlash va asboblarni qaytarish
+            if inventory.complete_rental(rental):
+                messages.success(request, "Ijara yakunlandi!")
             return redirect('main:rental_detail', rental_id=rental.id)
+        
+        elif 'start_rental' in request.POST:
+            # Bronni boshlash - asboblar ombordan shu paytda olinadi
+            try:
+                if inventory.start_rental(rental):
+                    messages.success(request, "Ijara boshlandi!")
+            except inventory.OutOfStock:
+                messages.error(request, "Omborda asboblar yetarli emas.")
+            return redirect('main:add_rental_items', rental_id=rental.id)
     
     rental_items = rental.rentalitem_set.all()
     
@@ -220,23 +229,63 @@ def complete_rental(request, rental_id):
     rental = get_object_or_404(Rental, id=rental_id)
     
     if request.method == 'POST':
-        rental.end_date = timezone.now().date()
-        rental.status = 'completed'
-        rental.save()
-        
-        # Asboblarni qaytarish
-        rental_items = rental.rentalitem_set.all()
-        for item in rental_items:
-            tool = item.tool
-            tool.quantity_available += item.quantity
-            tool.save()
+        # Yakunlash va asboblarni qaytarish bitta tranzaksiyada
+        inventory.complete_rental(rental)
     
     return redirect(f'/rentals/{rental.id}/')
 
+def bulk_complete_rentals(request):
+    """Tanlangan ijaralarni bitta tranzaksiyada yakunlash"""
+    if request.method == 'POST':
+        rental_ids = [int(pk) for pk in request.POST.getlist('rental_ids') if pk.isdigit()]
+        try:
+            completed = inventory.complete_rentals(rental_ids)
+        except inventory.ConcurrentUpdate:
+            messages.error(request, "Ijaralar shu orada o'zgartirildi. Qaytadan urinib ko'ring.")
+        else:
+            if completed:
+                messages.success(request, f"{len(completed)} ta ijara yakunlandi.")
+            else:
+                messages.error(request, "Yakunlash uchun faol ijara tanlanmadi.")
+    
+    return redirect('main:rental_list')
+
+@read_only
+@conditional(Tool, ToolCategory)
 def tool_list(request):
-    tools = Tool.objects.all()
+    # Kategoriya nomi shu so'rovning o'zida olinadi
+    tools = Tool.objects.select_related('category')
+    
+    # Filtrlar
+    category = request.GET.get('category', '')
+    category = int(category) if category.isdigit() else None
+    active = request.GET.get('active', '')
+    in_stock = request.GET.get('in_stock') == '1'
+    tools = catalog.filter_tools(tools, category, active, in_stock)
+    
+    # Qidiruv - eng mos natijalar birinchi
+    query = request.GET.get('q', '')
+    if query:
+        tools = search.search(tools, 'tool', query, ranked=True)
+    else:
+        tools = tools.order_by('name', 'id')
+    
+    paginator = Paginator(tools, 25)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    
+    # Sahifa havolalari uchun joriy filtrlar
+    params = request.GET.copy()
+    params.pop('page', None)
+    
     context = {
-        'tools': tools,
+        'page_obj': page_obj,
+        'filter_query': params.urlencode(),
+        'facets': catalog.get_facets(category, active, in_stock),
+        'totals': get_or_build('totals', get_inventory_totals),
+        'query': query,
+        'category': category,
+        'active': active,
+        'in_stock': in_stock,
         'title': 'Asboblar Ro\'yxati'
     }
     return render(request, 'main/tool_list.html', context)
@@ -256,10 +305,54 @@ def create_tool(request):
     }
     return render(request, 'main/create_tool.html', context)
 
+# Mijozlar ro'yxatini tartiblash: URL parametri -> maydon
+CUSTOMER_SORTS = {
+    'name': 'name',
+    'created': 'created_at',
+    'rentals': 'rental_count',
+    'active': 'active_rentals',
+    'revenue': 'revenue',
+}
+
+@read_only
+@conditional(Customer, Rental)
 def customer_list(request):
-    customers = Customer.objects.all()
+    # Ijaralar soni, faol ijaralar va umumiy daromad - bitta guruhlangan so'rovda
+    customers = Customer.objects.annotate(
+        rental_count=Count('rental'),
+        active_rentals=Count('rental', filter=Q(rental__status='active')),
+        revenue=Coalesce(
+            Sum('rental__total_amount', filter=~Q(rental__status='cancelled')),
+            Value(0),
+            output_field=DecimalField(),
+        ),
+    )
+    
+    # Qidiruv - eng mos natijalar birinchi
+    query = request.GET.get('q', '')
+    if query:
+        customers = search.search(customers, 'customer', query, ranked=True)
+    
+    # Tartiblash bazada bajariladi
+    sort = request.GET.get('sort', '')
+    if sort.lstrip('-') in CUSTOMER_SORTS:
+        order = CUSTOMER_SORTS[sort.lstrip('-')]
+        customers = customers.order_by(f'-{order}' if sort.startswith('-') else order, 'id')
+    elif not query:
+        sort = 'name'
+        customers = customers.order_by('name', 'id')
+    
+    paginator = Paginator(customers, 25)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    
+    # Ustun sarlavhasi bosilganda tartib yo'nalishini almashtirish
+    sort_links = {column: f'-{column}' if sort == column else column for column in CUSTOMER_SORTS}
+    
     context = {
-        'customers': customers,
+        'page_obj': page_obj,
+        'query': query,
+        'sort': sort,
+        'sort_links': sort_links,
         'title': 'Mijozlar Ro\'yxati'
     }
     return render(request, 'main/customer_list.html', context)
@@ -279,20 +372,149 @@ def create_customer(request):
     }
     return render(request, 'main/create_customer.html', context)
 
-def get_dashboard_stats(request):
+def export_data(request, kind):
+    """Ijaralar yoki mijozlarni oqim bilan yuklab olish: ?format=csv|jsonl&start=&end=&status="""
+    fmt = request.GET.get('format', 'csv')
+    if kind not in export.KINDS or fmt not in export.FORMATS:
+        return JsonResponse({'error': "Noma'lum eksport turi yoki formati"}, status=400)
+    try:
+        filters = export.parse_filters(
+            request.GET.get('start'), request.GET.get('end'), request.GET.get('status'),
+        )
+    except ValueError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    
+    # ASGI sinxron iteratorni to'liq xotiraga yig'adi - u yerda async oqim
+    stream = export.astream if isinstance(request, ASGIRequest) else export.stream
+    response = StreamingHttpResponse(stream(kind, fmt, filters), content_type=export.FORMATS[fmt])
+    filename = f"{kind}-{timezone.now():%Y%m%d}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@read_only
+def revenue_report(request):
+    """Daromad hisoboti - oylar va asbob/kategoriya/mijoz bo'yicha, jamlanmalardan"""
+    by = request.GET.get('by', 'tool')
+    if by not in rollups.REPORTS:
+        by = 'tool'
+    
+    today = timezone.now().date()
+    try:
+        end = parse_date(request.GET.get('end') or '') or today
+        start = parse_date(request.GET.get('start') or '') or end - timedelta(days=89)
+    except ValueError:
+        end, start = today, today - timedelta(days=89)
+    if start > end:
+        start, end = end, start
+    
+    context = {
+        'report': rollups.revenue_report(by, start, end),
+        'by': by,
+        'start': start,
+        'end': end,
+        'title': 'Daromad Hisoboti',
+    }
+    return render(request, 'main/revenue_report.html', context)
+
+@read_only
+@conditional(Tool, Rental)
+async def get_dashboard_stats(request):
     """AJAX uchun dashboard statistikasi"""
-    total_tools = Tool.objects.count()
-    available_tools = Tool.objects.aggregate(Sum('quantity_available'))['quantity_available__sum'] or 0
-    total_quantity = Tool.objects.aggregate(Sum('quantity_total'))['quantity_total__sum'] or 0
-    rented_tools = total_quantity - available_tools
-    active_rentals = Rental.objects.filter(status='active').count()
+    totals = await aget_or_build('totals', aget_inventory_totals)
     
     return JsonResponse({
-        'total_tools': total_tools,
-        'available_tools': available_tools,
-        'rented_tools': rented_tools,
-        'active_rentals': active_rentals,
+        'total_tools': totals['total_tools'],
+        'available_tools': totals['available_tools'],
+        'rented_tools': totals['rented_tools'],
+        'active_rentals': totals['active_rentals'],
     })
+
+
+@read_only
+async def live_events(request):
+    """Server-Sent Events: dashboard raqamlari va asboblar soni o'zgarishlari"""
+    if not isinstance(request, ASGIRequest):
+        # WSGI cheksiz oqimni bitta oqimda ushlab turadi. 204 - EventSource
+        # qayta ulanmaydi, sahifa /api/stats/ so'rashga o'tadi
+        return HttpResponse(status=204)
+    
+    response = StreamingHttpResponse(live.stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx javobni buferlamasin
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def metrics(request):
+    """Prometheus uchun metrikalar (matn formati)"""
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@read_only
+def tool_availability(request, tool_id):
+    """Asbobning sana oralig'idagi bo'sh soni: ?start=YYYY-MM-DD&end=YYYY-MM-DD"""
+    tool = get_object_or_404(Tool, id=tool_id)
+    try:
+        start = parse_date(request.GET.get('start') or timezone.now().date().isoformat())
+        end = parse_date(request.GET.get('end') or '') or start
+    except ValueError:
+        start = None
+    if start is None:
+        return JsonResponse({'error': "Sana noto'g'ri (YYYY-MM-DD)"}, status=400)
+    if end < start:
+        return JsonResponse({'error': "Tugash sanasi boshlanishdan oldin"}, status=400)
+    
+    index = availability.get_index(tool.id)
+    return JsonResponse({
+        'tool': tool.id,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'quantity_total': index.capacity,
+        'booked': index.max_booked(start, end),
+        'free': index.free(start, end),
+    })
+
+@require_POST
+def api_create_rental(request):
+    """JSON: ijarani barcha qatorlari bilan yaratish - to'liq ijara qaytadi
+
+    {"customer": id, "start_date": "YYYY-MM-DD", "end_date": "YYYY-MM-DD" | null,
+     "items": [{"tool": id, "quantity": son}, ...]}
+
+    Kirish siyosati - ijara yaratish sahifasi bilan bir xil, faqat sessiya:
+    alohida token yoki csrf_exempt yo'q. Mijoz (sahifadagi JS yoki boshqa
+    dastur) avval istalgan sahifadan csrftoken cookie'sini oladi va uni
+    X-CSRFToken sarlavhasida qaytaradi, aks holda Django 403 qaytaradi.
+    Javoblar: 201 - yaratilgan ijara, 400 - xatolar, 409 - asbob yetmaydi.
+    """
+    try:
+        payload = json.loads(request.body)
+    except (ValueError, UnicodeDecodeError):
+        payload = None
+    if not isinstance(payload, dict):
+        return JsonResponse({'error': "So'rov tanasi JSON obyekt bo'lishi kerak"}, status=400)
+    
+    form = RentalApiForm({
+        'customer': payload.get('customer'),
+        'start_date': payload.get('start_date') or timezone.now().date().isoformat(),
+        'end_date': payload.get('end_date') or '',
+        'items': payload.get('items'),
+    })
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+    
+    data = form.cleaned_data
+    try:
+        rental = inventory.create_rental(
+            data['customer'], data['start_date'], data['end_date'], data['items'], form.tools,
+        )
+    except inventory.OutOfStock as error:
+        return JsonResponse({
+            'error': str(error),
+            'shortages': [{'tool': tool_id, 'available': free} for tool_id, free in error.shortages.items()],
+        }, status=409)
+    
+    # Bazadagi holati - eksport bilan bir xil ko'rinishda
+    rental = export.rental_queryset().get(pk=rental.pk)
+    return JsonResponse(export.rental_record(rental), status=201)
     
     
     
@@ -338,16 +560,29 @@ def edit_rental(request, rental_id):
     if request.method == 'POST':
         form = RentalForm(request.POST, instance=rental)
         if form.is_valid():
-            # Faqat boshlanish sanasini yangilash
-            old_start_date = rental.start_date
-            rental = form.save()
-            
-            # Agar sana o'zgarsa, summani qayta hisoblash
-            if old_start_date != rental.start_date:
-                rental.calculate_total()
-            
-            messages.success(request, "Ijara yangilandi.")
-            return redirect('main:rental_detail', rental_id=rental.id)
+            rental = form.save(commit=False)
+            # Boshlangan ijaraning asboblari mijozda - uni kelajakka ko'chirish
+            # bronga aylantirish bo'lardi, buning uchun avval yakunlanadi
+            if (
+                rental.status != 'reserved'
+                and rental.has_changed('start_date')
+                and rental.start_date > timezone.now().date()
+            ):
+                form.add_error('start_date', "Boshlangan ijarani kelajakdagi sanaga ko'chirib bo'lmaydi.")
+            # Sanalar o'zgarsa, asboblar yangi oraliqda ham bo'sh bo'lishi kerak
+            elif (
+                rental.has_changed('start_date', 'end_date')
+                and rental.status in availability.BOOKING_STATUSES
+                and (rental.status == 'reserved' or rental.end_date)
+                and not availability.fits(rental, inventory.rental_quantities(rental), exclude_self=True)
+            ):
+                form.add_error(None, "Bu sanalarda asboblar yetarli emas.")
+            else:
+                # Sana o'zgarsa, summa Rental.save() ichida qayta hisoblanadi
+                rental.save()
+                
+                messages.success(request, "Ijara yangilandi.")
+                return redirect('main:rental_detail', rental_id=rental.id)
     else:
         form = RentalForm(instance=rental)
     
@@ -402,14 +637,11 @@ def delete_customer(request, customer_id):
 def delete_rental(request, rental_id):
     rental = get_object_or_404(Rental, id=rental_id)
     if request.method == 'POST':
-        if rental.status == 'active':
-            # Asboblarni qaytarish
-            rental_items = rental.rentalitem_set.all()
-            for item in rental_items:
-                tool = item.tool
-                tool.quantity_available += item.quantity
-                tool.save()
-        
-        rental.delete()
+        with transaction.atomic():
+            # Asboblarni qaytarish - faqat faol ijara uchun va faqat bir marta
+            if inventory.claim(rental, 'cancelled'):
+                inventory.release_rental(rental)
+            
+            rental.delete()
         messages.success(request, f"Ijara o'chirildi.")
     return redirect('main:rental_list')